@@ -5,10 +5,15 @@ Local database for storing player info, team assignments, gameweek calendars, an
 
 import sqlite3
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
 
+from app.gamedays import (OFFICIAL_DEADLINES, deadlines_from_games, parse_deadline,
+                          refresh_game_gamedays, save_deadlines)
+from app.scoring import PROFILES, register_scoring_functions
+
 # Use environment variable for Docker, fall back to local path
 DB_PATH = Path(os.getenv('DB_PATH', Path(__file__).parent / "nba_fantasy.db"))
 
@@ -18,6 +23,10 @@ def init_database():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
+    # WAL lets the web workers keep reading while the daily update writes.
+    # The journal mode is stored in the database file, so this only runs once.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Teams table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS teams (
@@ -128,16 +137,489 @@ def init_database():
     """)
     
     conn.commit()
+    
+    # Bring older databases up to the current schema version
+    migrate(conn)
     conn.close()
     print(f"Database initialized at {DB_PATH}")
 
 
+def _add_game_time(cursor):
+    """Add games.game_time (Madrid local HH:MM), which schedule imports already write."""
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(games)")]
+    if 'game_time' not in columns:
+        cursor.execute("ALTER TABLE games ADD COLUMN game_time TEXT")
+
+
+def _add_endpoint_indexes(cursor):
+    """Covering indexes for the access paths used by the web endpoints."""
+    # Gameweek date-range filters; includes every games column the routes read
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_games_date
+        ON games(game_date, home_team_id, away_team_id, game_time, game_id)
+    """)
+    # Team schedule lookups on either side of the matchup
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_home_team ON games(home_team_id, game_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_away_team ON games(away_team_id, game_date)")
+    # Per-player recent form (player_id, ORDER BY game_date DESC) without touching the table
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pgs_player_date
+        ON player_game_stats(player_id, game_date DESC, points, rebounds, assists,
+                             blocks, steals, fantasy_points, minutes_played)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_team ON players(team_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_salary ON players(salary)")
+
+
+def _add_nba_game_id(cursor):
+    """
+    Add player_game_stats.nba_game_id, the bare NBA game ID.
+    
+    player_game_stats.game_id is stored as '{Game_ID}_{player_id}', which forced
+    joins to games through LIKE. The new column allows an indexed equi-join.
+    """
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(player_game_stats)")]
+    if 'nba_game_id' not in columns:
+        cursor.execute("ALTER TABLE player_game_stats ADD COLUMN nba_game_id TEXT REFERENCES games(game_id)")
+    cursor.execute("""
+        UPDATE player_game_stats
+        SET nba_game_id = SUBSTR(game_id, 1, INSTR(game_id, '_') - 1)
+        WHERE nba_game_id IS NULL AND INSTR(game_id, '_') > 1
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pgs_nba_game ON player_game_stats(nba_game_id)")
+
+
+def _add_player_fantasy_summary(cursor):
+    """Create the per-player rolling aggregates table (filled by migration 6)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_fantasy_summary (
+            player_id INTEGER PRIMARY KEY,
+            games_played INTEGER NOT NULL,
+            season_total_fp REAL,
+            season_avg_fp REAL,
+            last5_avg_fp REAL,
+            last10_avg_fp REAL,
+            last30_avg_fp REAL,
+            avg_minutes REAL,
+            last30_avg_minutes REAL,
+            last_game_date TEXT,
+            updated_at TEXT,
+            FOREIGN KEY (player_id) REFERENCES players(player_id)
+        )
+    """)
+
+
+def _add_summary_profiles(cursor):
+    """
+    Key player_fantasy_summary by (player_id, profile).
+    
+    Every scoring profile in app.scoring.PROFILES gets its own cached rows, so
+    switching profiles reads precomputed averages instead of rescanning stats.
+    """
+    cursor.execute("DROP TABLE IF EXISTS player_fantasy_summary")
+    cursor.execute("""
+        CREATE TABLE player_fantasy_summary (
+            player_id INTEGER NOT NULL,
+            profile TEXT NOT NULL,
+            games_played INTEGER NOT NULL,
+            season_total_fp REAL,
+            season_avg_fp REAL,
+            last5_avg_fp REAL,
+            last10_avg_fp REAL,
+            last30_avg_fp REAL,
+            avg_minutes REAL,
+            last30_avg_minutes REAL,
+            last_game_date TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (player_id, profile),
+            FOREIGN KEY (player_id) REFERENCES players(player_id)
+        )
+    """)
+    refresh_player_fantasy_summary(cursor)
+
+
+def refresh_player_fantasy_summary(cursor, player_ids: Optional[List[int]] = None,
+                                   profiles: Optional[List[str]] = None) -> int:
+    """
+    Recompute player_fantasy_summary rows from player_game_stats.
+    
+    Does not commit, so callers can fold the refresh into their ingest transaction.
+    
+    Args:
+        cursor: Cursor on a writable database
+        player_ids: Players whose stats changed (all players if omitted)
+        profiles: Scoring profile keys to refresh (every registered profile if omitted)
+        
+    Returns:
+        Number of summary rows written
+    """
+    register_scoring_functions(cursor.connection)
+    select = """
+        INSERT OR REPLACE INTO player_fantasy_summary
+        (player_id, profile, games_played, season_total_fp, season_avg_fp, last5_avg_fp,
+         last10_avg_fp, last30_avg_fp, avg_minutes, last30_avg_minutes,
+         last_game_date, updated_at)
+        SELECT
+            player_id,
+            :profile,
+            COUNT(*),
+            SUM(fp),
+            AVG(fp),
+            AVG(CASE WHEN rn <= 5 THEN fp END),
+            AVG(CASE WHEN rn <= 10 THEN fp END),
+            AVG(CASE WHEN rn <= 30 THEN fp END),
+            AVG(minutes_played),
+            AVG(CASE WHEN rn <= 30 THEN minutes_played END),
+            MAX(game_date),
+            datetime('now')
+        FROM (
+            SELECT
+                player_id,
+                game_date,
+                minutes_played,
+                fp(points, rebounds, assists, blocks, steals, turnovers, :profile) AS fp,
+                ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC) AS rn
+            FROM player_game_stats
+            {where}
+        )
+        GROUP BY player_id
+    """
+    written = 0
+    player_ids = None if player_ids is None else list(player_ids)
+    for profile in (profiles or list(PROFILES)):
+        if player_ids is None:
+            cursor.execute(select.format(where=""), {'profile': profile})
+            written += cursor.rowcount
+            continue
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(player_ids), 500):
+            chunk = player_ids[start:start + 500]
+            params = {'profile': profile, **{f"p{i}": pid for i, pid in enumerate(chunk)}}
+            placeholders = ','.join(f":p{i}" for i in range(len(chunk)))
+            cursor.execute(select.format(where=f"WHERE player_id IN ({placeholders})"), params)
+            written += cursor.rowcount
+    return written
+
+
+def _add_ingest_progress(cursor):
+    """Create the checkpoint table for resumable stat backfills."""
+    # One row per unit of work in an ingest job: a player for per-player game-log
+    # jobs, a date for bulk jobs. completed_at stays NULL until the unit's stats
+    # are committed, so a crashed job can be resumed from its pending rows.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_progress (
+            job TEXT NOT NULL,
+            from_date TEXT NOT NULL,
+            to_date TEXT NOT NULL,
+            item TEXT NOT NULL,
+            stat_rows INTEGER,
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            completed_at TEXT,
+            PRIMARY KEY (job, from_date, to_date, item)
+        )
+    """)
+
+
+def _add_app_meta(cursor):
+    """Create the key/value table holding the data generation counter."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO app_meta (key, value) VALUES ('data_generation', 0)")
+
+
+def _add_game_gamedays(cursor):
+    """Create the game -> fantasy gameday mapping (filled by migration 9)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS game_gamedays (
+            game_id TEXT PRIMARY KEY,
+            gameweek INTEGER NOT NULL,
+            day_num INTEGER,
+            deadline TEXT,
+            FOREIGN KEY (game_id) REFERENCES games(game_id)
+        )
+    """)
+
+
+def _add_gameday_deadlines(cursor):
+    """
+    Create the gameday deadline calendar and fill it.
+    
+    Published deadlines (OFFICIAL_DEADLINES) are stored as is; every other
+    gameweek gets deadlines computed from stored game times.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS gameday_deadlines (
+            gameweek INTEGER NOT NULL,
+            day_num INTEGER NOT NULL,
+            deadline TEXT NOT NULL,
+            source TEXT NOT NULL,
+            PRIMARY KEY (gameweek, day_num)
+        )
+    """)
+    official = [(gameweek, day_num, parse_deadline(deadline)) for gameweek, day_num, deadline in OFFICIAL_DEADLINES]
+    save_deadlines(cursor, official, 'official')
+    save_deadlines(cursor, deadlines_from_games(cursor.connection), 'games',
+                   keep_weeks={gameday[0] for gameday in official})
+    refresh_game_gamedays(cursor)
+
+
+# Schema migrations as (version, description, function), applied in order.
+# PRAGMA user_version stores the last version applied to a database file.
+MIGRATIONS = [
+    (1, "Add games.game_time", _add_game_time),
+    (2, "Add secondary indexes for endpoint queries", _add_endpoint_indexes),
+    (3, "Add player_game_stats.nba_game_id for equi-joins with games", _add_nba_game_id),
+    (4, "Add player_fantasy_summary rolling aggregates", _add_player_fantasy_summary),
+    (5, "Add ingest_progress checkpoints for resumable backfills", _add_ingest_progress),
+    (6, "Key player_fantasy_summary by scoring profile", _add_summary_profiles),
+    (7, "Add app_meta with the data generation counter", _add_app_meta),
+    (8, "Add game_gamedays game -> fantasy gameday mapping", _add_game_gamedays),
+    (9, "Add gameday_deadlines calendar for the whole season", _add_gameday_deadlines),
+]
+
+
+def get_schema_version(conn) -> int:
+    """Return the schema version recorded in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn=None) -> int:
+    """
+    Apply any pending schema migrations.
+    
+    Each migration runs in its own transaction together with the
+    user_version bump, so an interrupted run resumes at the failed step.
+    
+    Args:
+        conn: Optional open connection (a new one is opened if omitted)
+        
+    Returns:
+        The schema version after migrating
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(DB_PATH)
+    
+    try:
+        version = get_schema_version(conn)
+        for step, description, apply in MIGRATIONS:
+            if step <= version:
+                continue
+            cursor = conn.cursor()
+            try:
+                cursor.execute("BEGIN")
+                apply(cursor)
+                # PRAGMA does not accept bound parameters
+                cursor.execute(f"PRAGMA user_version = {int(step)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            print(f"Applied migration {step}: {description}")
+            version = step
+        return version
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def get_data_generation(conn) -> Optional[int]:
+    """
+    Return the data generation counter.
+    
+    The web app caches API responses per generation, so writers bump it
+    (bump_data_generation) after changing data the endpoints serve.
+    
+    Returns:
+        The generation, or None if the database predates migration 7
+    """
+    try:
+        row = conn.execute("SELECT value FROM app_meta WHERE key = 'data_generation'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def bump_data_generation(cursor) -> int:
+    """
+    Increment the data generation counter, invalidating cached API responses.
+    
+    Does not commit, so the bump lands in the same transaction as the writes.
+    
+    Returns:
+        The new generation
+    """
+    cursor.execute("""
+        INSERT INTO app_meta (key, value) VALUES ('data_generation', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1
+    """)
+    return cursor.execute("SELECT value FROM app_meta WHERE key = 'data_generation'").fetchone()[0]
+
+
 def get_connection():
-    """Get a database connection."""
-    return sqlite3.connect(DB_PATH)
+    """Get a database connection with the fp() scoring function registered."""
+    conn = sqlite3.connect(DB_PATH)
+    # In WAL mode NORMAL only fsyncs at checkpoints and is still crash-safe
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal':
+        conn.execute("PRAGMA synchronous = NORMAL")
+    register_scoring_functions(conn)
+    return conn
 
 
 def close_connection(conn):
     """Close a database connection."""
     if conn:
         conn.close()
+
+
+# Per-connection tuning for pooled read connections
+POOL_MMAP_SIZE = 256 * 1024 * 1024   # bytes of the file to memory-map
+POOL_CACHE_SIZE = -16000             # page cache size; negative means KiB
+POOL_CACHED_STATEMENTS = 256         # prepared statements kept per connection
+POOL_MAX_IDLE = 4                    # idle connections kept per thread
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool."""
+
+    pool = None
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def really_close(self):
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Per-process pool of read-only SQLite connections.
+
+    Each thread keeps its own idle connections, so a connection is never shared
+    between threads. Connections stay open between requests, which keeps the
+    page cache, the memory map and sqlite3's prepared-statement cache warm.
+    The pool resets itself after a fork so gunicorn workers never reuse a
+    parent's connections.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wal_checked = False
+        self.hits = 0
+        self.misses = 0
+        self.opened = 0
+
+    def _idle(self) -> list:
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = []
+        return idle
+
+    def _ensure_wal(self):
+        """Switch the database file to WAL once; read-only connections cannot."""
+        if self._wal_checked:
+            return
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Could not enable WAL on {self.db_path}: {e}")
+        self._wal_checked = True
+
+    def _open(self) -> PooledConnection:
+        self._ensure_wal()
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            factory=PooledConnection,
+            cached_statements=POOL_CACHED_STATEMENTS,
+        )
+        conn.execute(f"PRAGMA mmap_size = {POOL_MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = {POOL_CACHE_SIZE}")
+        register_scoring_functions(conn)
+        conn.pool = self
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    def connection(self, row_factory=None) -> PooledConnection:
+        """
+        Check out a read-only connection for the current thread.
+
+        Args:
+            row_factory: Row factory for this checkout (e.g. sqlite3.Row)
+
+        Returns:
+            A connection; call close() to return it to the pool
+        """
+        if os.getpid() != self.pid:
+            self._reset()
+        idle = self._idle()
+        if idle:
+            conn = idle.pop()
+            with self._lock:
+                self.hits += 1
+        else:
+            conn = self._open()
+            with self._lock:
+                self.misses += 1
+        conn.row_factory = row_factory
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the current thread's idle list."""
+        if conn.in_transaction:
+            conn.rollback()
+        conn.set_trace_callback(None)
+        idle = self._idle()
+        if os.getpid() == self.pid and conn not in idle and len(idle) < POOL_MAX_IDLE:
+            idle.append(conn)
+        else:
+            conn.really_close()
+
+    def stats(self) -> Dict:
+        """Pool counters for this process."""
+        total = self.hits + self.misses
+        return {
+            'pid': self.pid,
+            'db_path': self.db_path,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'connections_opened': self.opened,
+        }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=None) -> ConnectionPool:
+    """Return this process's pool for a database file (DB_PATH by default)."""
+    key = str(db_path or DB_PATH)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, ConnectionPool(key))
+    return pool
+
+
+def get_read_connection(db_path=None, row_factory=None):
+    """Get a pooled read-only connection; close() returns it to the pool."""
+    return get_pool(db_path).connection(row_factory)
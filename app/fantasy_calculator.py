@@ -10,18 +10,38 @@ Scoring Rules:
 - Steals: 3 points each
 """
 
-from typing import Dict, Optional
+from collections.abc import Mapping
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.scoring import NBA_FANTASY
 
 
 class FantasyCalculator:
     """Calculate fantasy points based on player statistics."""
     
-    # Scoring multipliers
-    POINTS_MULTIPLIER = 1
-    REBOUNDS_MULTIPLIER = 1
-    ASSISTS_MULTIPLIER = 2
-    BLOCKS_MULTIPLIER = 3
-    STEALS_MULTIPLIER = 3
+    # Scoring multipliers (the nba_fantasy_v1 scoring profile)
+    POINTS_MULTIPLIER = NBA_FANTASY.weights['points']
+    REBOUNDS_MULTIPLIER = NBA_FANTASY.weights['rebounds']
+    ASSISTS_MULTIPLIER = NBA_FANTASY.weights['assists']
+    BLOCKS_MULTIPLIER = NBA_FANTASY.weights['blocks']
+    STEALS_MULTIPLIER = NBA_FANTASY.weights['steals']
+    
+    # Stat categories in score_batch column order, with the NBA API column for each
+    CATEGORIES = ('points', 'rebounds', 'assists', 'blocks', 'steals')
+    API_COLUMNS = {'points': 'PTS', 'rebounds': 'REB', 'assists': 'AST', 'blocks': 'BLK', 'steals': 'STL'}
+    
+    @staticmethod
+    def weights() -> np.ndarray:
+        """Multipliers as a vector in CATEGORIES order."""
+        return np.array([
+            FantasyCalculator.POINTS_MULTIPLIER,
+            FantasyCalculator.REBOUNDS_MULTIPLIER,
+            FantasyCalculator.ASSISTS_MULTIPLIER,
+            FantasyCalculator.BLOCKS_MULTIPLIER,
+            FantasyCalculator.STEALS_MULTIPLIER,
+        ], dtype=np.float64)
     
     @staticmethod
     def calculate_fantasy_points(
@@ -104,6 +124,50 @@ class FantasyCalculator:
         breakdown["total"] = sum(v for k, v in breakdown.items() if k != "total")
         return breakdown
 
+    
+    @staticmethod
+    def _stat_matrix(stats) -> np.ndarray:
+        """Coerce score_batch input to an (n, 5) float matrix in CATEGORIES order."""
+        categories = FantasyCalculator.CATEGORIES
+        if isinstance(stats, np.ndarray):
+            matrix = np.asarray(stats, dtype=np.float64).reshape(-1, len(categories))
+        elif isinstance(stats, Mapping) or hasattr(stats, 'columns'):
+            # DataFrame or dict of columns, named like the database or like the NBA API
+            columns = []
+            for category in categories:
+                name = category if category in stats else FantasyCalculator.API_COLUMNS[category]
+                columns.append(np.asarray(stats[name], dtype=np.float64) if name in stats else None)
+            length = next((len(column) for column in columns if column is not None), 0)
+            matrix = np.column_stack([column if column is not None else np.zeros(length)
+                                      for column in columns]) if length else np.zeros((0, len(categories)))
+        else:
+            # Sequence of per-game dicts (e.g. game log records)
+            api = FantasyCalculator.API_COLUMNS
+            matrix = np.array([[game.get(c, game.get(api[c])) or 0 for c in categories] for game in stats],
+                              dtype=np.float64).reshape(-1, len(categories))
+        if np.isnan(matrix).any():
+            matrix = np.nan_to_num(matrix)
+        return matrix
+    
+    @staticmethod
+    def score_batch(stats) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score many games in one vectorized call.
+        
+        Args:
+            stats: pandas DataFrame or dict of arrays with columns named as in
+                CATEGORIES (points, rebounds, ...) or as in the NBA API (PTS, REB, ...);
+                a list of such per-game dicts; or an (n, 5) array in CATEGORIES order.
+                Missing columns and values count as 0.
+            
+        Returns:
+            (totals, breakdown): float arrays of shape (n,) and (n, 5), the
+            breakdown holding each category's contribution in CATEGORIES order
+        """
+        matrix = FantasyCalculator._stat_matrix(stats)
+        weights = FantasyCalculator.weights()
+        return matrix @ weights, matrix * weights
+
 
 def example_calculation():
     """Example: Calculate fantasy points for a sample game."""
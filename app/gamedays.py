@@ -0,0 +1,274 @@
+"""
+Fantasy Gamedays
+Lineup deadlines and the game → gameday assignment stored in game_gamedays.
+
+Each gameweek is split into gamedays; a gameday's lineup locks at its
+deadline, about 30 minutes before its first tip-off. A game belongs to the
+gameday whose deadline it comes after. Games and deadlines only change when a
+schedule is imported, so the assignment is computed then and stored, and the
+web routes join on it instead of re-deriving it per request.
+
+Deadlines live in the gameday_deadlines table, loaded from a CSV by
+scripts/load_gameday_deadlines.py or computed from game times, which the
+schedule imports redo (refresh_derived_deadlines). GamedayIndex holds them
+sorted in memory and resolves any timestamp with a bisect.
+"""
+
+import bisect
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+MADRID_TZ = ZoneInfo('Europe/Madrid')
+# NBA game nights are US Eastern dates; one night's games form one gameday
+NBA_TZ = ZoneInfo('America/New_York')
+# Gameweek 1 starts on opening night; every gameweek is 7 days
+SEASON_START = date(2025, 10, 21)
+# Lineups lock this long before a gameday's first tip-off
+DEADLINE_LEAD = timedelta(minutes=30)
+
+Gameday = Tuple[int, int, datetime]  # (gameweek, day_num, deadline)
+
+# Deadlines published by NBA Fantasy (Madrid time), seeded by migration 9
+OFFICIAL_DEADLINES = [
+    # Gameweek 9
+    (9, 1, '2025-12-16 00:30'), (9, 2, '2025-12-18 01:30'), (9, 3, '2025-12-19 00:30'),
+    (9, 4, '2025-12-20 00:30'), (9, 5, '2025-12-20 22:30'), (9, 6, '2025-12-21 21:00'),
+    # Gameweek 10
+    (10, 1, '2025-12-23 00:30'), (10, 2, '2025-12-24 00:30'), (10, 3, '2025-12-25 17:30'),
+    (10, 4, '2025-12-27 00:30'), (10, 5, '2025-12-27 22:30'), (10, 6, '2025-12-28 21:00'),
+    # Gameweek 11
+    (11, 1, '2025-12-30 00:30'), (11, 2, '2025-12-31 01:30'), (11, 3, '2025-12-31 18:30'),
+    (11, 4, '2026-01-01 23:30'), (11, 5, '2026-01-03 00:30'), (11, 6, '2026-01-03 22:30'),
+    (11, 7, '2026-01-04 19:30'),
+    # Gameweek 12
+    (12, 1, '2026-01-06 00:30'), (12, 2, '2026-01-07 00:30'), (12, 3, '2026-01-08 00:30'),
+    (12, 4, '2026-01-09 00:30'), (12, 5, '2026-01-10 00:30'), (12, 6, '2026-01-10 18:30'),
+    (12, 7, '2026-01-11 20:30'),
+]
+
+
+def parse_deadline(value: str) -> datetime:
+    """Parse an ISO datetime; values without a UTC offset are Madrid time."""
+    deadline = datetime.fromisoformat(value.strip())
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=MADRID_TZ)
+    return deadline.astimezone(MADRID_TZ)
+
+
+def gameweek_for_date(game_date: str) -> int:
+    """Gameweek number of a YYYY-MM-DD date, counting 7-day weeks from SEASON_START."""
+    return (date.fromisoformat(game_date[:10]) - SEASON_START).days // 7 + 1
+
+
+def game_datetime(game_date: str, game_time: Optional[str]) -> datetime:
+    """Tip-off as a Madrid datetime (game_date/game_time are stored in Madrid time)."""
+    try:
+        game_dt = datetime.strptime(f"{game_date} {game_time or '00:00'}", '%Y-%m-%d %H:%M')
+    except ValueError:
+        game_dt = datetime.strptime(game_date, '%Y-%m-%d')
+    return game_dt.replace(tzinfo=MADRID_TZ)
+
+
+def gameday_label(gameweek: Optional[int], day_num: Optional[int], game_date: str) -> str:
+    """Display label such as 'GW9 Day 3', or the date for games without a gameday."""
+    if day_num is None:
+        return game_date
+    return f"GW{gameweek} Day {day_num}"
+
+
+class GamedayIndex:
+    """
+    Season's gameday deadlines, sorted for bisect lookups.
+
+    Gamedays are assumed not to interleave across gameweeks, which holds as
+    long as every gameweek's deadlines fall inside its 7 days.
+    """
+
+    def __init__(self, gamedays: Iterable[Gameday]):
+        gamedays = sorted(gamedays, key=lambda gameday: gameday[2])
+        self.gamedays: List[Gameday] = gamedays
+        self.deadlines: List[datetime] = [gameday[2] for gameday in gamedays]
+        self._weeks: Dict[int, List[Gameday]] = {}
+        for gameday in gamedays:
+            self._weeks.setdefault(gameday[0], []).append(gameday)
+
+    @classmethod
+    def load(cls, conn) -> 'GamedayIndex':
+        """
+        Build the index from the gameday_deadlines table.
+
+        Args:
+            conn: Open SQLite connection
+
+        Returns:
+            GamedayIndex over every stored deadline
+        """
+        rows = conn.execute("SELECT gameweek, day_num, deadline FROM gameday_deadlines").fetchall()
+        return cls((row[0], row[1], parse_deadline(row[2])) for row in rows)
+
+    def lookup(self, moment: datetime) -> Optional[Gameday]:
+        """
+        Find the gameday whose lineup window contains a moment.
+
+        Args:
+            moment: Timezone-aware datetime (e.g. a tip-off)
+
+        Returns:
+            The gameday with the latest deadline at or before the moment,
+            or None if it comes before the season's first deadline
+        """
+        i = bisect.bisect_right(self.deadlines, moment) - 1
+        return self.gamedays[i] if i >= 0 else None
+
+    def week(self, gameweek: int) -> List[Gameday]:
+        """A gameweek's gamedays in deadline order (empty if none are known)."""
+        return list(self._weeks.get(gameweek, []))
+
+    def assign(self, game_dt: datetime, gameweek: int) -> Optional[Gameday]:
+        """
+        Find the gameday a game counts for within its gameweek.
+
+        Args:
+            game_dt: Tip-off time
+            gameweek: The game's gameweek
+
+        Returns:
+            The gameday from whose deadline (inclusive) to the next one
+            (exclusive) the game tips off; the week's last gameday if it tips
+            off outside the week's deadlines; None if the week has no gamedays
+        """
+        gameday = self.lookup(game_dt)
+        if gameday is not None and gameday[0] == gameweek:
+            return gameday
+        week = self._weeks.get(gameweek)
+        return week[-1] if week else None
+
+    def __len__(self) -> int:
+        return len(self.gamedays)
+
+
+def deadlines_from_games(conn, lead: timedelta = DEADLINE_LEAD) -> List[Gameday]:
+    """
+    Derive gameday deadlines from the games table.
+
+    Games are grouped into nights by their US Eastern date; each night is a
+    gameday whose deadline is its first tip-off minus `lead`. Gamedays are
+    numbered in order within the gameweek of their first game. Games without
+    a game_time are ignored.
+
+    Args:
+        conn: Open SQLite connection
+        lead: Time between the deadline and the first tip-off
+
+    Returns:
+        (gameweek, day_num, deadline) for every night with timed games
+    """
+    first_tipoffs: Dict[date, datetime] = {}
+    for game_date, game_time in conn.execute("""
+        SELECT game_date, game_time FROM games WHERE game_time IS NOT NULL AND game_time != ''
+    """):
+        tipoff = game_datetime(game_date, game_time)
+        night = tipoff.astimezone(NBA_TZ).date()
+        if night not in first_tipoffs or tipoff < first_tipoffs[night]:
+            first_tipoffs[night] = tipoff
+
+    gamedays = []
+    day_nums: Dict[int, int] = {}
+    for night in sorted(first_tipoffs):
+        tipoff = first_tipoffs[night]
+        gameweek = gameweek_for_date(tipoff.strftime('%Y-%m-%d'))
+        day_nums[gameweek] = day_nums.get(gameweek, 0) + 1
+        gamedays.append((gameweek, day_nums[gameweek], tipoff - lead))
+    return gamedays
+
+
+def save_deadlines(cursor, gamedays: Sequence[Gameday], source: str,
+                   keep_weeks: Iterable[int] = ()) -> int:
+    """
+    Replace the stored deadlines of every gameweek present in `gamedays`.
+
+    Does not commit; call refresh_game_gamedays afterwards.
+
+    Args:
+        cursor: Cursor on a writable database
+        gamedays: (gameweek, day_num, deadline) rows
+        source: Where the rows came from (e.g. 'official', 'csv', 'games')
+        keep_weeks: Gameweeks to leave untouched even if present in `gamedays`
+
+    Returns:
+        Number of deadlines written
+    """
+    keep = set(keep_weeks)
+    rows = [(gameweek, day_num, deadline.astimezone(MADRID_TZ).isoformat(), source)
+            for gameweek, day_num, deadline in gamedays if gameweek not in keep]
+    for gameweek in sorted({row[0] for row in rows}):
+        cursor.execute("DELETE FROM gameday_deadlines WHERE gameweek = ?", (gameweek,))
+    cursor.executemany("""
+        INSERT INTO gameday_deadlines (gameweek, day_num, deadline, source) VALUES (?, ?, ?, ?)
+    """, rows)
+    return len(rows)
+
+
+def refresh_derived_deadlines(cursor) -> int:
+    """
+    Recompute the deadlines derived from game times (source 'games').
+
+    Gameweeks whose deadlines came from NBA Fantasy or a CSV are kept. Call
+    after importing or moving games, before refresh_game_gamedays. Does not commit.
+
+    Args:
+        cursor: Cursor on a writable database
+
+    Returns:
+        Number of deadlines written
+    """
+    keep = {row[0] for row in cursor.execute(
+        "SELECT DISTINCT gameweek FROM gameday_deadlines WHERE source != 'games'")}
+    # Weeks whose games all moved away must not keep their old deadlines
+    cursor.execute("DELETE FROM gameday_deadlines WHERE source = 'games'")
+    return save_deadlines(cursor, deadlines_from_games(cursor.connection), 'games', keep_weeks=keep)
+
+
+def refresh_game_gamedays(cursor, game_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recompute game_gamedays from games and gameday_deadlines.
+
+    Call after importing or moving games, or after deadlines change. Does not commit.
+
+    Args:
+        cursor: Cursor on a writable database
+        game_ids: Games to recompute (every game if omitted)
+
+    Returns:
+        Number of games assigned
+    """
+    index = GamedayIndex.load(cursor.connection)
+
+    if game_ids is None:
+        cursor.execute("DELETE FROM game_gamedays")
+        games = cursor.execute("SELECT game_id, game_date, game_time FROM games").fetchall()
+    else:
+        games = []
+        game_ids = list(game_ids)
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(game_ids), 500):
+            chunk = game_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"DELETE FROM game_gamedays WHERE game_id IN ({placeholders})", chunk)
+            games += cursor.execute(f"""
+                SELECT game_id, game_date, game_time FROM games WHERE game_id IN ({placeholders})
+            """, chunk).fetchall()
+
+    rows = []
+    for game_id, game_date, game_time in games:
+        gameweek = gameweek_for_date(game_date)
+        gameday = index.assign(game_datetime(game_date, game_time), gameweek)
+        if gameday is None:
+            rows.append((game_id, gameweek, None, None))
+        else:
+            rows.append((game_id, gameweek, gameday[1], gameday[2].isoformat()))
+    cursor.executemany("""
+        INSERT INTO game_gamedays (game_id, gameweek, day_num, deadline) VALUES (?, ?, ?, ?)
+    """, rows)
+    return len(rows)
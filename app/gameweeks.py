@@ -0,0 +1,71 @@
+"""
+Gameweek Index
+In-memory lookup from a calendar date to the gameweek containing it.
+
+The gameweeks table is tiny (21 rows a season) and only changes when the
+calendar is created, so ingest scripts load it once and resolve each game's
+gameweek with a bisect over the sorted start dates instead of a query per game.
+"""
+
+import bisect
+from datetime import date, datetime
+from typing import List, Optional, Sequence, Tuple, Union
+
+DateLike = Union[str, date, datetime]
+
+
+class GameweekIndex:
+    """
+    Sorted interval index over (gameweek_id, start_date, end_date) rows.
+
+    Dates are compared as YYYY-MM-DD strings, the format they are stored in.
+    Gameweeks are assumed not to overlap; a date falling in a gap between
+    weeks, or outside the season, resolves to None.
+    """
+
+    def __init__(self, rows: Sequence[Tuple[int, str, str]]):
+        rows = sorted(rows, key=lambda row: row[1])
+        self.gameweek_ids: List[int] = [row[0] for row in rows]
+        self.start_dates: List[str] = [row[1] for row in rows]
+        self.end_dates: List[str] = [row[2] for row in rows]
+
+    @classmethod
+    def load(cls, conn) -> 'GameweekIndex':
+        """
+        Build the index from the gameweeks table.
+
+        Args:
+            conn: Open SQLite connection
+
+        Returns:
+            GameweekIndex over every stored gameweek
+        """
+        rows = conn.execute("SELECT gameweek_id, start_date, end_date FROM gameweeks").fetchall()
+        return cls([tuple(row) for row in rows])
+
+    @staticmethod
+    def _key(game_date: DateLike) -> str:
+        if isinstance(game_date, datetime):
+            return game_date.strftime('%Y-%m-%d')
+        if isinstance(game_date, date):
+            return game_date.isoformat()
+        return game_date[:10]
+
+    def lookup(self, game_date: DateLike) -> Optional[int]:
+        """
+        Find the gameweek containing a date.
+
+        Args:
+            game_date: Date, datetime or YYYY-MM-DD string
+
+        Returns:
+            gameweek_id, or None if no gameweek covers the date
+        """
+        key = self._key(game_date)
+        i = bisect.bisect_right(self.start_dates, key) - 1
+        if i >= 0 and key <= self.end_dates[i]:
+            return self.gameweek_ids[i]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.gameweek_ids)
@@ -0,0 +1,244 @@
+"""
+Starting Lineups
+Optimal daily starting five for a fantasy roster.
+
+On each gameday five of the roster's players start and score: 2-3 Backcourt
+and 2-3 Frontcourt. When too few players have a game to fill that, as many
+start as the position limits allow (at most 3 per group). Every split of
+starters between the groups is therefore one of FORMATIONS, and the largest
+one the day's players can fill must be fielded, even when a starter projects
+negative points.
+
+The best lineup for every gameday of a week is found in one NumPy pass: each
+group's players are ranked per day, prefix sums over the top 3 of each group
+score every formation at once, and the best formation is picked per day.
+
+Projections are pluggable (last-5 averages, season averages, per-day
+forecasts). Equal projections are broken by an optional secondary value, then
+by roster order; equal lineups by that value, then by formation order. An
+optional captain multiplier scores the best starter that many times.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.roster_optimizer import position_group
+
+STARTERS = 5
+MAX_PER_GROUP = 3
+GROUPS = ('BC', 'FC')
+
+# Every legal (backcourt, frontcourt) starter split, fullest first; when two
+# lineups tie, the one listed first wins (3 BC + 2 FC before 2 BC + 3 FC)
+FORMATIONS = sorted(
+    ((bc, fc) for bc in range(MAX_PER_GROUP + 1) for fc in range(MAX_PER_GROUP + 1) if bc + fc <= STARTERS),
+    key=lambda formation: (-sum(formation), -formation[0]))
+
+_TIE_TOLERANCE = 1e-9
+
+PlayerValue = Union[str, Callable[[Dict, int], float]]
+
+
+def _ranked(member: np.ndarray, projections: np.ndarray, tiebreak: np.ndarray):
+    """Rank one group's players per day (best first); returns ranks and top-3 indices/values."""
+    n, days = projections.shape
+    values = np.where(member, projections, -np.inf)
+    # lexsort sorts by the last key first and is stable, so full ties keep roster order
+    order = np.lexsort((-np.where(member, tiebreak, 0.0), -values), axis=0)
+    rank = np.empty((n, days), dtype=np.int64)
+    np.put_along_axis(rank, order, np.arange(n)[:, None].repeat(days, axis=1), axis=0)
+
+    top = np.full((MAX_PER_GROUP, days), -1, dtype=np.int64)
+    top[:min(n, MAX_PER_GROUP)] = order[:MAX_PER_GROUP]
+    top_values = np.full((MAX_PER_GROUP, days), -np.inf)
+    top_tiebreak = np.zeros((MAX_PER_GROUP, days))
+    if n:
+        valid = top >= 0
+        safe = np.where(valid, top, 0)
+        top_values = np.where(valid, np.take_along_axis(values, safe, axis=0), -np.inf)
+        top_tiebreak = np.where(valid, np.take_along_axis(tiebreak, safe, axis=0), 0.0)
+    return rank, top, top_values, top_tiebreak
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    """Row prefix sums with a leading row of zeros: result[k] = sum of the first k rows."""
+    return np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+
+def solve_lineups(groups: Sequence[str], projections, tiebreak=None,
+                  captain_multiplier: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    Optimal starting lineup of every gameday in one vectorized pass.
+
+    Args:
+        groups: 'BC' or 'FC' for each of the n players
+        projections: (n, days) projected points; NaN where a player has no game that day
+        tiebreak: Optional (n,) or (n, days) secondary values, higher wins ties
+        captain_multiplier: The captain scores this many times their projection
+            (e.g. 2); no captain if None
+
+    Returns:
+        Dict of arrays:
+            'starters': (n, days) bool, True for each day's starters
+            'captain': (days,) index of the captain, -1 if none
+            'points': (days,) lineup points including the captain's bonus
+            'formation': (days, 2) number of backcourt and frontcourt starters
+    """
+    projections = np.asarray(projections, dtype=np.float64)
+    if projections.ndim == 1:
+        projections = projections[:, None]
+    n, days = projections.shape
+    groups = np.asarray(groups)
+    plays = ~np.isnan(projections)
+    if tiebreak is None:
+        tiebreak = np.zeros((n, days))
+    else:
+        tiebreak = np.asarray(tiebreak, dtype=np.float64)
+        tiebreak = np.broadcast_to(tiebreak[:, None] if tiebreak.ndim == 1 else tiebreak, (n, days))
+        tiebreak = np.nan_to_num(tiebreak)
+
+    ranks, tops, top_values, top_tiebreaks, values_prefix, tiebreak_prefix = {}, {}, {}, {}, {}, {}
+    for group in GROUPS:
+        member = plays & (groups == group)[:, None]
+        ranks[group], tops[group], top_values[group], top_tiebreaks[group] = _ranked(member, projections, tiebreak)
+        values_prefix[group] = _prefix(top_values[group])
+        tiebreak_prefix[group] = _prefix(top_tiebreaks[group])
+
+    formations = np.array(FORMATIONS)
+    bc, fc = formations[:, 0], formations[:, 1]
+    totals = values_prefix['BC'][bc] + values_prefix['FC'][fc]  # (formations, days)
+    tiebreaks = tiebreak_prefix['BC'][bc] + tiebreak_prefix['FC'][fc]
+
+    # The captain is the best starter: the top player of a group that starts anyone
+    bc_best = np.where(bc[:, None] > 0, top_values['BC'][0], -np.inf)
+    fc_best = np.where(fc[:, None] > 0, top_values['FC'][0], -np.inf)
+    if captain_multiplier is not None:
+        best = np.maximum(bc_best, fc_best)
+        totals = totals + np.where(np.isfinite(best), (captain_multiplier - 1) * best, 0.0)
+
+    # The largest lineup the day's players allow must be fielded, even if a
+    # starter's projection is negative; only formations of that size compete
+    sizes = (bc + fc)[:, None]
+    feasible = np.isfinite(totals)
+    largest = np.where(feasible, sizes, -1).max(axis=0)
+    totals = np.where(feasible & (sizes == largest), totals, -np.inf)
+
+    best_total = totals.max(axis=0)
+    tied = totals >= best_total - _TIE_TOLERANCE
+    choice = np.argmax(np.where(tied, tiebreaks, -np.inf), axis=0)
+    day_index = np.arange(days)
+    bc_count, fc_count = bc[choice], fc[choice]
+
+    starters = ((plays & (groups == 'BC')[:, None] & (ranks['BC'] < bc_count)) |
+                (plays & (groups == 'FC')[:, None] & (ranks['FC'] < fc_count)))
+
+    captain = np.full(days, -1, dtype=np.int64)
+    if captain_multiplier is not None:
+        bc_top, fc_top = tops['BC'][0], tops['FC'][0]
+        bc_first = (top_values['BC'][0] > top_values['FC'][0]) | (
+            (top_values['BC'][0] == top_values['FC'][0]) & (top_tiebreaks['BC'][0] >= top_tiebreaks['FC'][0]))
+        captain = np.where((bc_count > 0) & ((fc_count == 0) | bc_first), bc_top,
+                           np.where(fc_count > 0, fc_top, -1))
+
+    return {
+        'starters': starters,
+        'captain': captain,
+        'points': totals[choice, day_index],
+        'formation': np.stack([bc_count, fc_count], axis=1),
+    }
+
+
+def lineup_points(backcourt: Iterable[float], frontcourt: Iterable[float],
+                  captain_multiplier: Optional[float] = None) -> float:
+    """
+    Best lineup points of one gameday, from the projections of the players who play.
+
+    Scalar counterpart of solve_lineups for search loops that score single days.
+
+    Args:
+        backcourt: Projections of the day's backcourt players
+        frontcourt: Projections of the day's frontcourt players
+        captain_multiplier: The captain scores this many times their projection; no captain if None
+
+    Returns:
+        Points of the optimal lineup, including the captain's bonus
+    """
+    tops = {}
+    for group, values in (('BC', backcourt), ('FC', frontcourt)):
+        top = sorted(values, reverse=True)[:MAX_PER_GROUP]
+        sums = [0.0]
+        for value in top:
+            sums.append(sums[-1] + value)
+        tops[group] = (top, sums)
+
+    (bc_top, bc_sums), (fc_top, fc_sums) = tops['BC'], tops['FC']
+    best = None
+    largest = None
+    for bc, fc in FORMATIONS:
+        # FORMATIONS lists larger lineups first; only the largest that fits counts
+        if bc > len(bc_top) or fc > len(fc_top) or (largest is not None and bc + fc < largest):
+            continue
+        largest = bc + fc
+        total = bc_sums[bc] + fc_sums[fc]
+        if captain_multiplier is not None and bc + fc:
+            captain = max(bc_top[:min(bc, 1)] + fc_top[:min(fc, 1)])
+            total += (captain_multiplier - 1) * captain
+        best = total if best is None else max(best, total)
+    return best
+
+
+def _player_value(value: Optional[PlayerValue], player: Dict, day: int) -> float:
+    if value is None:
+        return 0.0
+    if callable(value):
+        return value(player, day)
+    return player.get(value) or 0.0
+
+
+def best_lineups(players: Sequence[Dict], days: Sequence, projection: PlayerValue = 'fantasy_avg',
+                 tiebreak: Optional[PlayerValue] = None,
+                 captain_multiplier: Optional[float] = None) -> List[Dict]:
+    """
+    Optimal starting lineup for each gameday of a roster.
+
+    Args:
+        players: Roster player dicts with 'player_id' and 'position'
+        days: For each gameday, the player_ids that have a game (any container)
+        projection: Player dict key holding projected points, or
+            callable(player, day_index) -> projected points
+        tiebreak: Optional key or callable(player, day_index) used to break ties
+        captain_multiplier: The captain scores this many times their projection; no captain if None
+
+    Returns:
+        One dict per gameday with:
+            'starters': starting player dicts, best first
+            'bench': players with a game that day who don't start, best first
+            'captain': the captain's player dict (None without captain_multiplier)
+            'points': lineup points including the captain's bonus
+            'formation': (backcourt, frontcourt) starter counts
+    """
+    groups = [position_group(player.get('position')) for player in players]
+    projections = np.full((len(players), len(days)), np.nan)
+    tiebreaks = np.zeros((len(players), len(days)))
+    for d, playing in enumerate(days):
+        for i, player in enumerate(players):
+            if player['player_id'] in playing:
+                projections[i, d] = _player_value(projection, player, d)
+                tiebreaks[i, d] = _player_value(tiebreak, player, d)
+
+    solved = solve_lineups(groups, projections, tiebreaks, captain_multiplier)
+
+    lineups = []
+    for d in range(len(days)):
+        ranked = sorted((i for i in range(len(players)) if not np.isnan(projections[i, d])),
+                        key=lambda i: (-projections[i, d], -tiebreaks[i, d], i))
+        captain = int(solved['captain'][d])
+        lineups.append({
+            'starters': [players[i] for i in ranked if solved['starters'][i, d]],
+            'bench': [players[i] for i in ranked if not solved['starters'][i, d]],
+            'captain': players[captain] if captain >= 0 else None,
+            'points': float(solved['points'][d]),
+            'formation': tuple(int(count) for count in solved['formation'][d]),
+        })
+    return lineups
@@ -4,7 +4,7 @@ Functions to query player info, gameweek calendars, and fantasy statistics.
 """
 
 import sqlite3
-from database import get_connection
+from app.database import get_read_connection
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
@@ -23,7 +23,7 @@ class QueryUtils:
         Returns:
             Dictionary with player info or None if not found
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -66,7 +66,7 @@ class QueryUtils:
         Returns:
             Dictionary with player info or None if not found
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -110,7 +110,7 @@ class QueryUtils:
         Returns:
             List of player dictionaries
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -144,7 +144,7 @@ class QueryUtils:
         Returns:
             List of gameweeks with start and end dates
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -178,7 +178,7 @@ class QueryUtils:
         Returns:
             Gameweek dictionary or None if date not in any gameweek
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -213,7 +213,7 @@ class QueryUtils:
         Returns:
             List of game statistics dictionaries
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -256,7 +256,7 @@ class QueryUtils:
         Returns:
             List of gameweek statistics dictionaries
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -301,7 +301,7 @@ class QueryUtils:
         Returns:
             List of matching player dictionaries
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         if team_id:
@@ -345,7 +345,7 @@ class QueryUtils:
         Returns:
             List of player statistics dictionaries
         """
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -0,0 +1,550 @@
+"""
+NBA Fantasy Roster Optimizer
+Exact salary-cap roster selection (5 Backcourt, 5 Frontcourt, max 2 per team).
+
+The search is a depth-first branch-and-bound over candidates sorted by score.
+Upper bounds come from a Lagrangian relaxation of the salary cap: for any
+multiplier lam >= 0, the remaining score is at most
+
+    lam * budget_left + top-k(score - lam * salary) per position group
+
+Those top-k sums are precomputed for every suffix of the candidate list, so a
+bound costs O(1) per multiplier and the search stays fast in pure Python.
+"""
+
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from app.scoring import DEFAULT_PROFILE
+
+# NBA Fantasy roster rules
+SALARY_CAP = 100.0
+ROSTER_SLOTS = {'BC': 5, 'FC': 5}
+MAX_PER_TEAM = 2
+
+_EPS = 1e-9
+_NEG_INF = float('-inf')
+_INF = float('inf')
+# Slack used when deferring subproblems so equal-valued rosters are not skipped
+_TIE_TOLERANCE = 1e-6
+
+
+def position_group(position: Optional[str]) -> str:
+    """
+    Classify a position string into a roster group.
+
+    Args:
+        position: Position as stored in the players table (e.g. 'G', 'F-C', 'G-F')
+
+    Returns:
+        'BC' for guards (any position containing 'G'), otherwise 'FC'
+    """
+    if position and 'G' in position.upper():
+        return 'BC'
+    return 'FC'
+
+
+def player_score(fantasy_avg: float, salary: float, performance_weight: float = 0.7) -> float:
+    """
+    Combined optimisation score: weighted blend of performance and value.
+
+    Args:
+        fantasy_avg: Average fantasy points per game
+        salary: Salary in millions
+        performance_weight: Weight for performance vs value (0-1)
+
+    Returns:
+        Score used as the objective by the optimizer
+    """
+    value = fantasy_avg / salary if salary > 0 else 0
+    return (performance_weight * fantasy_avg) + ((1 - performance_weight) * value * 10)
+
+
+def load_candidates(conn, start_date: str, end_date: str,
+                    performance_weight: float = 0.7, min_games: int = 2,
+                    profile: Optional[str] = None) -> List[Dict]:
+    """
+    Load salaried players with their fantasy averages over a date window.
+
+    Args:
+        conn: Database connection
+        start_date: First game date to include (YYYY-MM-DD)
+        end_date: Last game date to include (YYYY-MM-DD)
+        performance_weight: Weight for performance vs value (0-1)
+        min_games: Minimum games played in the window
+        profile: Scoring profile key (app.scoring.DEFAULT_PROFILE if omitted);
+            conn must have fp() registered (get_connection and the pool do this)
+
+    Returns:
+        List of candidate dictionaries, including 'value' and 'score'
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT
+            p.player_id,
+            p.player_name,
+            p.position,
+            t.team_name,
+            p.team_id,
+            p.salary,
+            COUNT(DISTINCT pgs.nba_game_id) as games_played,
+            ROUND(AVG(pgs.points), 1) as avg_points,
+            ROUND(AVG(pgs.rebounds), 1) as avg_rebounds,
+            ROUND(AVG(pgs.assists), 1) as avg_assists,
+            ROUND(AVG(pgs.steals), 1) as avg_steals,
+            ROUND(AVG(pgs.blocks), 1) as avg_blocks,
+            ROUND(AVG(pgs.turnovers), 1) as avg_turnovers,
+            ROUND(AVG(fp(pgs.points, pgs.rebounds, pgs.assists, pgs.blocks, pgs.steals,
+                         pgs.turnovers, ?)), 1) as fantasy_avg
+        FROM player_game_stats pgs
+        JOIN players p ON pgs.player_id = p.player_id
+        JOIN teams t ON p.team_id = t.team_id
+        JOIN games g ON g.game_id = pgs.nba_game_id
+        WHERE g.game_date >= ? AND g.game_date <= ?
+        AND pgs.minutes_played > 0
+        AND p.salary IS NOT NULL
+        GROUP BY p.player_id, p.player_name, p.position, t.team_name, p.team_id, p.salary
+        HAVING games_played >= ?
+        ORDER BY fantasy_avg DESC
+    """, (profile or DEFAULT_PROFILE, start_date, end_date, min_games))
+
+    columns = [col[0] for col in cur.description]
+    candidates = []
+    for row in cur.fetchall():
+        player = dict(zip(columns, row))
+        salary = player['salary']
+        player['value'] = player['fantasy_avg'] / salary if salary > 0 else 0
+        player['score'] = player_score(player['fantasy_avg'], salary, performance_weight)
+        candidates.append(player)
+    return candidates
+
+
+def greedy_roster(candidates: Sequence[Dict], max_salary: float = SALARY_CAP) -> Dict:
+    """
+    Single greedy pass by descending score (the original heuristic).
+
+    Kept as a baseline for benchmarks; it frequently leaves cap space unused.
+
+    Args:
+        candidates: Candidate dictionaries with position, team_id, salary and score
+        max_salary: Salary cap in millions
+
+    Returns:
+        Roster dictionary (see RosterSolver.solve)
+    """
+    selected = []
+    team_counts = defaultdict(int)
+    group_counts = defaultdict(int)
+    total_salary = 0.0
+
+    for player in sorted(candidates, key=lambda p: p['score'], reverse=True):
+        if len(selected) >= sum(ROSTER_SLOTS.values()):
+            break
+        group = position_group(player['position'])
+        if total_salary + player['salary'] > max_salary + _EPS:
+            continue
+        if team_counts[player['team_id']] >= MAX_PER_TEAM:
+            continue
+        if group_counts[group] >= ROSTER_SLOTS[group]:
+            continue
+        selected.append(player)
+        team_counts[player['team_id']] += 1
+        group_counts[group] += 1
+        total_salary += player['salary']
+
+    return _roster_result(selected)
+
+
+def _roster_result(players: List[Dict], nodes: int = 0) -> Dict:
+    """Build the roster dictionary returned by the optimizers."""
+    complete = len(players) == sum(ROSTER_SLOTS.values())
+    return {
+        'players': players,
+        'score': sum(p['score'] for p in players),
+        'salary': sum(p['salary'] for p in players),
+        'fantasy_avg': sum(p.get('fantasy_avg', 0) or 0 for p in players),
+        'complete': complete,
+        'nodes': nodes,
+    }
+
+
+class RosterSolver:
+    """Exact branch-and-bound solver over a fixed candidate pool."""
+
+    # Number of Lagrange multipliers tried per bound evaluation
+    NUM_MULTIPLIERS = 5
+
+    def __init__(self, candidates: Sequence[Dict], max_salary: float = SALARY_CAP,
+                 reduce_dominated: bool = False):
+        """
+        Args:
+            candidates: Candidate dictionaries with position, team_id, salary and score
+            max_salary: Salary cap in millions
+            reduce_dominated: Drop players that can never be needed in the single
+                best roster (see _drop_dominated). Only valid for solve() without
+                include/exclude/avoid constraints.
+        """
+        self.max_salary = max_salary
+        pool = [p for p in candidates if p.get('salary') is not None and p['salary'] <= max_salary]
+        if reduce_dominated:
+            pool = self._drop_dominated(pool)
+        pool.sort(key=lambda p: p['score'], reverse=True)
+
+        self.candidates = pool
+        self.score = [float(p['score']) for p in pool]
+        self.salary = [float(p['salary']) for p in pool]
+        self.group = [0 if position_group(p['position']) == 'BC' else 1 for p in pool]
+        team_index = {}
+        self.team = [team_index.setdefault(p['team_id'], len(team_index)) for p in pool]
+        self.num_teams = len(team_index)
+        self.slots = (ROSTER_SLOTS['BC'], ROSTER_SLOTS['FC'])
+        self._index = {id(p): i for i, p in enumerate(pool)}
+
+        self._multipliers = self._choose_multipliers()
+        self._root_tables = self._bound_tables()
+
+    # ------------------------------------------------------------------
+    # Preprocessing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _drop_dominated(pool: List[Dict]) -> List[Dict]:
+        """
+        Remove players dominated by others on enough distinct teams.
+
+        A player p is dominated by q (same position group) when q costs no more
+        and scores no less. If p's dominators span at least roster-size distinct
+        teams, any roster using p can swap p for a dominator whose team is not
+        on the other 9 spots, so p is never required for the optimum.
+        """
+        roster_size = sum(ROSTER_SLOTS.values())
+        kept = []
+        for group in ROSTER_SLOTS:
+            members = [(i, p) for i, p in enumerate(pool) if position_group(p['position']) == group]
+            # Cheapest first, best score first among equal salaries, then stable index
+            members.sort(key=lambda item: (item[1]['salary'], -item[1]['score'], item[0]))
+            for pos, (_, player) in enumerate(members):
+                teams = set()
+                for _, other in members[:pos]:
+                    if other['score'] >= player['score']:
+                        teams.add(other['team_id'])
+                        if len(teams) >= roster_size:
+                            break
+                if len(teams) < roster_size:
+                    kept.append(player)
+        return kept
+
+    def _suffix_topk(self, values: List[float]) -> List[List[tuple]]:
+        """
+        For each group and each suffix start, the best sums of exactly k values.
+
+        Returns:
+            tables[group][pos][k] = max sum of k values of that group in
+            candidates[pos:], or -inf when fewer than k are available
+        """
+        n = len(values)
+        tables = []
+        for g, slots in enumerate(self.slots):
+            best = []  # descending list of the top `slots` values seen so far
+            table = [None] * (n + 1)
+            table[n] = self._prefix_sums(best, slots)
+            for pos in range(n - 1, -1, -1):
+                if self.group[pos] == g:
+                    v = values[pos]
+                    if len(best) < slots or v > best[-1]:
+                        # Insert keeping descending order; lists are at most 5 long
+                        k = len(best)
+                        while k > 0 and best[k - 1] < v:
+                            k -= 1
+                        best.insert(k, v)
+                        if len(best) > slots:
+                            best.pop()
+                table[pos] = self._prefix_sums(best, slots)
+            tables.append(table)
+        return tables
+
+    @staticmethod
+    def _prefix_sums(best: List[float], slots: int) -> tuple:
+        sums = [0.0]
+        for v in best:
+            sums.append(sums[-1] + v)
+        sums.extend([_NEG_INF] * (slots + 1 - len(sums)))
+        return tuple(sums)
+
+    def _bound_tables(self) -> tuple:
+        """Minimum-salary table plus one top-k table per multiplier."""
+        min_salary = self._suffix_topk([-c for c in self.salary])
+        tables = [self._suffix_topk([s - lam * c for s, c in zip(self.score, self.salary)])
+                  for lam in self._multipliers]
+        return min_salary, tables
+
+    def _root_bound(self, lam: float) -> float:
+        table = self._suffix_topk([s - lam * c for s, c in zip(self.score, self.salary)])
+        return lam * self.max_salary + table[0][0][self.slots[0]] + table[1][0][self.slots[1]]
+
+    def _choose_multipliers(self) -> List[float]:
+        """Pick multipliers around the one that minimises the root bound."""
+        if not self.candidates:
+            return [0.0]
+        ratios = [s / c for s, c in zip(self.score, self.salary) if c > 0]
+        lo, hi = 0.0, max(ratios) if ratios else 0.0
+        # The Lagrangian dual is convex in lam: ternary search for its minimum
+        for _ in range(30):
+            m1 = lo + (hi - lo) / 3
+            m2 = hi - (hi - lo) / 3
+            if self._root_bound(m1) <= self._root_bound(m2):
+                hi = m2
+            else:
+                lo = m1
+        best = (lo + hi) / 2
+        spread = (0.0, 0.6, 1.0, 1.3, 1.7)[:self.NUM_MULTIPLIERS]
+        return [best * f for f in spread]
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _make_bound(self):
+        """Return bound(pos, need_bc, need_fc, budget) over the candidate pool."""
+        # Tables cover the whole pool; forced/forbidden players only loosen the
+        # bound slightly, and rebuilding per subproblem costs more than it saves.
+        min_sal, tables = self._root_tables
+        terms = list(zip(self._multipliers, tables))
+        min_bc, min_fc = min_sal
+
+        def bound(pos, need_bc, need_fc, budget):
+            """Upper bound on the score still obtainable from candidates[pos:]."""
+            if -(min_bc[pos][need_bc] + min_fc[pos][need_fc]) > budget + _EPS:
+                return _NEG_INF
+            best = _INF
+            for lam, (t_bc, t_fc) in terms:
+                value = lam * budget + t_bc[pos][need_bc] + t_fc[pos][need_fc]
+                if value < best:
+                    best = value
+            return best
+
+        return bound
+
+    def _indices(self, players: Sequence[Dict]) -> List[int]:
+        indices = []
+        for player in players:
+            idx = self._index.get(id(player))
+            if idx is None:
+                pid = player.get('player_id')
+                idx = next((i for i, p in enumerate(self.candidates)
+                            if pid is not None and p.get('player_id') == pid), None)
+            if idx is not None:
+                indices.append(idx)
+        return indices
+
+    def _search(self, include=(), exclude=(), avoid=(), max_overlap=None,
+                lower_bound: float = _NEG_INF):
+        """
+        Run branch-and-bound with optional constraints.
+
+        Args:
+            include: Candidate indices forced into the roster
+            exclude: Candidate indices forbidden from the roster
+            avoid: Accepted rosters (sets of indices) to stay away from
+            max_overlap: Maximum players shared with any roster in `avoid`
+            lower_bound: Only solutions scoring strictly above this are returned
+
+        Returns:
+            (score, sorted index tuple) of the best roster, or None, and node count
+        """
+        n = len(self.candidates)
+        score, salary, group, team = self.score, self.salary, self.group, self.team
+        need = list(self.slots)
+        team_counts = [0] * self.num_teams
+        budget = self.max_salary
+        cur = 0.0
+
+        member_of = defaultdict(list)
+        for r, roster in enumerate(avoid):
+            for idx in roster:
+                member_of[idx].append(r)
+        overlap = [0] * len(avoid)
+
+        chosen = []
+        for idx in include:
+            g = group[idx]
+            need[g] -= 1
+            team_counts[team[idx]] += 1
+            budget -= salary[idx]
+            cur += score[idx]
+            chosen.append(idx)
+            for r in member_of.get(idx, ()):
+                overlap[r] += 1
+        if (min(need) < 0 or budget < -_EPS or any(c > MAX_PER_TEAM for c in team_counts)
+                or (max_overlap is not None and any(o > max_overlap for o in overlap))):
+            return None, 0
+
+        skip = frozenset(include) | frozenset(exclude)
+        best = [lower_bound, None]
+        nodes = [0]
+        bound = self._make_bound()
+
+        def dfs(pos, need_bc, need_fc, budget, cur):
+            nodes[0] += 1
+            if need_bc == 0 and need_fc == 0:
+                if cur > best[0] + _EPS:
+                    best[0] = cur
+                    best[1] = tuple(sorted(chosen))
+                return
+            for j in range(pos, n):
+                if cur + bound(j, need_bc, need_fc, budget) <= best[0] + _EPS:
+                    # Bounds only shrink as the suffix shrinks
+                    return
+                if j in skip:
+                    continue
+                g = group[j]
+                if (need_bc if g == 0 else need_fc) == 0:
+                    continue
+                if salary[j] > budget + _EPS or team_counts[team[j]] >= MAX_PER_TEAM:
+                    continue
+                rosters = member_of.get(j, ())
+                if max_overlap is not None and any(overlap[r] >= max_overlap for r in rosters):
+                    continue
+                for r in rosters:
+                    overlap[r] += 1
+                team_counts[team[j]] += 1
+                chosen.append(j)
+                if g == 0:
+                    dfs(j + 1, need_bc - 1, need_fc, budget - salary[j], cur + score[j])
+                else:
+                    dfs(j + 1, need_bc, need_fc - 1, budget - salary[j], cur + score[j])
+                chosen.pop()
+                team_counts[team[j]] -= 1
+                for r in rosters:
+                    overlap[r] -= 1
+
+        dfs(0, need[0], need[1], budget, cur)
+        if best[1] is None:
+            return None, nodes[0]
+        return (best[0], best[1]), nodes[0]
+
+    def solve(self, include: Sequence[Dict] = (), exclude: Sequence[Dict] = ()) -> Optional[Dict]:
+        """
+        Find the provably best roster.
+
+        Args:
+            include: Players that must be on the roster
+            exclude: Players that must not be on the roster
+
+        Returns:
+            Roster dictionary with 'players', 'score', 'salary', 'fantasy_avg',
+            'complete' and 'nodes' (search nodes visited), or None if infeasible
+        """
+        result, nodes = self._search(self._indices(include), self._indices(exclude))
+        if result is None:
+            return None
+        return self._result(result[1], nodes)
+
+    def iter_rosters(self, min_distance: int = 0) -> Iterator[Dict]:
+        """
+        Yield distinct rosters in descending score order.
+
+        Uses Lawler's partitioning: once a roster is accepted, its remaining
+        search space is split into disjoint subproblems (force in the first j-1
+        of its free players, forbid the j-th). Subproblems sit in a max-heap
+        keyed by an upper bound and are only solved when they reach the top,
+        so roster k+1 is produced from the queue left behind by roster k
+        instead of re-solving from scratch.
+
+        Args:
+            min_distance: Minimum Hamming distance between any two yielded
+                rosters, counted over player sets (swapping one player = 2)
+
+        Yields:
+            Roster dictionaries (see solve), with 'rank' set
+        """
+        roster_size = sum(self.slots)
+        max_overlap = None
+        if min_distance > 0:
+            max_overlap = roster_size - (min_distance + 1) // 2
+            if max_overlap < 0:
+                return
+
+        accepted = []
+        counter = itertools.count()
+        # (-upper bound, tiebreak, include, exclude, solution, accepted count when solved)
+        heap = [(-_INF, next(counter), (), (), None, 0)]
+
+        while heap:
+            neg_bound, _, include, exclude, solution, solved_at = heapq.heappop(heap)
+
+            if solution is not None and max_overlap is not None and solved_at < len(accepted):
+                # Rosters accepted since this subproblem was solved may rule it out
+                members = set(solution[1])
+                if any(len(members & roster) > max_overlap for roster in accepted[solved_at:]):
+                    solution = None
+
+            if solution is None:
+                # Unsolved (or stale) subproblem. Only a roster beating the best one
+                # already solved in the queue matters right now; if there is none,
+                # requeue below that roster instead of solving exactly.
+                threshold = max((-entry[0] for entry in heap if entry[4] is not None),
+                                default=_NEG_INF) - _TIE_TOLERANCE
+                solution, _ = self._search(include, exclude, accepted, max_overlap, threshold)
+                if solution is not None:
+                    heapq.heappush(heap, (-solution[0], next(counter), include, exclude,
+                                          solution, len(accepted)))
+                elif threshold != _NEG_INF:
+                    heapq.heappush(heap, (-threshold, next(counter), include, exclude,
+                                          None, len(accepted)))
+                continue
+
+            score, indices = solution
+            accepted.append(set(indices))
+            roster = self._result(indices)
+            roster['rank'] = len(accepted)
+            yield roster
+
+            forced = set(include)
+            free = [i for i in indices if i not in forced]
+            for j, idx in enumerate(free):
+                child_include = include + tuple(free[:j])
+                if max_overlap is not None and len(child_include) > max_overlap:
+                    # Every later child shares even more players with this roster
+                    break
+                heapq.heappush(heap, (-score, next(counter), child_include, exclude + (idx,),
+                                      None, len(accepted)))
+
+    def _result(self, indices, nodes: int = 0) -> Dict:
+        players = [self.candidates[i] for i in indices]
+        players.sort(key=lambda p: (position_group(p['position']), -p['score']))
+        return _roster_result(players, nodes)
+
+
+def solve_roster(candidates: Sequence[Dict], max_salary: float = SALARY_CAP) -> Optional[Dict]:
+    """
+    Return the optimal 10-man roster for a candidate pool.
+
+    Args:
+        candidates: Candidate dictionaries with position, team_id, salary and score
+        max_salary: Salary cap in millions
+
+    Returns:
+        Roster dictionary, or None if no legal roster exists
+    """
+    return RosterSolver(candidates, max_salary, reduce_dominated=True).solve()
+
+
+def top_k_rosters(candidates: Sequence[Dict], k: int = 10, min_distance: int = 0,
+                  max_salary: float = SALARY_CAP) -> List[Dict]:
+    """
+    Return the K best distinct rosters, optionally spread apart.
+
+    Args:
+        candidates: Candidate dictionaries with position, team_id, salary and score
+        k: Number of rosters to return
+        min_distance: Minimum Hamming distance between rosters (0 = just distinct)
+        max_salary: Salary cap in millions
+
+    Returns:
+        Up to k roster dictionaries in descending score order
+    """
+    solver = RosterSolver(candidates, max_salary)
+    return list(itertools.islice(solver.iter_rosters(min_distance), k))
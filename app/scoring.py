@@ -0,0 +1,124 @@
+"""
+Scoring Profiles
+Named, versioned fantasy scoring rules and the SQLite `fp()` function built on them.
+
+A profile is a set of per-stat weights. Profiles are never edited in place:
+changing a rule means adding a new version, so cached scores computed under
+an old version stay valid and comparable.
+
+register_scoring_functions() installs `fp()` on a connection so queries can
+score box scores without repeating the formula:
+
+    fp(points, rebounds, assists, blocks, steals)                        -- default profile
+    fp(points, rebounds, assists, blocks, steals, turnovers)             -- default profile
+    fp(points, rebounds, assists, blocks, steals, turnovers, 'profile')  -- named profile
+
+The function is registered as deterministic, so SQLite may use it in indexes,
+generated columns and constant folding.
+"""
+
+import os
+import sqlite3
+from typing import Dict, Optional
+
+# Stat columns a profile can weight, in fp() argument order
+STAT_COLUMNS = ('points', 'rebounds', 'assists', 'blocks', 'steals', 'turnovers')
+
+
+class ScoringProfile:
+    """
+    One version of a scoring rule set.
+
+    Args:
+        name: Rule set name (e.g. 'nba_fantasy')
+        version: Version number; bump it instead of changing weights
+        weights: Points per unit of each stat in STAT_COLUMNS (missing stats score 0)
+        description: Human-readable summary
+    """
+
+    def __init__(self, name: str, version: int, weights: Dict[str, float], description: str = ''):
+        unknown = set(weights) - set(STAT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown stats in scoring profile {name}: {sorted(unknown)}")
+        self.name = name
+        self.version = version
+        self.weights = {stat: weights.get(stat, 0) for stat in STAT_COLUMNS}
+        self.description = description
+        self._vector = tuple(self.weights[stat] for stat in STAT_COLUMNS)
+
+    @property
+    def key(self) -> str:
+        """Identifier stored alongside cached scores, e.g. 'nba_fantasy_v1'."""
+        return f"{self.name}_v{self.version}"
+
+    def score(self, points=0, rebounds=0, assists=0, blocks=0, steals=0, turnovers=0):
+        """
+        Score one stat line; None values count as 0.
+
+        Returns:
+            Fantasy points (an int when every weight is whole)
+        """
+        total = 0
+        for weight, value in zip(self._vector, (points, rebounds, assists, blocks, steals, turnovers)):
+            if weight and value:
+                total += weight * value
+        return total
+
+    def __repr__(self) -> str:
+        return f"ScoringProfile({self.key!r})"
+
+
+# Official NBA Fantasy rules (the FantasyCalculator multipliers)
+NBA_FANTASY = ScoringProfile('nba_fantasy', 1, {
+    'points': 1, 'rebounds': 1, 'assists': 2, 'blocks': 3, 'steals': 3,
+}, "Official NBA Fantasy: PTS + REB + 2*AST + 3*BLK + 3*STL")
+
+# Same rules with a point taken off per turnover
+NBA_FANTASY_TURNOVERS = ScoringProfile('nba_fantasy_to', 1, {
+    'points': 1, 'rebounds': 1, 'assists': 2, 'blocks': 3, 'steals': 3, 'turnovers': -1,
+}, "NBA Fantasy with a -1 turnover penalty")
+
+PROFILES: Dict[str, ScoringProfile] = {
+    profile.key: profile for profile in (NBA_FANTASY, NBA_FANTASY_TURNOVERS)
+}
+
+# Profile used when a query or request doesn't name one
+DEFAULT_PROFILE = os.getenv('SCORING_PROFILE', NBA_FANTASY.key)
+
+
+def get_profile(key: Optional[str] = None) -> ScoringProfile:
+    """
+    Look up a registered profile.
+
+    Args:
+        key: Profile key such as 'nba_fantasy_v1' (DEFAULT_PROFILE if omitted)
+
+    Returns:
+        The ScoringProfile
+
+    Raises:
+        ValueError: If no profile is registered under the key
+    """
+    key = key or DEFAULT_PROFILE
+    try:
+        return PROFILES[key]
+    except KeyError:
+        raise ValueError(f"Unknown scoring profile '{key}' (known: {', '.join(sorted(PROFILES))})") from None
+
+
+def register_scoring_functions(conn: sqlite3.Connection, profile: Optional[str] = None):
+    """
+    Install the deterministic fp() SQL function on a connection.
+
+    Args:
+        conn: SQLite connection
+        profile: Profile used by the 5- and 6-argument forms (DEFAULT_PROFILE if omitted)
+    """
+    default = get_profile(profile)
+
+    def fp_named(points, rebounds, assists, blocks, steals, turnovers, key):
+        return PROFILES[key].score(points, rebounds, assists, blocks, steals, turnovers)
+
+    conn.create_function('fp', 5, default.score, deterministic=True)
+    conn.create_function('fp', 6, default.score, deterministic=True)
+    conn.create_function('fp', 7, fp_named, deterministic=True)
@@ -0,0 +1,215 @@
+"""
+Columnar Stats Store
+Per-worker, in-memory copy of player_game_stats for the analytics endpoints.
+
+The table is loaded once into NumPy arrays sorted by (player, game date), with
+an offsets array marking where each player's games start. A player's games
+are then one contiguous slice, and prefix sums over fantasy points turn
+season totals and last-N averages into two array lookups per player, computed
+for every requested player at once.
+
+The store checks PRAGMA data_version before answering; it changes whenever
+another connection commits (e.g. the daily update), and the arrays are
+rebuilt on the next request.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from app.database import DB_PATH
+from app.scoring import PROFILES, STAT_COLUMNS, get_profile
+
+# Last-N windows precomputed alongside the season figures
+WINDOWS = (5, 10, 30)
+
+
+class StatsColumns:
+    """
+    Immutable snapshot of player_game_stats in column form.
+
+    Attributes:
+        player_ids: Sorted distinct player IDs
+        offsets: player i's games are rows offsets[i]:offsets[i + 1], oldest first
+        game_dates: Game date of every row (datetime64[D])
+        minutes: Minutes played (NaN where unknown)
+        fantasy_points: Profile key -> fantasy points of every row
+    """
+
+    def __init__(self, player_ids: np.ndarray, offsets: np.ndarray, game_dates: np.ndarray,
+                 stats: np.ndarray, minutes: np.ndarray):
+        self.player_ids = player_ids
+        self.offsets = offsets
+        self.game_dates = game_dates
+        self.minutes = minutes
+        self.fantasy_points: Dict[str, np.ndarray] = {}
+        self._fp_sums: Dict[str, np.ndarray] = {}
+        for key, profile in PROFILES.items():
+            weights = np.array([profile.weights[stat] for stat in STAT_COLUMNS], dtype=np.float64)
+            points = stats @ weights
+            self.fantasy_points[key] = points
+            self._fp_sums[key] = self._prefix_sum(points)
+        # Prefix sums for minutes skip NULLs, like SQL AVG
+        known = ~np.isnan(minutes)
+        self._minute_sums = self._prefix_sum(np.where(known, minutes, 0.0))
+        self._minute_counts = self._prefix_sum(known.astype(np.float64))
+
+    @staticmethod
+    def _prefix_sum(values: np.ndarray) -> np.ndarray:
+        sums = np.zeros(len(values) + 1, dtype=np.float64)
+        np.cumsum(values, out=sums[1:])
+        return sums
+
+    @classmethod
+    def load(cls, conn) -> 'StatsColumns':
+        """
+        Read player_game_stats into a snapshot.
+
+        Args:
+            conn: Open SQLite connection
+
+        Returns:
+            StatsColumns over every stored game
+        """
+        rows = conn.execute(f"""
+            SELECT player_id, game_date, {', '.join(STAT_COLUMNS)}, minutes_played
+            FROM player_game_stats
+            ORDER BY player_id, game_date
+        """).fetchall()
+        if not rows:
+            return cls(np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64),
+                       np.zeros(0, dtype='datetime64[D]'), np.zeros((0, len(STAT_COLUMNS))),
+                       np.zeros(0))
+
+        columns = list(zip(*rows))
+        row_players = np.array(columns[0], dtype=np.int64)
+        game_dates = np.array([value[:10] for value in columns[1]], dtype='datetime64[D]')
+        # NULL stats count as 0, as they do in fp()
+        stats = np.array(columns[2:2 + len(STAT_COLUMNS)], dtype=np.float64).T
+        stats = np.nan_to_num(stats)
+        minutes = np.array(columns[-1], dtype=np.float64)
+
+        starts = np.flatnonzero(np.r_[True, row_players[1:] != row_players[:-1]])
+        offsets = np.r_[starts, len(row_players)].astype(np.int64)
+        return cls(row_players[starts], offsets, game_dates, stats, minutes)
+
+    def __len__(self) -> int:
+        return len(self.game_dates)
+
+    def games(self, player_id: int, profile: Optional[str] = None) -> np.ndarray:
+        """Fantasy points of one player's games, oldest first (empty if unknown)."""
+        i = np.searchsorted(self.player_ids, player_id)
+        if i == len(self.player_ids) or self.player_ids[i] != player_id:
+            return np.zeros(0)
+        return self.fantasy_points[get_profile(profile).key][self.offsets[i]:self.offsets[i + 1]]
+
+    def summary(self, player_ids: Iterable[int], profile: Optional[str] = None) -> Dict[int, Dict]:
+        """
+        Season and last-N figures for many players in one vectorized pass.
+
+        Args:
+            player_ids: Players to summarise
+            profile: Scoring profile key (DEFAULT_PROFILE if omitted)
+
+        Returns:
+            player_id -> dict with the player_fantasy_summary columns (games_played,
+            season_total_fp, season_avg_fp, last5/10/30_avg_fp, avg_minutes,
+            last30_avg_minutes, last_game_date); players without games are omitted
+        """
+        fp_sums = self._fp_sums[get_profile(profile).key]
+        wanted = np.unique(np.fromiter(player_ids, dtype=np.int64))
+        idx = np.searchsorted(self.player_ids, wanted)
+        found = idx < len(self.player_ids)
+        found[found] = self.player_ids[idx[found]] == wanted[found]
+        wanted, idx = wanted[found], idx[found]
+        if not len(idx):
+            return {}
+
+        start, end = self.offsets[idx], self.offsets[idx + 1]
+        count = end - start
+        total = fp_sums[end] - fp_sums[start]
+        columns = {
+            'games_played': count,
+            'season_total_fp': total,
+            'season_avg_fp': total / count,
+        }
+        for n in WINDOWS:
+            lo = np.maximum(start, end - n)
+            columns[f'last{n}_avg_fp'] = (fp_sums[end] - fp_sums[lo]) / (end - lo)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns['avg_minutes'] = ((self._minute_sums[end] - self._minute_sums[start]) /
+                                      (self._minute_counts[end] - self._minute_counts[start]))
+            lo = np.maximum(start, end - 30)
+            columns['last30_avg_minutes'] = ((self._minute_sums[end] - self._minute_sums[lo]) /
+                                             (self._minute_counts[end] - self._minute_counts[lo]))
+        last_dates = self.game_dates[end - 1].astype(str)
+
+        lists = {name: values.tolist() for name, values in columns.items()}
+        result = {}
+        for i, player_id in enumerate(wanted.tolist()):
+            row = {name: values[i] for name, values in lists.items()}
+            for name in ('avg_minutes', 'last30_avg_minutes'):
+                if row[name] != row[name]:  # NaN: no minutes recorded
+                    row[name] = None
+            row['last_game_date'] = str(last_dates[i])
+            result[player_id] = row
+        return result
+
+
+class StatsStore:
+    """
+    Keeps a StatsColumns snapshot of one database current for this process.
+
+    A dedicated read-only connection polls PRAGMA data_version, which changes
+    when any other connection commits; the snapshot is rebuilt then. Readers
+    get the snapshot object itself, so a reload never changes arrays under a
+    request that is already using them.
+
+    Args:
+        db_path: Database file
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.pid = os.getpid()
+        self.loads = 0
+        self._conn = None
+        self._version = None
+        self._columns: Optional[StatsColumns] = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                         check_same_thread=False)
+        return self._conn
+
+    def current(self) -> StatsColumns:
+        """Return the snapshot, reloading it first if the database has changed."""
+        with self._lock:
+            conn = self._connection()
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._columns is None or version != self._version:
+                self._columns = StatsColumns.load(conn)
+                self._version = version
+                self.loads += 1
+            return self._columns
+
+
+_stores: Dict[str, StatsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_stats_store(db_path=None) -> StatsStore:
+    """Return this process's store for a database file (DB_PATH by default; a new one after a fork)."""
+    key = str(db_path or DB_PATH)
+    store = _stores.get(key)
+    if store is None or store.pid != os.getpid():
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None or store.pid != os.getpid():
+                store = _stores[key] = StatsStore(key)
+    return store
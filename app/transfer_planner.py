@@ -0,0 +1,388 @@
+"""
+Transfer Planner
+Best 1- and 2-transfer moves for a gameweek, scored by projected starting-five points.
+
+A roster's weekly value is the sum over the gameweek's gamedays of its optimal
+lineup points (app.lineups), counting the players with a game that day. A
+transfer swaps a roster player for a player of the same position group; the
+incoming salaries must fit in the bank plus the outgoing salaries, and no team
+may have more than MAX_PER_TEAM players afterwards.
+
+Every 1- and 2-transfer combination is covered, with pruning. Search bounds
+use projections clamped at zero: with them a lineup's value is submodular in
+the players available (a weighted rank of a laminar matroid, at most 3 per
+group and 5 in total, plus the captain's bonus on the best of them), so a pair
+of incoming players adds at most the sum of what each adds alone, and those
+single gains are computed for all candidates at once, one NumPy pass per
+gameday. Real lineups use raw projections and must be as large as possible,
+so a negative player may have to start; the clamped value of the players left
+after the outgoing ones exceeds their real value by a per-day slack, and
+adding that slack keeps the bound admissible. Swaps are tried in decreasing
+order of the bound, each loop stops once it can't beat the k-th best plan
+found so far, and only the surviving swaps are scored exactly. Gameday values
+are memoized on (gameday, players with a game): a swap only rescores the days
+its players play, and those player sets repeat across most candidates.
+"""
+
+import heapq
+import itertools
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.gamedays import SEASON_START, gameday_label
+from app.lineups import FORMATIONS, GROUPS, MAX_PER_GROUP, lineup_points
+from app.roster_optimizer import MAX_PER_TEAM, position_group
+from app.scoring import DEFAULT_PROFILE
+
+# player_fantasy_summary columns that can serve as a player's projection
+PROJECTIONS = ('last5_avg_fp', 'last10_avg_fp', 'last30_avg_fp', 'season_avg_fp')
+
+_EPS = 1e-9
+_NEG_INF = float('-inf')
+
+
+def load_gameweek_schedule(conn, gameweek: int) -> Tuple[List[str], Dict[int, set]]:
+    """
+    Gamedays of a gameweek and the gamedays each team plays on.
+
+    Games are grouped by their stored fantasy gameday (game_gamedays), or by
+    date in gameweeks without known deadlines.
+
+    Args:
+        conn: Open SQLite connection
+        gameweek: Gameweek number
+
+    Returns:
+        (gameday labels in order, team_id -> set of gameday labels)
+    """
+    week_start = SEASON_START + timedelta(days=(gameweek - 1) * 7)
+    week_end = week_start + timedelta(days=6)
+    rows = conn.execute("""
+        SELECT g.game_date, g.home_team_id, g.away_team_id, gg.gameweek, gg.day_num
+        FROM games g
+        LEFT JOIN game_gamedays gg ON gg.game_id = g.game_id
+        WHERE g.game_date >= ? AND g.game_date <= ?
+        ORDER BY g.game_date, g.game_time
+    """, (week_start.isoformat(), week_end.isoformat())).fetchall()
+
+    # Gamedays in (gameweek, day) order, then any date-labelled days by date
+    order = {}
+    team_days = defaultdict(set)
+    for game_date, home_team_id, away_team_id, gw, day_num in rows:
+        label = gameday_label(gw, day_num, game_date)
+        order.setdefault(label, (0, gw, day_num, '') if day_num is not None else (1, 0, 0, game_date))
+        team_days[home_team_id].add(label)
+        team_days[away_team_id].add(label)
+    return sorted(order, key=order.get), dict(team_days)
+
+
+def load_player_pool(conn, gameweek: int, projection: str = 'last5_avg_fp',
+                     profile: Optional[str] = None) -> Tuple[List[str], List[Dict]]:
+    """
+    Load every salaried player with a projection and their gamedays in a gameweek.
+
+    Args:
+        conn: Open SQLite connection
+        gameweek: Gameweek to plan for
+        projection: player_fantasy_summary column used as projected points per game
+        profile: Scoring profile key (DEFAULT_PROFILE if omitted)
+
+    Returns:
+        (gameday labels, player dicts with player_id, player_name, position,
+        group, team_id, team, salary, projection and gamedays)
+
+    Raises:
+        ValueError: If projection is not one of PROJECTIONS
+    """
+    if projection not in PROJECTIONS:
+        raise ValueError(f"Unknown projection '{projection}' (known: {', '.join(PROJECTIONS)})")
+    gamedays, team_days = load_gameweek_schedule(conn, gameweek)
+
+    rows = conn.execute(f"""
+        SELECT p.player_id, p.player_name, p.position, p.team_id, t.team_abbreviation,
+               p.salary, s.{projection}
+        FROM players p
+        JOIN teams t ON t.team_id = p.team_id
+        LEFT JOIN player_fantasy_summary s ON s.player_id = p.player_id AND s.profile = ?
+        WHERE p.salary IS NOT NULL
+    """, (profile or DEFAULT_PROFILE,)).fetchall()
+
+    players = []
+    for player_id, name, position, team_id, team, salary, projected in rows:
+        players.append({
+            'player_id': player_id,
+            'player_name': name,
+            'position': position,
+            'group': position_group(position),
+            'team_id': team_id,
+            'team': team,
+            'salary': salary,
+            'projection': projected or 0.0,
+            'gamedays': frozenset(team_days.get(team_id, ())),
+        })
+    return gamedays, players
+
+
+class TransferPlanner:
+    """
+    Transfer search for one roster over one gameweek.
+
+    Args:
+        roster: The roster's player dicts (as returned by load_player_pool)
+        pool: Players who could come in (roster players are skipped)
+        gamedays: The gameweek's gameday labels
+        captain_multiplier: The daily captain scores this many times their projection; no captain if None
+    """
+
+    def __init__(self, roster: Sequence[Dict], pool: Iterable[Dict], gamedays: Sequence[str],
+                 captain_multiplier: Optional[float] = None):
+        self.roster = list(roster)
+        self.gamedays = list(gamedays)
+        self.captain_multiplier = captain_multiplier
+        self.evaluated = 0
+        self._day_memo: Dict[tuple, float] = {}
+        self._gain_memo: Dict[tuple, np.ndarray] = {}
+
+        # Incoming candidates per group, as parallel lists/arrays
+        roster_ids = {player['player_id'] for player in self.roster}
+        self.candidates: Dict[str, List[Dict]] = {group: [] for group in GROUPS}
+        for player in pool:
+            if player['player_id'] not in roster_ids:
+                self.candidates[player['group']].append(player)
+        self._projections = {group: np.array([max(p['projection'], 0.0) for p in players], dtype=np.float64)
+                             for group, players in self.candidates.items()}
+        self._plays = {group: np.array([[day in p['gamedays'] for day in self.gamedays] for p in players],
+                                       dtype=bool).reshape(len(players), len(self.gamedays))
+                       for group, players in self.candidates.items()}
+
+        self.day_points = {day: self._day_points(day, self.roster) for day in self.gamedays}
+        self.points = sum(self.day_points.values())
+
+    def _day_points(self, day: str, players: Sequence[Dict], clamped: bool = False) -> float:
+        """
+        Optimal lineup points of the players with a game on a gameday (memoized).
+
+        With clamped, negative projections count as zero: the value the
+        search bounds are built on, never below the real one.
+        """
+        playing = [player for player in players if day in player['gamedays']]
+        key = (day, frozenset(player['player_id'] for player in playing), clamped)
+        points = self._day_memo.get(key)
+        if points is None:
+            projections = {group: [max(p['projection'], 0.0) if clamped else p['projection']
+                                   for p in playing if p['group'] == group] for group in GROUPS}
+            points = lineup_points(projections['BC'], projections['FC'], self.captain_multiplier)
+            self._day_memo[key] = points
+        return points
+
+    def _slack(self, players: Sequence[Dict]) -> float:
+        """How much the clamped weekly value of a set of players exceeds its real value."""
+        return sum(self._day_points(day, players, clamped=True) - self._day_points(day, players)
+                   for day in self.gamedays)
+
+    def _day_gains(self, day: str, players: Sequence[Dict], group: str) -> np.ndarray:
+        """
+        Clamped lineup points each candidate of a group would add on a gameday (memoized).
+
+        Projections are clamped at zero, as in _day_points(clamped=True), so
+        the gains are submodular and bound the real ones together with _slack.
+        Adding one player with projection x to a group only changes that
+        group's top-3 prefix sums, to max(old[k], old[k - 1] + x), so every
+        formation is rescored for all candidates at once.
+        """
+        playing = [player for player in players if day in player['gamedays']]
+        key = (day, frozenset(player['player_id'] for player in playing), group)
+        gains = self._gain_memo.get(key)
+        if gains is not None:
+            return gains
+
+        x = self._projections[group]
+        tops, prefixes = {}, {}
+        for g in GROUPS:
+            top = sorted((max(p['projection'], 0.0) for p in playing if p['group'] == g), reverse=True)
+            top = (top + [-np.inf] * MAX_PER_GROUP)[:MAX_PER_GROUP]
+            tops[g] = top
+            prefixes[g] = [0.0] + list(np.cumsum(top))
+        own = prefixes[group]
+        new_own = [np.zeros_like(x)] + [np.maximum(own[k], own[k - 1] + x) for k in range(1, MAX_PER_GROUP + 1)]
+        new_top = np.maximum(tops[group][0], x)
+
+        other_group = GROUPS[1 - GROUPS.index(group)]
+        other, other_top = prefixes[other_group], tops[other_group][0]
+        before = 0.0
+        after = np.zeros_like(x)
+        for formation in FORMATIONS:
+            n_own, n_other = formation if group == GROUPS[0] else formation[::-1]
+            old_total = own[n_own] + other[n_other]
+            new_total = new_own[n_own] + other[n_other]
+            if self.captain_multiplier is not None and n_own + n_other:
+                bonus = self.captain_multiplier - 1
+                old_total += bonus * max(tops[group][0] if n_own else -np.inf, other_top if n_other else -np.inf)
+                new_total = new_total + bonus * np.maximum(new_top if n_own else -np.inf,
+                                                           other_top if n_other else -np.inf)
+            before = np.maximum(before, old_total)
+            after = np.maximum(after, new_total)
+        gains = after - before
+        self._gain_memo[key] = gains
+        return gains
+
+    def add_gains(self, players: Sequence[Dict], group: str) -> np.ndarray:
+        """Clamped weekly points each candidate of a group would add to a set of players."""
+        gains = np.zeros(len(self.candidates[group]))
+        for d, day in enumerate(self.gamedays):
+            gains += np.where(self._plays[group][:, d], self._day_gains(day, players, group), 0.0)
+        return gains
+
+    def swap_points(self, outs: Sequence[Dict], ins: Sequence[Dict]) -> float:
+        """
+        Weekly points of the roster after swapping players out and in.
+
+        Only the gamedays of the swapped players are rescored.
+        """
+        self.evaluated += 1
+        out_ids = {player['player_id'] for player in outs}
+        players = [player for player in self.roster if player['player_id'] not in out_ids] + list(ins)
+        changed = set().union(*(player['gamedays'] for player in itertools.chain(outs, ins)))
+        return self.points + sum(self._day_points(day, players) - self.day_points.get(day, 0.0)
+                                 for day in changed)
+
+    def _eligible(self, group: str, budget: float, team_counts: Counter) -> np.ndarray:
+        """Mask of a group's candidates affordable alone and allowed by the team limit."""
+        return np.array([p['salary'] <= budget and team_counts[p['team_id']] < MAX_PER_TEAM
+                         for p in self.candidates[group]], dtype=bool).reshape(-1)
+
+    def plan(self, bank: float, free_transfers: int, max_transfers: int = 2,
+             transfer_cost: Optional[float] = None, k: int = 5) -> Dict:
+        """
+        Find the best transfer plans for the gameweek.
+
+        Args:
+            bank: Money in the bank (millions)
+            free_transfers: Transfers available without a points cost
+            max_transfers: Most transfers in one plan (1 or 2)
+            transfer_cost: Points deducted per transfer beyond the free ones;
+                if None, plans never use more than free_transfers
+            k: Number of plans to return
+
+        Returns:
+            Dict with 'current_points' (weekly points without transfers),
+            'plans' (best first; each with 'out' and 'in' player lists, 'points'
+            after costs, 'gain' over current_points, 'cost' and 'bank' left)
+            and 'evaluated' (rosters scored exactly)
+        """
+        limit = max_transfers if transfer_cost is not None else min(max_transfers, free_transfers)
+        limit = min(limit, 2)
+        team_counts = Counter(player['team_id'] for player in self.roster)
+        heap = []
+        counter = itertools.count()
+
+        def threshold():
+            return heap[0][0] if len(heap) >= k else _NEG_INF
+
+        def cost_of(transfers):
+            return max(0, transfers - free_transfers) * (transfer_cost or 0.0)
+
+        def push(points, outs, ins, cost):
+            entry = (points, next(counter), outs, ins, cost)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif points > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+        if limit >= 1:
+            cost = cost_of(1)
+            for out in self.roster:
+                rest = [player for player in self.roster if player is not out]
+                base = self.swap_points((out,), ()) + self._slack(rest) - cost
+                group = out['group']
+                gains = self.add_gains(rest, group)
+                eligible = np.flatnonzero(self._eligible(group, bank + out['salary'] + _EPS,
+                                                         team_counts - Counter([out['team_id']])))
+                for i in eligible[np.argsort(-gains[eligible], kind='stable')]:
+                    if base + gains[i] <= threshold():
+                        break
+                    player = self.candidates[group][i]
+                    push(self.swap_points((out,), (player,)) - cost, (out,), (player,), cost)
+
+        if limit >= 2:
+            # Clamped lineup value is submodular in the players available, so
+            # a pair adds at most the sum of what each adds alone
+            cost = cost_of(2)
+            for out1, out2 in itertools.combinations(self.roster, 2):
+                rest = [player for player in self.roster if player is not out1 and player is not out2]
+                base = self.swap_points((out1, out2), ()) + self._slack(rest) - cost
+                budget = bank + out1['salary'] + out2['salary'] + _EPS
+                counts = team_counts - Counter([out1['team_id'], out2['team_id']])
+                group1, group2 = out1['group'], out2['group']
+                ranked = {}
+                for group in {group1, group2}:
+                    gains = self.add_gains(rest, group)
+                    eligible = np.flatnonzero(self._eligible(group, budget, counts))
+                    order = eligible[np.argsort(-gains[eligible], kind='stable')]
+                    ranked[group] = [(self.candidates[group][i], gains[i]) for i in order]
+                first, second = ranked[group1], ranked[group2]
+                same_group = group1 == group2
+                for a, (in1, gain1) in enumerate(first):
+                    # With both outs in one group, take each unordered pair of ins once
+                    start = a + 1 if same_group else 0
+                    if start >= len(second) or base + gain1 + second[start][1] <= threshold():
+                        break
+                    for in2, gain2 in itertools.islice(second, start, None):
+                        if base + gain1 + gain2 <= threshold():
+                            break
+                        if (in1['salary'] + in2['salary'] > budget or in2['player_id'] == in1['player_id'] or
+                                counts[in2['team_id']] + (in2['team_id'] == in1['team_id']) >= MAX_PER_TEAM):
+                            continue
+                        push(self.swap_points((out1, out2), (in1, in2)) - cost, (out1, out2), (in1, in2), cost)
+
+        plans = []
+        for points, _, outs, ins, cost in sorted(heap, key=lambda entry: (-entry[0], entry[1])):
+            plans.append({
+                'out': list(outs),
+                'in': list(ins),
+                'points': float(points),
+                'gain': float(points - self.points),
+                'cost': cost,
+                'bank': bank + sum(p['salary'] for p in outs) - sum(p['salary'] for p in ins),
+            })
+        return {'current_points': self.points, 'plans': plans, 'evaluated': self.evaluated}
+
+
+def plan_transfers(conn, roster_ids: Sequence[int], gameweek: int, bank: float, free_transfers: int,
+                   max_transfers: int = 2, transfer_cost: Optional[float] = None, k: int = 5,
+                   projection: str = 'last5_avg_fp', profile: Optional[str] = None,
+                   captain_multiplier: Optional[float] = None) -> Dict:
+    """
+    Load a gameweek's players and find the best transfers for a roster.
+
+    Args:
+        conn: Open SQLite connection
+        roster_ids: Player IDs of the current roster
+        gameweek: Gameweek to plan for
+        bank, free_transfers, max_transfers, transfer_cost, k: See TransferPlanner.plan
+        projection: player_fantasy_summary column used as projected points per game
+        profile: Scoring profile key (DEFAULT_PROFILE if omitted)
+        captain_multiplier: See TransferPlanner
+
+    Returns:
+        TransferPlanner.plan result, plus 'roster' (the roster's player dicts)
+        and 'gamedays'
+
+    Raises:
+        ValueError: If a roster player has no salary or is unknown
+    """
+    gamedays, pool = load_player_pool(conn, gameweek, projection, profile)
+    by_id = {player['player_id']: player for player in pool}
+    missing = [player_id for player_id in roster_ids if player_id not in by_id]
+    if missing:
+        raise ValueError(f"Roster players without salary data: {missing}")
+    roster = [by_id[player_id] for player_id in roster_ids]
+
+    planner = TransferPlanner(roster, pool, gamedays, captain_multiplier)
+    result = planner.plan(bank, free_transfers, max_transfers, transfer_cost, k)
+    result['roster'] = roster
+    result['gamedays'] = gamedays
+    return result
@@ -3,14 +3,25 @@
 Fantasy NBA Lineup Optimizer - Web Application
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, make_response
 import sqlite3
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+from collections import OrderedDict
+import functools
+import hashlib
 import itertools
+import threading
 
 import os
 
+from app.roster_optimizer import load_candidates, top_k_rosters, position_group, SALARY_CAP
+from app.database import get_pool, get_data_generation
+from app.gamedays import gameday_label, parse_deadline
+from app.stats_store import get_stats_store
+from app.lineups import best_lineups
+from app.scoring import DEFAULT_PROFILE, PROFILES
+
 # Set template and static folders relative to project root
 template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
 static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static')
@@ -19,9 +30,72 @@ app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
 DB_PATH = os.environ.get('DB_PATH', '/home/velasvalen17/myproject/nba_fantasy.db')
 
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Pooled read-only connection for this worker; close() returns it to the pool."""
+    return get_pool(DB_PATH).connection(row_factory=sqlite3.Row)
+
+def request_profile(params=None):
+    """Scoring profile key for this request ('profile' parameter, else DEFAULT_PROFILE); None if unknown"""
+    key = (request.args if params is None else params).get('profile') or DEFAULT_PROFILE
+    return key if key in PROFILES else None
+
+def unknown_profile_error():
+    """400 response for a request naming an unregistered scoring profile"""
+    return jsonify({'error': f"Unknown scoring profile (known: {', '.join(sorted(PROFILES))})"}), 400
+
+# Read-only endpoint responses, cached per data generation (bumped by daily_update.py)
+API_CACHE_MAX_AGE = int(os.environ.get('API_CACHE_MAX_AGE', '0'))  # seconds browsers may skip revalidating
+API_CACHE_ENTRIES = 512
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def cached_response(vary=None):
+    """
+    Cache a read-only GET endpoint's 200 responses per data generation.
+    
+    Entries are keyed on database, path, query arguments, the data generation
+    and vary() (for output that also depends on e.g. the current date). Every
+    response carries a strong ETag (hash of the body) and Cache-Control, and
+    conditional GETs with a matching If-None-Match get a 304.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            conn = get_db_connection()
+            try:
+                generation = get_data_generation(conn)
+            finally:
+                conn.close()
+            if generation is None:
+                return view(*args, **kwargs)
+            
+            key = (DB_PATH, generation, request.path, tuple(sorted(request.args.items(multi=True))),
+                   vary() if vary else None)
+            with _response_cache_lock:
+                entry = _response_cache.get(key)
+                if entry is not None:
+                    _response_cache.move_to_end(key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                entry = (hashlib.sha256(body).hexdigest()[:32], body, response.mimetype)
+                with _response_cache_lock:
+                    _response_cache[key] = entry
+                    while len(_response_cache) > API_CACHE_ENTRIES:
+                        _response_cache.popitem(last=False)
+            
+            etag, body, mimetype = entry
+            response = app.response_class(body, mimetype=mimetype)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = f"public, max-age={API_CACHE_MAX_AGE}, must-revalidate"
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+def madrid_today():
+    """Current date in Madrid, for responses whose content depends on it"""
+    return datetime.now(ZoneInfo('Europe/Madrid')).date().isoformat()
 
 def get_team_timezone(team_abbr):
     """Get the timezone for a team based on their city"""
@@ -44,45 +118,12 @@ def get_team_timezone(team_abbr):
         # Default to Eastern if unknown
         return ZoneInfo('America/New_York')
 
-def get_fantasy_gamedays():
-    """Return fantasy gameday schedule with deadlines in Madrid timezone"""
-    madrid_tz = ZoneInfo('Europe/Madrid')
-    
-    # Parse gameday deadlines - lineup locks at these times, games before this belong to this gameday
-    gamedays = [
-        # Gameweek 9
-        (9, 1, datetime(2025, 12, 16, 0, 30, tzinfo=madrid_tz)),
-        (9, 2, datetime(2025, 12, 18, 1, 30, tzinfo=madrid_tz)),
-        (9, 3, datetime(2025, 12, 19, 0, 30, tzinfo=madrid_tz)),
-        (9, 4, datetime(2025, 12, 20, 0, 30, tzinfo=madrid_tz)),
-        (9, 5, datetime(2025, 12, 20, 22, 30, tzinfo=madrid_tz)),
-        (9, 6, datetime(2025, 12, 21, 21, 0, tzinfo=madrid_tz)),
-        # Gameweek 10
-        (10, 1, datetime(2025, 12, 23, 0, 30, tzinfo=madrid_tz)),
-        (10, 2, datetime(2025, 12, 24, 0, 30, tzinfo=madrid_tz)),
-        (10, 3, datetime(2025, 12, 25, 17, 30, tzinfo=madrid_tz)),
-        (10, 4, datetime(2025, 12, 27, 0, 30, tzinfo=madrid_tz)),
-        (10, 5, datetime(2025, 12, 27, 22, 30, tzinfo=madrid_tz)),
-        (10, 6, datetime(2025, 12, 28, 21, 0, tzinfo=madrid_tz)),
-        # Gameweek 11
-        (11, 1, datetime(2025, 12, 30, 0, 30, tzinfo=madrid_tz)),
-        (11, 2, datetime(2025, 12, 31, 1, 30, tzinfo=madrid_tz)),
-        (11, 3, datetime(2025, 12, 31, 18, 30, tzinfo=madrid_tz)),
-        (11, 4, datetime(2026, 1, 1, 23, 30, tzinfo=madrid_tz)),
-        (11, 5, datetime(2026, 1, 3, 0, 30, tzinfo=madrid_tz)),
-        (11, 6, datetime(2026, 1, 3, 22, 30, tzinfo=madrid_tz)),
-        (11, 7, datetime(2026, 1, 4, 19, 30, tzinfo=madrid_tz)),
-        # Gameweek 12
-        (12, 1, datetime(2026, 1, 6, 0, 30, tzinfo=madrid_tz)),
-        (12, 2, datetime(2026, 1, 7, 0, 30, tzinfo=madrid_tz)),
-        (12, 3, datetime(2026, 1, 8, 0, 30, tzinfo=madrid_tz)),
-        (12, 4, datetime(2026, 1, 9, 0, 30, tzinfo=madrid_tz)),
-        (12, 5, datetime(2026, 1, 10, 0, 30, tzinfo=madrid_tz)),
-        (12, 6, datetime(2026, 1, 10, 18, 30, tzinfo=madrid_tz)),
-        (12, 7, datetime(2026, 1, 11, 20, 30, tzinfo=madrid_tz)),
-    ]
-    
-    return gamedays
+def get_fantasy_gamedays(conn, gameweek):
+    """Return a gameweek's fantasy gamedays (gameweek, day_num, deadline) with deadlines in Madrid timezone"""
+    rows = conn.execute("""
+        SELECT gameweek, day_num, deadline FROM gameday_deadlines WHERE gameweek = ?
+    """, (gameweek,)).fetchall()
+    return sorted(((row[0], row[1], parse_deadline(row[2])) for row in rows), key=lambda gameday: gameday[2])
 
 @app.route('/')
 def index():
@@ -90,35 +131,26 @@ def index():
     return render_template('index.html')
 
 @app.route('/api/players')
+@cached_response()
 def get_players():
     """Get all players with salaries and recent fantasy averages"""
+    profile = request_profile()
+    if profile is None:
+        return unknown_profile_error()
+    
     conn = get_db_connection()
     cur = conn.cursor()
     
-    # Get players with fantasy averages calculated from all their game stats
     cur.execute("""
-        WITH player_fantasy_stats AS (
-            SELECT 
-                pgs.player_id,
-                COUNT(*) as games_played,
-                AVG(pgs.points + pgs.rebounds + 2 * pgs.assists + 
-                    3 * pgs.blocks + 3 * pgs.steals) as fantasy_avg
-            FROM player_game_stats pgs
-            GROUP BY pgs.player_id
-            HAVING COUNT(*) >= 1
-        )
         SELECT 
             p.player_id,
             p.player_name,
             p.position,
             p.salary,
             p.team_id,
-            t.team_abbreviation as team,
-            COALESCE(pfs.fantasy_avg, 0) as fantasy_avg,
-            COALESCE(pfs.games_played, 0) as games_played
+            t.team_abbreviation as team
         FROM players p
         JOIN teams t ON p.team_id = t.team_id
-        LEFT JOIN player_fantasy_stats pfs ON p.player_id = pfs.player_id
         WHERE p.salary IS NOT NULL
         ORDER BY p.salary DESC
     """)
@@ -126,9 +158,17 @@ def get_players():
     players = [dict(row) for row in cur.fetchall()]
     conn.close()
     
+    # Season fantasy averages come from the in-memory stats store
+    summary = get_stats_store(DB_PATH).current().summary((p['player_id'] for p in players), profile)
+    for player in players:
+        stats = summary.get(player['player_id'])
+        player['fantasy_avg'] = stats['season_avg_fp'] if stats else 0
+        player['games_played'] = stats['games_played'] if stats else 0
+    
     return jsonify(players)
 
 @app.route('/api/gameweeks')
+@cached_response(vary=madrid_today)
 def get_gameweeks():
     """Get all available gameweeks"""
     madrid_tz = ZoneInfo('Europe/Madrid')
@@ -183,6 +223,7 @@ def get_gameweeks():
     return jsonify(gameweeks)
 
 @app.route('/api/team_schedule/<int:gameweek>')
+@cached_response()
 def get_team_schedule(gameweek):
     """Get top teams by number of games in a gameweek"""
     madrid_tz = ZoneInfo('Europe/Madrid')
@@ -195,14 +236,10 @@ def get_team_schedule(gameweek):
     start_date = week_start.strftime('%Y-%m-%d')
     end_date = week_end.strftime('%Y-%m-%d')
     
-    # Get fantasy gameday schedule for this gameweek
-    all_gamedays = get_fantasy_gamedays()
-    gameweek_gamedays = [(gw, day, deadline) for gw, day, deadline in all_gamedays if gw == gameweek]
-    
     conn = get_db_connection()
     cur = conn.cursor()
     
-    # Get teams with game counts and their games (including game_time)
+    # Get teams with game counts and their games, with each game's fantasy gameday
     cur.execute("""
         SELECT 
             t.team_id,
@@ -213,14 +250,15 @@ def get_team_schedule(gameweek):
             GROUP_CONCAT(
                 CASE 
                     WHEN g.home_team_id = t.team_id 
-                    THEN g.game_date || '|' || COALESCE(g.game_time, '00:00') || '|vs|' || away.team_abbreviation
-                    ELSE g.game_date || '|' || COALESCE(g.game_time, '00:00') || '|@|' || home.team_abbreviation
-                END, ':::'
+                    THEN g.game_date || '|vs|' || away.team_abbreviation
+                    ELSE g.game_date || '|@|' || home.team_abbreviation
+                END || '|' || COALESCE(gg.gameweek, '') || '|' || COALESCE(gg.day_num, ''), ':::'
             ) as games_detail
         FROM teams t
         JOIN games g ON (t.team_id = g.home_team_id OR t.team_id = g.away_team_id)
         LEFT JOIN teams home ON g.home_team_id = home.team_id
         LEFT JOIN teams away ON g.away_team_id = away.team_id
+        LEFT JOIN game_gamedays gg ON gg.game_id = g.game_id
         WHERE g.game_date >= ? AND g.game_date <= ?
         GROUP BY t.team_id
         ORDER BY game_days DESC, total_games DESC
@@ -229,52 +267,18 @@ def get_team_schedule(gameweek):
     teams = []
     for row in cur.fetchall():
         team = dict(row)
-        # Parse games detail and assign fantasy gameday
+        # Parse games detail; fantasy gamedays come from the game_gamedays table
         games = []
         if team['games_detail']:
             for game_str in team['games_detail'].split(':::'):
                 parts = game_str.split('|')
-                if len(parts) == 4:
-                    game_date_str = parts[0]
-                    game_time_str = parts[1]
-                    game_type = parts[2]  # 'vs' or '@'
-                    opponent = parts[3]
-                    
-                    # Parse game datetime
-                    try:
-                        game_dt = datetime.strptime(f"{game_date_str} {game_time_str}", '%Y-%m-%d %H:%M')
-                        game_dt = game_dt.replace(tzinfo=madrid_tz)
-                    except:
-                        game_dt = datetime.strptime(game_date_str, '%Y-%m-%d')
-                        game_dt = game_dt.replace(tzinfo=madrid_tz)
-                    
-                    # Find which fantasy gameday this game belongs to
-                    fantasy_gameday_label = None
-                    
-                    for i, (gw, day_num, deadline) in enumerate(gameweek_gamedays):
-                        next_deadline = gameweek_gamedays[i+1][2] if i+1 < len(gameweek_gamedays) else None
-                        
-                        if next_deadline is None:
-                            if game_dt >= deadline:
-                                fantasy_gameday_label = f"GW{gw} Day {day_num}"
-                                break
-                        else:
-                            if game_dt >= deadline and game_dt < next_deadline:
-                                fantasy_gameday_label = f"GW{gw} Day {day_num}"
-                                break
-                    
-                    if not fantasy_gameday_label and gameweek_gamedays:
-                        gw, day_num, _ = gameweek_gamedays[-1]
-                        fantasy_gameday_label = f"GW{gw} Day {day_num}"
-                    
-                    if not fantasy_gameday_label:
-                        fantasy_gameday_label = game_date_str
-                    
+                if len(parts) == 5:
+                    game_date_str, game_type, opponent, gw, day_num = parts  # game_type is 'vs' or '@'
                     games.append({
                         'date': game_date_str,
                         'type': game_type,
                         'opponent': opponent,
-                        'fantasy_gameday': fantasy_gameday_label
+                        'fantasy_gameday': gameday_label(gw, int(day_num) if day_num else None, game_date_str)
                     })
         team['games'] = games
         del team['games_detail']
@@ -288,6 +292,222 @@ def get_team_schedule(gameweek):
         'teams': teams
     })
 
+# Most rosters one /api/game_schedule/batch request may compare
+MAX_BATCH_ROSTERS = 200
+
+def fetch_gameweek_games(cur, gameweek, team_ids):
+    """Games in a gameweek involving any of the given teams, with their precomputed fantasy gameday"""
+    madrid_tz = ZoneInfo('Europe/Madrid')
+    season_start = datetime(2025, 10, 21, tzinfo=madrid_tz)
+    week_start = season_start + timedelta(days=(gameweek - 1) * 7)
+    week_end = week_start + timedelta(days=6)
+    
+    team_placeholders = ','.join('?' * len(team_ids))
+    cur.execute(f"""
+        SELECT 
+            g.game_id,
+            g.game_date,
+            g.game_time,
+            home.team_name as home_team,
+            home.team_abbreviation as home_abbr,
+            away.team_name as away_team,
+            away.team_abbreviation as away_abbr,
+            g.home_team_id,
+            g.away_team_id,
+            gg.gameweek,
+            gg.day_num
+        FROM games g
+        JOIN teams home ON g.home_team_id = home.team_id
+        JOIN teams away ON g.away_team_id = away.team_id
+        LEFT JOIN game_gamedays gg ON gg.game_id = g.game_id
+        WHERE g.game_date >= ? AND g.game_date <= ?
+        AND (g.home_team_id IN ({team_placeholders}) OR g.away_team_id IN ({team_placeholders}))
+        ORDER BY g.game_date, g.game_time
+    """, [week_start.strftime('%Y-%m-%d'), week_end.strftime('%Y-%m-%d')] + team_ids + team_ids)
+    return [dict(row) for row in cur.fetchall()]
+
+def fetch_schedule_players(cur, player_ids):
+    """Name, team and position of the given players, keyed by player_id"""
+    placeholders = ','.join('?' * len(player_ids))
+    cur.execute(f"""
+        SELECT p.player_id, p.player_name, p.team_id, p.position, t.team_abbreviation as team
+        FROM players p
+        JOIN teams t ON p.team_id = t.team_id
+        WHERE p.player_id IN ({placeholders})
+        ORDER BY p.player_id
+    """, player_ids)
+    return {row['player_id']: dict(row) for row in cur.fetchall()}
+
+def project_gameday(deadline, day_games, roster, player_stats):
+    """
+    Build one gameday's entry: the roster's games and projections (starters come from assign_starters).
+    
+    Args:
+        deadline: Gameday deadline (ISO string), or None for games outside the gameweek
+        day_games: (game row, players of the roster in that game) for the gameday
+        roster: player_id -> player_name, team_id, position, team
+        player_stats: player_id -> {'avg_last_5', 'total_fp'}
+    
+    Returns:
+        Gameday dict with deadline, games, projected_fp, player_count and player_projections
+    """
+    day_data = {
+        'deadline': deadline,
+        'games': [{
+            'game_id': game['game_id'],
+            'matchup': f"{game['home_abbr']} vs {game['away_abbr']}",
+            'time': game['game_time'],
+            'players': game_players
+        } for game, game_players in day_games]
+    }
+    
+    # Get unique player IDs playing on this day
+    players_on_day = set()
+    for game in day_data['games']:
+        for player in game['players']:
+            players_on_day.add(player['player_id'])
+    
+    # Calculate projected FP for players on this day
+    day_data['projected_fp'] = 0
+    day_data['player_count'] = len(players_on_day)
+    day_data['player_projections'] = []
+    
+    if players_on_day:
+        # Calculate total projected FP and store individual projections with position info
+        for player_id in players_on_day:
+            stats = player_stats.get(player_id, {'avg_last_5': 0, 'total_fp': 0})
+            avg_fp = stats['avg_last_5']
+            total_fp = stats['total_fp']
+            day_data['projected_fp'] += avg_fp
+            
+            # Get position from the roster
+            player_position = roster[player_id].get('position', '')
+            
+            projection = {
+                'player_id': player_id,
+                'player_name': roster[player_id]['player_name'],
+                'team': roster[player_id]['team'],
+                'position': player_position,
+                'projected_fp': round(avg_fp, 1),
+                'avg_last_5': round(avg_fp, 1),
+                'total_fp': round(total_fp, 1),
+                'is_starter': False
+            }
+            day_data['player_projections'].append(projection)
+        
+        day_data['projected_fp'] = round(day_data['projected_fp'], 1)
+    
+    return day_data
+
+def build_games_by_day(player_ids, players_dict, games, gameweek_gamedays, player_stats, memo=None):
+    """
+    Lay out one roster's gameweek by fantasy gameday, with projected points and starters.
+    
+    The lookups may cover more players and games than the roster (e.g. every
+    roster of a batch request); only the roster's own are used. A gameday's
+    entry depends only on which roster players play that day, so rosters that
+    share a memo reuse each other's gameday entries instead of rebuilding them.
+    
+    Args:
+        player_ids: The roster's player IDs
+        players_dict: player_id -> player_name, team_id, position, team
+        games: Gameweek games from fetch_gameweek_games
+        gameweek_gamedays: (gameweek, day_num, deadline) of the gameweek's gamedays
+        player_stats: player_id -> {'avg_last_5', 'total_fp'}
+        memo: Optional dict of gameday entries shared by the rosters of one request
+    
+    Returns:
+        games_by_day dict as returned by /api/game_schedule (empty if no player is known)
+    """
+    roster = {player_id: players_dict[player_id] for player_id in sorted(set(player_ids))
+              if player_id in players_dict}
+    roster_teams = {player['team_id'] for player in roster.values()}
+    if not roster_teams:
+        return {}
+    
+    # Initialize all gamedays for this gameweek (even if no games)
+    deadlines = {}
+    day_games = {}
+    for gw, day_num, deadline in gameweek_gamedays:
+        label = f"GW{gw} Day {day_num}"
+        deadlines[label] = deadline.isoformat()
+        day_games[label] = []
+    
+    # Organize games by fantasy gameday (precomputed in game_gamedays:
+    # a game belongs to the gameday whose deadline it comes after)
+    for game in games:
+        if game['home_team_id'] not in roster_teams and game['away_team_id'] not in roster_teams:
+            continue
+        fantasy_gameday_label = gameday_label(game['gameweek'], game['day_num'], game['game_date'])
+        
+        # Create the gameday entry if it doesn't exist (for games outside gameweek)
+        if fantasy_gameday_label not in day_games:
+            deadlines[fantasy_gameday_label] = None
+            day_games[fantasy_gameday_label] = []
+        
+        # Find which players are in this game
+        game_players = []
+        for player_id, player_info in roster.items():
+            if player_info['team_id'] in [game['home_team_id'], game['away_team_id']]:
+                game_players.append({
+                    'player_id': player_id,
+                    'player_name': player_info['player_name'],
+                    'team': player_info['team']
+                })
+        day_games[fantasy_gameday_label].append((game, game_players))
+    
+    # Calculate projected fantasy points per day using last 5 games average
+    games_by_day = {}
+    new_days = []
+    for day_label, day in day_games.items():
+        key = (day_label, frozenset(player['player_id'] for _, game_players in day for player in game_players))
+        if memo is not None and key in memo:
+            games_by_day[day_label] = memo[key]
+            continue
+        games_by_day[day_label] = project_gameday(deadlines[day_label], day, roster, player_stats)
+        new_days.append(games_by_day[day_label])
+        if memo is not None:
+            memo[key] = games_by_day[day_label]
+    
+    assign_starters(new_days, roster)
+    return games_by_day
+
+def assign_starters(days, roster):
+    """
+    Pick the optimal starting five of gameday entries, solving all of them in one pass.
+    
+    Sets lineup_fp (the starting lineup's projected points) on every day; crowns
+    (is_starter) only go out on days with 5+ players, when there is a choice to make.
+    
+    Args:
+        days: Gameday dicts from project_gameday
+        roster: player_id -> player_name, team_id, position, team
+    """
+    if not days:
+        return
+    projections = [{projection['player_id']: projection for projection in day_data['player_projections']}
+                   for day_data in days]
+    players = [{'player_id': player_id, 'position': player.get('position')} for player_id, player in roster.items()]
+    lineups = best_lineups(
+        players, projections,
+        projection=lambda player, d: projections[d][player['player_id']]['avg_last_5'],
+        tiebreak=lambda player, d: projections[d][player['player_id']]['total_fp'])
+    
+    for day_data, day_projections, lineup in zip(days, projections, lineups):
+        day_data['lineup_fp'] = round(lineup['points'], 1)
+        if day_data['player_count'] >= 5:
+            for player in lineup['starters']:
+                day_projections[player['player_id']]['is_starter'] = True
+        
+        # Sort all projections for display (starters first, then by FP)
+        day_data['player_projections'].sort(key=lambda x: (not x['is_starter'], -x['avg_last_5'], -x['total_fp']))
+
+def schedule_player_stats(player_ids, profile):
+    """Last-5 average and season total of each player, from the in-memory stats store"""
+    stats_columns = get_stats_store(DB_PATH).current()
+    return {player_id: {'avg_last_5': row['last5_avg_fp'], 'total_fp': row['season_total_fp']}
+            for player_id, row in stats_columns.summary(player_ids, profile).items()}
+
 @app.route('/api/game_schedule', methods=['POST'])
 def get_game_schedule():
     """Get game schedule for selected players in a gameweek"""
@@ -300,6 +520,9 @@ def get_game_schedule():
             return jsonify({'error': 'No data received', 'games_by_day': {}}), 400
         
         player_ids = data.get('player_ids', [])
+        profile = request_profile(data)
+        if profile is None:
+            return unknown_profile_error()
         gameweek = data.get('gameweek', 9)
         if gameweek is None:
             gameweek = 9
@@ -308,282 +531,26 @@ def get_game_schedule():
         
         if not player_ids:
             return jsonify({'games_by_day': {}})
-        
-        # Calculate date range for gameweek
-        madrid_tz = ZoneInfo('Europe/Madrid')
-        season_start = datetime(2025, 10, 21, tzinfo=madrid_tz)
-        week_start = season_start + timedelta(days=(gameweek - 1) * 7)
-        week_end = week_start + timedelta(days=6)
+        player_ids = [int(player_id) for player_id in player_ids]
         
         conn = get_db_connection()
         cur = conn.cursor()
         
-        # Get teams for the selected players
-        placeholders = ','.join('?' * len(player_ids))
-        cur.execute(f"""
-            SELECT DISTINCT team_id 
-            FROM players 
-            WHERE player_id IN ({placeholders})
-        """, player_ids)
-        
-        team_ids = [row['team_id'] for row in cur.fetchall()]
+        # Get player info including team and position
+        players_dict = fetch_schedule_players(cur, player_ids)
+        team_ids = sorted({player['team_id'] for player in players_dict.values()})
         
         if not team_ids:
             conn.close()
             return jsonify({'games_by_day': {}})
         
-        # Get all games for these teams in the gameweek
-        team_placeholders = ','.join('?' * len(team_ids))
-        cur.execute(f"""
-            SELECT 
-                g.game_id,
-                g.game_date,
-                g.game_time,
-                home.team_name as home_team,
-                home.team_abbreviation as home_abbr,
-                away.team_name as away_team,
-                away.team_abbreviation as away_abbr,
-                g.home_team_id,
-                g.away_team_id
-            FROM games g
-            JOIN teams home ON g.home_team_id = home.team_id
-            JOIN teams away ON g.away_team_id = away.team_id
-            WHERE g.game_date >= ? AND g.game_date <= ?
-            AND (g.home_team_id IN ({team_placeholders}) OR g.away_team_id IN ({team_placeholders}))
-            ORDER BY g.game_date, g.game_time
-        """, [week_start.strftime('%Y-%m-%d'), week_end.strftime('%Y-%m-%d')] + team_ids + team_ids)
-        
-        games = cur.fetchall()
-        
-        # Get player info including position
-        cur.execute(f"""
-            SELECT p.player_id, p.player_name, p.team_id, p.position, t.team_abbreviation as team
-            FROM players p
-            JOIN teams t ON p.team_id = t.team_id
-            WHERE p.player_id IN ({placeholders})
-        """, player_ids)
-        
-        players_dict = {row['player_id']: dict(row) for row in cur.fetchall()}
-        
-        # Get fantasy gameday schedule for this gameweek
-        all_gamedays = get_fantasy_gamedays()
-        gameweek_gamedays = [(gw, day, deadline) for gw, day, deadline in all_gamedays if gw == gameweek]
-        
-        # Initialize all gamedays for this gameweek (even if no games)
-        games_by_day = {}
-        for gw, day_num, deadline in gameweek_gamedays:
-            label = f"GW{gw} Day {day_num}"
-            games_by_day[label] = {
-                'deadline': deadline.isoformat(),
-                'games': []
-            }
-        
-        # Organize games by fantasy gameday
-        madrid_tz = ZoneInfo('Europe/Madrid')
-        
-        for game in games:
-            # Parse game datetime from database (now stored in Madrid timezone after ICS import)
-            game_date_str = game['game_date']
-            game_time_str = game['game_time'] or '00:00'
-            
-            # Parse datetime and make it timezone-aware in Madrid timezone
-            try:
-                game_dt = datetime.strptime(f"{game_date_str} {game_time_str}", '%Y-%m-%d %H:%M')
-                game_dt = game_dt.replace(tzinfo=madrid_tz)
-            except:
-                game_dt = datetime.strptime(game_date_str, '%Y-%m-%d')
-                game_dt = game_dt.replace(tzinfo=madrid_tz)
-            
-            # Find which fantasy gameday this game belongs to
-            # Rule: Deadline is ~30 min before first game. Games tip off AFTER deadline.
-            # A game belongs to the gameday whose deadline it comes after.
-            fantasy_gameday_label = None
-            
-            for i, (gw, day_num, deadline) in enumerate(gameweek_gamedays):
-                next_deadline = gameweek_gamedays[i+1][2] if i+1 < len(gameweek_gamedays) else None
-                
-                # Games belong to this gameday if they occur between this deadline and next deadline
-                if next_deadline is None:
-                    # Last gameday: all games after this deadline
-                    if game_dt >= deadline:
-                        fantasy_gameday_label = f"GW{gw} Day {day_num}"
-                        break
-                else:
-                    # Games from this deadline (inclusive) up to next deadline (exclusive)
-                    if game_dt >= deadline and game_dt < next_deadline:
-                        fantasy_gameday_label = f"GW{gw} Day {day_num}"
-                        break
-            
-            # If no matching gameday found, assign to the last gameday in the list
-            if not fantasy_gameday_label and gameweek_gamedays:
-                gw, day_num, _ = gameweek_gamedays[-1]
-                fantasy_gameday_label = f"GW{gw} Day {day_num}"
-            
-            # Fallback to date if still no match
-            if not fantasy_gameday_label:
-                fantasy_gameday_label = game_date_str
-            
-            # Create the gameday entry if it doesn't exist (for games outside gameweek)
-            if fantasy_gameday_label not in games_by_day:
-                games_by_day[fantasy_gameday_label] = {
-                    'deadline': None,
-                    'games': []
-                }
-            
-            # Find which players are in this game
-            game_players = []
-            for player_id, player_info in players_dict.items():
-                if player_info['team_id'] in [game['home_team_id'], game['away_team_id']]:
-                    game_players.append({
-                        'player_id': player_id,
-                        'player_name': player_info['player_name'],
-                        'team': player_info['team']
-                    })
-            
-            if game_players:  # Only include games where our players are playing
-                games_by_day[fantasy_gameday_label]['games'].append({
-                    'game_id': game['game_id'],
-                    'matchup': f"{game['home_abbr']} vs {game['away_abbr']}",
-                    'time': game['game_time'],
-                    'players': game_players
-                })
-        
-        # Calculate projected fantasy points per day using last 7 games average
-        for day_label, day_data in games_by_day.items():
-            # Get unique player IDs playing on this day
-            players_on_day = set()
-            for game in day_data['games']:
-                for player in game['players']:
-                    players_on_day.add(player['player_id'])
-            
-            # Calculate projected FP for players on this day
-            day_data['projected_fp'] = 0
-            day_data['player_count'] = len(players_on_day)
-            day_data['player_projections'] = []
-            
-            if players_on_day:
-                # Get recent stats and total stats for these players
-                player_ids_str = ','.join([str(pid) for pid in players_on_day])
-                player_stats_query = f"""
-                    WITH recent_stats AS (
-                        SELECT 
-                            player_id,
-                            fantasy_points,
-                            ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC) as rn
-                        FROM player_game_stats
-                        WHERE player_id IN ({player_ids_str})
-                    ),
-                    recent_avg AS (
-                        SELECT 
-                            player_id,
-                            AVG(fantasy_points) as avg_last_5
-                        FROM recent_stats
-                        WHERE rn <= 5
-                        GROUP BY player_id
-                    ),
-                    total_stats AS (
-                        SELECT
-                            player_id,
-                            SUM(fantasy_points) as total_fp
-                        FROM player_game_stats
-                        WHERE player_id IN ({player_ids_str})
-                        GROUP BY player_id
-                    )
-                    SELECT 
-                        r.player_id,
-                        COALESCE(r.avg_last_5, 0) as avg_last_5,
-                        COALESCE(t.total_fp, 0) as total_fp
-                    FROM recent_avg r
-                    LEFT JOIN total_stats t ON r.player_id = t.player_id
-                """
-                
-                player_stats = {}
-                for row in conn.execute(player_stats_query).fetchall():
-                    player_stats[row['player_id']] = {
-                        'avg_last_5': row['avg_last_5'],
-                        'total_fp': row['total_fp']
-                    }
-                
-                # Calculate total projected FP and store individual projections with position info
-                backcourt_players = []
-                frontcourt_players = []
-                
-                for player_id in players_on_day:
-                    stats = player_stats.get(player_id, {'avg_last_5': 0, 'total_fp': 0})
-                    avg_fp = stats['avg_last_5']
-                    total_fp = stats['total_fp']
-                    day_data['projected_fp'] += avg_fp
-                    
-                    # Get player name and position from players_dict
-                    if player_id in players_dict:
-                        # Get position from players_dict
-                        player_position = players_dict[player_id].get('position', '')
-                        
-                        projection = {
-                            'player_id': player_id,
-                            'player_name': players_dict[player_id]['player_name'],
-                            'team': players_dict[player_id]['team'],
-                            'position': player_position,
-                            'projected_fp': round(avg_fp, 1),
-                            'avg_last_5': round(avg_fp, 1),
-                            'total_fp': round(total_fp, 1),
-                            'is_starter': False
-                        }
-                        
-                        # Categorize by position (G = Backcourt, F/C = Frontcourt)
-                        if player_position and 'G' in player_position:
-                            backcourt_players.append(projection)
-                        else:
-                            frontcourt_players.append(projection)
-                        
-                        day_data['player_projections'].append(projection)
-                
-                # Sort each position group by avg_last_5, then total_fp
-                backcourt_players.sort(key=lambda x: (x['avg_last_5'], x['total_fp']), reverse=True)
-                frontcourt_players.sort(key=lambda x: (x['avg_last_5'], x['total_fp']), reverse=True)
-                
-                # Only assign crowns if we have 5+ players total (otherwise there's no choice)
-                total_players = len(backcourt_players) + len(frontcourt_players)
-                
-                if total_players >= 5:
-                    # Select starters respecting position constraints (2-3 BC, 2-3 FC, total 5)
-                    # Try 3 BC + 2 FC vs 2 BC + 3 FC and pick the combination with higher total FP
-                    starters = []
-                    
-                    # Option 1: 3 BC + 2 FC (if we have enough players)
-                    if len(backcourt_players) >= 3 and len(frontcourt_players) >= 2:
-                        option1_bc = backcourt_players[:3]
-                        option1_fc = frontcourt_players[:2]
-                        option1_total = sum(p['avg_last_5'] for p in option1_bc) + sum(p['avg_last_5'] for p in option1_fc)
-                    else:
-                        option1_total = -1
-                    
-                    # Option 2: 2 BC + 3 FC (if we have enough players)
-                    if len(backcourt_players) >= 2 and len(frontcourt_players) >= 3:
-                        option2_bc = backcourt_players[:2]
-                        option2_fc = frontcourt_players[:3]
-                        option2_total = sum(p['avg_last_5'] for p in option2_bc) + sum(p['avg_last_5'] for p in option2_fc)
-                    else:
-                        option2_total = -1
-                    
-                    # Choose the valid option with higher total FP
-                    if option1_total >= 0 and option1_total >= option2_total:
-                        starters = backcourt_players[:3] + frontcourt_players[:2]
-                    elif option2_total >= 0:
-                        starters = backcourt_players[:2] + frontcourt_players[:3]
-                    # else: Not enough players in proper positions, no starters assigned
-                    
-                    # Mark selected players as starters
-                    starter_ids = {p['player_id'] for p in starters}
-                    for proj in day_data['player_projections']:
-                        proj['is_starter'] = proj['player_id'] in starter_ids
-                
-                # Sort all projections for display (starters first, then by FP)
-                day_data['player_projections'].sort(key=lambda x: (not x['is_starter'], -x['avg_last_5'], -x['total_fp']))
-                
-                day_data['projected_fp'] = round(day_data['projected_fp'], 1)
-        
+        # Get all games for these teams in the gameweek, and the gameweek's gamedays
+        games = fetch_gameweek_games(cur, gameweek, team_ids)
+        gameweek_gamedays = get_fantasy_gamedays(conn, gameweek)
         conn.close()
+        
+        player_stats = schedule_player_stats(player_ids, profile)
+        games_by_day = build_games_by_day(player_ids, players_dict, games, gameweek_gamedays, player_stats)
         return jsonify({'games_by_day': games_by_day})
     
     except Exception as e:
@@ -592,9 +559,75 @@ def get_game_schedule():
         traceback.print_exc()
         return jsonify({'error': str(e), 'games_by_day': {}}), 500
 
+@app.route('/api/game_schedule/batch', methods=['POST'])
+def get_game_schedule_batch():
+    """
+    Get game schedules for many candidate rosters in one gameweek (e.g. to compare trades).
+    
+    Body: {"gameweek": 9, "rosters": [[player ids], ...] or {"name": [player ids], ...},
+    "profile": optional scoring profile}. Players, games, gamedays and stats are
+    fetched once for all rosters together; each roster's games_by_day is then
+    built from those in memory. Rosters come back in the same list or dict shape.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data or not isinstance(data.get('rosters'), (list, dict)):
+            return jsonify({'error': "Expected a JSON body with a 'rosters' list or object"}), 400
+        
+        rosters = data['rosters']
+        named = isinstance(rosters, dict)
+        items = list(rosters.items()) if named else list(enumerate(rosters))
+        if len(items) > MAX_BATCH_ROSTERS:
+            return jsonify({'error': f'At most {MAX_BATCH_ROSTERS} rosters per request'}), 400
+        profile = request_profile(data)
+        if profile is None:
+            return unknown_profile_error()
+        gameweek = int(data.get('gameweek') or 9)
+        items = [(key, [int(player_id) for player_id in player_ids]) for key, player_ids in items]
+        
+        # One lookup of every player, game and stat line the rosters need
+        all_ids = sorted({player_id for _, player_ids in items for player_id in player_ids})
+        players_dict, games, gameweek_gamedays, player_stats = {}, [], [], {}
+        if all_ids:
+            conn = get_db_connection()
+            cur = conn.cursor()
+            players_dict = fetch_schedule_players(cur, all_ids)
+            team_ids = sorted({player['team_id'] for player in players_dict.values()})
+            if team_ids:
+                games = fetch_gameweek_games(cur, gameweek, team_ids)
+                gameweek_gamedays = get_fantasy_gamedays(conn, gameweek)
+            conn.close()
+            player_stats = schedule_player_stats(all_ids, profile)
+        
+        # Candidate rosters mostly share players, so most of their gamedays repeat
+        memo = {}
+        schedules = [(key, {'games_by_day': build_games_by_day(player_ids, players_dict, games,
+                                                               gameweek_gamedays, player_stats, memo)})
+                     for key, player_ids in items]
+        
+        return jsonify({
+            'gameweek': gameweek,
+            'profile': profile,
+            'count': len(schedules),
+            'rosters': dict(schedules) if named else [schedule for _, schedule in schedules]
+        })
+    
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid parameter: {e}'}), 400
+    except Exception as e:
+        print(f"Error in get_game_schedule_batch: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/team_players/<int:team_id>', methods=['GET'])
+@cached_response()
 def get_team_players(team_id):
     """Get all players from a specific team with their fantasy stats"""
+    profile = request_profile()
+    if profile is None:
+        return unknown_profile_error()
+    
     try:
         conn = get_db_connection()
         cur = conn.cursor()
@@ -613,53 +646,30 @@ def get_team_players(team_id):
         
         team_info = dict(team_row)
         
-        # Get players with fantasy averages from last 30 games (or all games if less)
         cur.execute("""
-            WITH player_recent_games AS (
-                SELECT 
-                    pgs.player_id,
-                    pgs.points,
-                    pgs.rebounds,
-                    pgs.assists,
-                    pgs.blocks,
-                    pgs.steals,
-                    pgs.minutes_played,
-                    pgs.game_date,
-                    ROW_NUMBER() OVER (PARTITION BY pgs.player_id ORDER BY pgs.game_date DESC) as rn
-                FROM player_game_stats pgs
-            ),
-            player_stats AS (
-                SELECT 
-                    player_id,
-                    COUNT(*) as games_played,
-                    AVG(points + rebounds + 2 * assists + 3 * blocks + 3 * steals) as fantasy_avg,
-                    AVG(minutes_played) as avg_minutes
-                FROM player_recent_games
-                WHERE rn <= 30
-                GROUP BY player_id
-            )
             SELECT 
                 p.player_id,
                 p.player_name,
                 p.position,
-                p.salary,
-                COALESCE(ps.fantasy_avg, 0) as fantasy_avg,
-                COALESCE(ps.avg_minutes, 0) as avg_minutes,
-                COALESCE(ps.games_played, 0) as games_played
+                p.salary
             FROM players p
-            LEFT JOIN player_stats ps ON p.player_id = ps.player_id
             WHERE p.team_id = ?
-            ORDER BY 
-                CASE 
-                    WHEN p.position LIKE '%G%' THEN 0 
-                    ELSE 1 
-                END,
-                ps.fantasy_avg DESC NULLS LAST
         """, (team_id,))
         
         players = [dict(row) for row in cur.fetchall()]
         conn.close()
         
+        # Fantasy averages from the last 30 games (or all games if less)
+        summary = get_stats_store(DB_PATH).current().summary((p['player_id'] for p in players), profile)
+        for player in players:
+            stats = summary.get(player['player_id'])
+            player['fantasy_avg'] = stats['last30_avg_fp'] if stats else 0
+            player['avg_minutes'] = (stats['last30_avg_minutes'] or 0) if stats else 0
+            player['games_played'] = min(stats['games_played'], 30) if stats else 0
+        # Guards first, then by last-30 average; players without games last
+        players.sort(key=lambda p: (0 if 'G' in (p['position'] or '') else 1,
+                                    p['player_id'] not in summary, -p['fantasy_avg']))
+        
         # Separate into BC and FC
         backcourt = [p for p in players if 'G' in p['position']]
         frontcourt = [p for p in players if 'G' not in p['position']]
@@ -678,5 +688,78 @@ def get_team_players(team_id):
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/optimize', methods=['GET', 'POST'])
+def optimize_rosters():
+    """Get the K best distinct rosters under the salary cap"""
+    try:
+        params = request.get_json(silent=True) or request.args
+        k = min(max(int(params.get('k', 10)), 1), 100)
+        min_distance = max(int(params.get('min_distance', 0)), 0)
+        max_salary = float(params.get('max_salary', SALARY_CAP))
+        performance_weight = float(params.get('performance_weight', 0.7))
+        if not 0 <= performance_weight <= 1:
+            return jsonify({'error': 'performance_weight must be between 0 and 1'}), 400
+        profile = request_profile(params)
+        if profile is None:
+            return unknown_profile_error()
+        
+        conn = get_db_connection()
+        
+        # Default stats window: the last 7 days of game data
+        end_date = params.get('end_date')
+        if not end_date:
+            row = conn.execute("SELECT MAX(game_date) as max_date FROM player_game_stats").fetchone()
+            end_date = row['max_date']
+        if not end_date:
+            conn.close()
+            return jsonify({'rosters': [], 'count': 0})
+        start_date = params.get('start_date') or (
+            datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=6)).strftime('%Y-%m-%d')
+        
+        candidates = load_candidates(conn, start_date, end_date, performance_weight, profile=profile)
+        conn.close()
+        
+        rosters = []
+        for roster in top_k_rosters(candidates, k, min_distance, max_salary):
+            rosters.append({
+                'rank': roster['rank'],
+                'score': round(roster['score'], 2),
+                'fantasy_avg': round(roster['fantasy_avg'], 1),
+                'salary': round(roster['salary'], 1),
+                'players': [{
+                    'player_id': p['player_id'],
+                    'player_name': p['player_name'],
+                    'position': p['position'],
+                    'group': position_group(p['position']),
+                    'team_id': p['team_id'],
+                    'team': p['team_name'],
+                    'salary': p['salary'],
+                    'fantasy_avg': p['fantasy_avg'],
+                } for p in roster['players']]
+            })
+        
+        return jsonify({
+            'start_date': start_date,
+            'end_date': end_date,
+            'k': k,
+            'min_distance': min_distance,
+            'profile': profile,
+            'count': len(rosters),
+            'rosters': rosters
+        })
+    
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid parameter: {e}'}), 400
+    except Exception as e:
+        print(f"Error in optimize_rosters: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pool_stats')
+def pool_stats():
+    """Connection pool hit/miss counters for this worker process"""
+    return jsonify(get_pool(DB_PATH).stats())
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
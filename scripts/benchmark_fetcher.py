@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark game-log fetching against a local stub of stats.nba.com.
+
+Compares the old sequential loop (one request at a time with the fixed 0.25s +
+0.5s pauses) with the fetch stage of the ingest pipeline
+(DatabasePopulator._run_stat_pipeline), which runs FETCH_WORKERS fetches at
+once behind the shared token-bucket limiter. Parsing is left out so only
+fetching is measured; the pipeline writes its checkpoints to a temporary
+database. With enough workers the measured request rate should sit at the
+configured --rate. Both go through the shared keep-alive session, so the TCP
+connections opened stay near the worker count.
+
+Usage:
+    python3 scripts/benchmark_fetcher.py [--players 40] [--latency 0.15]
+                                         [--rate 10] [--burst 5] [--workers 8]
+"""
+
+import asyncio
+import io
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from app import database
+from nba_data_fetcher import NBADataFetcher
+from stub_nba_server import StubNBAServer
+from populate_database import DatabasePopulator
+
+
+def arg(args, name, default, cast=float):
+    return cast(args[args.index(name) + 1]) if name in args else default
+
+
+def run_pipeline(player_ids, db_path):
+    """Fetch every player's game log through the ingest pipeline; returns the rows fetched."""
+    database.DB_PATH = db_path
+    rows = []
+
+    def fetch(player_id):
+        return NBADataFetcher.get_player_game_log(player_id)
+
+    def parse(player_id, game_log):
+        rows.append(len(game_log))
+        return []
+
+    with redirect_stdout(io.StringIO()):
+        database.init_database()
+        conn = database.get_connection()
+        job, _ = DatabasePopulator._start_job(conn, 'benchmark', '', '', [str(i) for i in player_ids])
+        conn.close()
+        asyncio.run(DatabasePopulator._run_stat_pipeline(player_ids, fetch, parse, job, 'player'))
+    return sum(rows)
+
+
+def main():
+    args = sys.argv[1:]
+    num_players = arg(args, '--players', 40, int)
+    latency = arg(args, '--latency', 0.15)
+    rate = arg(args, '--rate', 10.0)
+    burst = arg(args, '--burst', 5, int)
+    workers = arg(args, '--workers', 8, int)
+    player_ids = list(range(1, num_players + 1))
+
+    print("🏀 Game-log fetch benchmark (local stub server)")
+    print(f"  {num_players} players, {latency * 1000:.0f} ms server latency, "
+          f"limit {rate:g} req/s (burst {burst}), {workers} workers")
+
+    # Measure the network path; the response cache would answer the second pass
+    NBADataFetcher.configure_cache(None)
+    with StubNBAServer(latency=latency) as stub:
+        # Old path: sequential, fixed pauses, no limiter
+        NBADataFetcher.configure_rate_limit(0)
+        connections_before = stub.connections
+        start = time.perf_counter()
+        legacy_rows = 0
+        for player_id in player_ids:
+            legacy_rows += len(NBADataFetcher.get_player_game_log(player_id) or [])
+            time.sleep(0.25 + 0.5)
+        legacy_time = time.perf_counter() - start
+        legacy_connections = stub.connections - connections_before
+
+        # New path: the ingest pipeline's fetch workers behind the shared token bucket
+        NBADataFetcher.configure_rate_limit(rate, burst)
+        NBADataFetcher.FETCH_WORKERS = workers
+        requests_before = stub.requests
+        connections_before = stub.connections
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            rows = run_pipeline(player_ids, Path(tmp) / "benchmark.db")
+            pooled_time = time.perf_counter() - start
+        pooled_requests = stub.requests - requests_before
+        pooled_connections = stub.connections - connections_before
+
+    # The first `burst` requests are free; the rest arrive at `rate`
+    floor = max(0, num_players - burst) / rate if rate > 0 else 0
+
+    print(f"\n  {'Mode':<24} {'Time (s)':>9} {'Req/s':>8} {'Rows':>7} {'Conns':>6}")
+    print(f"  {'sequential + sleeps':<24} {legacy_time:>9.2f} {num_players / legacy_time:>8.2f} "
+          f"{legacy_rows:>7} {legacy_connections:>6}")
+    print(f"  {'pipeline + token bucket':<24} {pooled_time:>9.2f} {pooled_requests / pooled_time:>8.2f} "
+          f"{rows:>7} {pooled_connections:>6}")
+    print(f"\n  Rate-limit floor for {num_players} requests: {floor:.2f}s "
+          f"(pipeline run took {pooled_time - floor:+.2f}s over it)")
+    print(f"  Speedup: {legacy_time / pooled_time:.1f}x")
+    if rows != legacy_rows:
+        print("❌ Row counts differ between modes")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-player vs league-wide bulk stat ingestion against a local stub server.
+
+Both modes load the same date range into fresh temporary databases:
+
+  * per-player: populate_player_stats, one playergamelog request per player
+  * bulk:       populate_player_stats_bulk, one leaguegamelog request per date
+
+Both run with the HTTP response cache off. The bulk load is then repeated with
+the cache on, once cold and once warm, to show what a re-run backfill costs.
+
+The stub serves a synthetic season by default, or responses recorded with
+StubNBAServer(record_dir=...) when --replay DIR is given.
+
+Usage:
+    python3 scripts/benchmark_ingest.py [--days 2] [--season-days 30] [--latency 0.05]
+                                        [--rate 50] [--burst 10] [--replay DIR]
+"""
+
+import io
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+
+from app import database
+from nba_data_fetcher import NBADataFetcher
+from stub_nba_server import StubNBAServer, SyntheticSeason, replay_responder
+import populate_database
+from populate_database import DatabasePopulator
+
+
+def arg(args, name, default, cast=float):
+    return cast(args[args.index(name) + 1]) if name in args else default
+
+
+def fresh_database(path):
+    database.DB_PATH = path
+    populate_database.DB_PATH = path
+    with redirect_stdout(io.StringIO()):
+        database.init_database()
+        DatabasePopulator.create_gameweeks()
+
+
+def stored_rows(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("""
+        SELECT player_id, game_id, game_date, fantasy_points, minutes_played
+        FROM player_game_stats ORDER BY player_id, game_id
+    """).fetchall()
+    conn.close()
+    return rows
+
+
+def run(label, stub, fn):
+    before = stub.requests
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - start
+    return label, elapsed, stub.requests - before
+
+
+def main():
+    args = sys.argv[1:]
+    days = arg(args, '--days', 2, int)
+    season_days = arg(args, '--season-days', 30, int)
+    latency = arg(args, '--latency', 0.05)
+    rate = arg(args, '--rate', 50.0)
+    burst = arg(args, '--burst', 10, int)
+    replay = arg(args, '--replay', None, str)
+
+    season = SyntheticSeason(num_days=season_days)
+    responder = replay_responder(replay) if replay else season.respond
+    to_date = date(2025, 10, 21) + timedelta(days=season_days - 1)
+    from_date = to_date - timedelta(days=days - 1)
+    NBADataFetcher.configure_rate_limit(rate, burst)
+    NBADataFetcher.configure_cache(None)
+
+    print("🏀 Stat ingestion benchmark: per-player game logs vs league-wide bulk")
+    print(f"  {len(season.player_ids)} players, {from_date} to {to_date}, "
+          f"{latency * 1000:.0f} ms latency, limit {rate:g} req/s")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, StubNBAServer(responder, latency=latency) as stub:
+        per_player_db = Path(tmp) / "per_player.db"
+        fresh_database(per_player_db)
+        results.append(run("per-player", stub, lambda: DatabasePopulator.populate_player_stats(
+            from_date=from_date, to_date=to_date, players_list=season.player_ids)))
+        per_player_rows = stored_rows(per_player_db)
+
+        bulk_db = Path(tmp) / "bulk.db"
+        fresh_database(bulk_db)
+        results.append(run("bulk", stub, lambda: DatabasePopulator.populate_player_stats_bulk(
+            from_date=from_date, to_date=to_date)))
+        bulk_rows = stored_rows(bulk_db)
+
+        NBADataFetcher.configure_cache(Path(tmp) / "http_cache.db")
+        cached_rows = []
+        for label in ("bulk, cold", "bulk, warm"):
+            cached_db = Path(tmp) / f"{label.replace(', ', '_')}.db"
+            fresh_database(cached_db)
+            results.append(run(label, stub, lambda: DatabasePopulator.populate_player_stats_bulk(
+                from_date=from_date, to_date=to_date)))
+            cached_rows.append(stored_rows(cached_db))
+        cache_report = NBADataFetcher.cache_report()
+        NBADataFetcher.configure_cache(None)
+
+    print(f"\n  {'Mode':<12} {'Requests':>9} {'Time (s)':>9} {'Rows':>7}")
+    for (label, elapsed, requests_made), rows in zip(results, [per_player_rows, bulk_rows] + cached_rows):
+        print(f"  {label:<12} {requests_made:>9} {elapsed:>9.2f} {len(rows):>7}")
+    print(f"\n  Speedup: {results[0][1] / results[1][1]:.1f}x, "
+          f"{results[0][2] / max(results[1][2], 1):.0f}x fewer requests")
+    for line in cache_report:
+        print(f"  {line}")
+
+    if any(rows != bulk_rows for rows in cached_rows):
+        print("❌ Cached re-runs stored different rows")
+        sys.exit(1)
+    if per_player_rows != bulk_rows:
+        print("❌ Stored rows differ between modes")
+        sys.exit(1)
+    print("✅ Both modes stored identical rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark the player_game_stats -> games join before and after migration 3.
+
+Builds a synthetic full season (1230 games, 30 teams, ~25k stat rows) in a
+temporary database with nba_game_id left empty, as an upgraded database would
+have it, then times:
+
+  * the old `pgs.game_id LIKE g.game_id || '_%'` join,
+  * the migration 3 backfill,
+  * the same queries as an equi-join on pgs.nba_game_id.
+
+Usage:
+    python3 scripts/benchmark_joins.py [--rows-per-game 20] [--repeat 5]
+"""
+
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from app import database
+from app.roster_optimizer import load_candidates
+from app.scoring import NBA_FANTASY, register_scoring_functions
+
+SEASON_START = date(2025, 10, 21)
+NUM_TEAMS = 30
+PLAYERS_PER_TEAM = 15
+GAMES_PER_DAY = 7
+
+# Candidate window query (roster_optimizer.load_candidates) and the per-day
+# roster query from daily_lineups.py, written with the legacy LIKE join.
+LEGACY_CANDIDATES = """
+    SELECT p.player_id, COUNT(DISTINCT SUBSTR(pgs.game_id, 1, 10)),
+           AVG(pgs.fantasy_points)
+    FROM player_game_stats pgs
+    JOIN players p ON pgs.player_id = p.player_id
+    JOIN teams t ON p.team_id = t.team_id
+    JOIN games g ON pgs.game_id LIKE g.game_id || '_%'
+    WHERE g.game_date >= ? AND g.game_date <= ?
+    AND pgs.minutes_played > 0
+    AND p.salary IS NOT NULL
+    GROUP BY p.player_id
+"""
+
+EQUI_CANDIDATES = """
+    SELECT p.player_id, COUNT(DISTINCT pgs.nba_game_id),
+           AVG(pgs.fantasy_points)
+    FROM player_game_stats pgs
+    JOIN players p ON pgs.player_id = p.player_id
+    JOIN teams t ON p.team_id = t.team_id
+    JOIN games g ON g.game_id = pgs.nba_game_id
+    WHERE g.game_date >= ? AND g.game_date <= ?
+    AND pgs.minutes_played > 0
+    AND p.salary IS NOT NULL
+    GROUP BY p.player_id
+"""
+
+LEGACY_DAY = """
+    SELECT p.player_name, AVG(pgs.fantasy_points), g.game_date
+    FROM players p
+    JOIN player_game_stats pgs ON p.player_id = pgs.player_id
+    JOIN games g ON pgs.game_id LIKE g.game_id || '_%'
+    WHERE date(g.game_date) = ?
+    AND p.team_id IN (g.home_team_id, g.away_team_id)
+    GROUP BY p.player_id, g.game_date
+"""
+
+# game_date is always stored as YYYY-MM-DD, so the date() wrapper is dropped to
+# let the lookup use idx_games_date and then idx_pgs_nba_game.
+EQUI_DAY = LEGACY_DAY.replace(
+    "pgs.game_id LIKE g.game_id || '_%'", "g.game_id = pgs.nba_game_id"
+).replace("date(g.game_date) = ?", "g.game_date = ?")
+
+
+def build_season(path, rows_per_game, seed=0):
+    """Create a migrated database holding one synthetic season of stat rows."""
+    database.DB_PATH = path
+    database.init_database()
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    cur.executemany("INSERT INTO teams VALUES (?, ?, ?, ?, ?)",
+                    [(t, f"Team {t}", f"T{t:02d}", 'City', 'ST') for t in range(NUM_TEAMS)])
+    cur.executemany("""
+        INSERT INTO players (player_id, player_name, team_id, position, salary)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(1000 + i, f"Player {i}", i % NUM_TEAMS, rng.choice(['G', 'F', 'C']),
+           round(rng.uniform(4, 22), 1)) for i in range(NUM_TEAMS * PLAYERS_PER_TEAM)])
+
+    cur.execute("""
+        INSERT INTO gameweeks (season_year, week_number, start_date, end_date)
+        VALUES (2025, 1, ?, '2026-04-12')
+    """, (SEASON_START.isoformat(),))
+
+    games = []
+    stats = []
+    for n in range(1230):
+        game_id = f"0022500{n + 1:03d}"
+        game_date = (SEASON_START + timedelta(days=n // GAMES_PER_DAY)).isoformat()
+        home = (2 * n) % NUM_TEAMS
+        away = (2 * n + 1) % NUM_TEAMS
+        games.append((game_id, 1, game_date, 2025, home, away))
+        roster = [1000 + home + NUM_TEAMS * k for k in range(PLAYERS_PER_TEAM)] + \
+                 [1000 + away + NUM_TEAMS * k for k in range(PLAYERS_PER_TEAM)]
+        for player_id in rng.sample(roster, rows_per_game):
+            pts, reb, ast = rng.randint(0, 35), rng.randint(0, 12), rng.randint(0, 10)
+            blk, stl = rng.randint(0, 3), rng.randint(0, 3)
+            stats.append((player_id, f"{game_id}_{player_id}", game_date, pts, reb, ast, blk, stl,
+                          NBA_FANTASY.score(pts, reb, ast, blk, stl), rng.uniform(5, 40)))
+
+    cur.executemany("""
+        INSERT INTO games (game_id, gameweek_id, game_date, season_year, home_team_id, away_team_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, games)
+    cur.executemany("""
+        INSERT INTO player_game_stats
+        (player_id, game_id, game_date, points, rebounds, assists, blocks, steals,
+         fantasy_points, minutes_played)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, stats)
+    # Pretend this database predates migration 3 so migrate() runs the backfill
+    cur.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.close()
+    return len(stats)
+
+
+def best_of(repeat, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    args = sys.argv[1:]
+    rows_per_game = int(args[args.index('--rows-per-game') + 1]) if '--rows-per-game' in args else 20
+    repeat = int(args[args.index('--repeat') + 1]) if '--repeat' in args else 5
+
+    print("🏀 player_game_stats -> games join benchmark")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "season.db"
+        num_rows = build_season(path, rows_per_game)
+        conn = sqlite3.connect(path)
+        register_scoring_functions(conn)
+        week = ('2025-12-09', '2025-12-15')
+        day = ('2025-12-12',)
+        print(f"  {num_rows} stat rows, 1230 games")
+
+        legacy_week, legacy_week_time = best_of(
+            repeat, lambda: conn.execute(LEGACY_CANDIDATES, week).fetchall())
+        legacy_day, legacy_day_time = best_of(
+            repeat, lambda: conn.execute(LEGACY_DAY, day).fetchall())
+
+        start = time.perf_counter()
+        database.migrate(conn)
+        backfill_time = time.perf_counter() - start
+
+        equi_week, equi_week_time = best_of(
+            repeat, lambda: conn.execute(EQUI_CANDIDATES, week).fetchall())
+        equi_day, equi_day_time = best_of(
+            repeat, lambda: conn.execute(EQUI_DAY, day).fetchall())
+        _, loader_time = best_of(repeat, lambda: load_candidates(conn, *week))
+
+        print(f"\n  {'Query':<28} {'LIKE (ms)':>10} {'equi (ms)':>10} {'Speedup':>8}")
+        for label, before, after in (
+            ("7-day candidate window", legacy_week_time, equi_week_time),
+            ("single-day roster", legacy_day_time, equi_day_time),
+        ):
+            print(f"  {label:<28} {before * 1000:>10.1f} {after * 1000:>10.1f} {before / after:>7.0f}x")
+        print(f"\n  Migration 3 backfill:       {backfill_time * 1000:.1f} ms")
+        print(f"  load_candidates (equi-join): {loader_time * 1000:.1f} ms")
+
+        if sorted(legacy_week) != sorted(equi_week) or sorted(legacy_day) != sorted(equi_day):
+            print("❌ Equi-join results differ from the LIKE join")
+            sys.exit(1)
+        print("✅ Equi-join results match the LIKE join")
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark the exact roster solver against the original greedy pass.
+
+Uses a seeded synthetic pool shaped like the salaried player list (~500
+players, 30 teams) unless --db is given, in which case candidates are loaded
+from the database for the same window team_optimizer.py uses.
+
+Usage:
+    python3 scripts/benchmark_optimizer.py [--players 500] [--seeds 5] [--verify] [--db]
+"""
+
+import itertools
+import random
+import sys
+import time
+
+from app.roster_optimizer import (
+    RosterSolver, greedy_roster, load_candidates, player_score, position_group,
+    solve_roster, MAX_PER_TEAM, ROSTER_SLOTS,
+)
+
+
+def make_synthetic_pool(num_players=500, seed=0, performance_weight=0.7):
+    """Build a random candidate pool with realistic salary/production correlation."""
+    rng = random.Random(seed)
+    pool = []
+    for i in range(num_players):
+        salary = round(rng.uniform(4.0, 22.0) * 2) / 2
+        fantasy_avg = max(0.0, salary * 2.2 + rng.gauss(0, 7))
+        pool.append({
+            'player_id': i,
+            'player_name': f"Player {i}",
+            'position': rng.choice(['G', 'G', 'G-F', 'F', 'F-C', 'C']),
+            'team_id': rng.randrange(30),
+            'team_name': f"Team {i % 30}",
+            'salary': salary,
+            'fantasy_avg': round(fantasy_avg, 1),
+            'score': player_score(fantasy_avg, salary, performance_weight),
+        })
+    return pool
+
+
+def brute_force(pool, max_salary):
+    """Exhaustive search; only usable on tiny pools."""
+    best = None
+    bc = [p for p in pool if position_group(p['position']) == 'BC']
+    fc = [p for p in pool if position_group(p['position']) == 'FC']
+    for bc_pick in itertools.combinations(bc, ROSTER_SLOTS['BC']):
+        bc_salary = sum(p['salary'] for p in bc_pick)
+        if bc_salary > max_salary:
+            continue
+        for fc_pick in itertools.combinations(fc, ROSTER_SLOTS['FC']):
+            roster = bc_pick + fc_pick
+            if bc_salary + sum(p['salary'] for p in fc_pick) > max_salary + 1e-9:
+                continue
+            teams = {}
+            for p in roster:
+                teams[p['team_id']] = teams.get(p['team_id'], 0) + 1
+            if max(teams.values()) > MAX_PER_TEAM:
+                continue
+            score = sum(p['score'] for p in roster)
+            if best is None or score > best:
+                best = score
+    return best
+
+
+def time_call(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def report(label, pool, max_salary):
+    greedy, greedy_time = time_call(greedy_roster, pool, max_salary)
+    exact, exact_time = time_call(solve_roster, pool, max_salary)
+
+    print(f"\n{label} ({len(pool)} candidates)")
+    print(f"  {'Method':<8} {'Time (ms)':>10} {'Score':>9} {'FP/G':>8} {'Salary':>8} {'Nodes':>8}")
+    print(f"  {'greedy':<8} {greedy_time * 1000:>10.1f} {greedy['score']:>9.2f} "
+          f"{greedy['fantasy_avg']:>8.1f} {greedy['salary']:>8.1f} {'-':>8}")
+    if exact:
+        print(f"  {'exact':<8} {exact_time * 1000:>10.1f} {exact['score']:>9.2f} "
+              f"{exact['fantasy_avg']:>8.1f} {exact['salary']:>8.1f} {exact['nodes']:>8}")
+        print(f"  Improvement: {exact['score'] - greedy['score']:+.2f} score, "
+              f"{exact['fantasy_avg'] - greedy['fantasy_avg']:+.1f} FP/G")
+    else:
+        print("  exact: no feasible roster")
+    return exact_time
+
+
+def main():
+    args = sys.argv[1:]
+    num_players = int(args[args.index('--players') + 1]) if '--players' in args else 500
+    seeds = int(args[args.index('--seeds') + 1]) if '--seeds' in args else 5
+    max_salary = 100.0
+
+    print("🏀 Roster optimizer benchmark: exact branch-and-bound vs greedy")
+
+    if '--db' in args:
+        from app.database import get_connection
+        conn = get_connection()
+        pool = load_candidates(conn, '2025-12-09', '2025-12-15')
+        conn.close()
+        report("Database candidates", pool, max_salary)
+        return
+
+    times = []
+    for seed in range(seeds):
+        pool = make_synthetic_pool(num_players, seed)
+        times.append(report(f"Synthetic pool seed={seed}", pool, max_salary))
+    print(f"\nExact solver: mean {sum(times) / len(times) * 1000:.1f} ms, "
+          f"max {max(times) * 1000:.1f} ms over {len(times)} pools")
+
+    if '--verify' in args:
+        print("\nVerifying against brute force on small pools...")
+        for seed in range(20):
+            pool = make_synthetic_pool(22, seed + 1000)
+            # Cap below the unconstrained optimum's cost so salary actually binds
+            unconstrained = RosterSolver(pool, float('inf')).solve()
+            cap = round(unconstrained['salary'] * 0.9, 1) if unconstrained else max_salary
+            expected = brute_force(pool, cap)
+            exact = RosterSolver(pool, cap).solve()
+            reduced = solve_roster(pool, cap)
+            got = exact['score'] if exact else None
+            got_reduced = reduced['score'] if reduced else None
+            ok = (expected is None and got is None) or (
+                expected is not None and abs(expected - got) < 1e-6 and abs(expected - got_reduced) < 1e-6)
+            print(f"  seed {seed}: {'OK' if ok else 'MISMATCH'} ({expected} vs {got} / {got_reduced})")
+            if not ok:
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark scalar vs vectorized fantasy scoring.
+
+Scores the same synthetic box scores three ways:
+
+  * scalar:    FantasyCalculator.calculate_fantasy_points once per game
+  * ndarray:   FantasyCalculator.score_batch on an (n, 5) array
+  * DataFrame: FantasyCalculator.score_batch on NBA API columns (PTS, REB, ...)
+
+Usage:
+    python3 scripts/benchmark_scoring.py [--games 100000] [--repeat 5]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.fantasy_calculator import FantasyCalculator
+
+
+def best_of(repeat, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    args = sys.argv[1:]
+    num_games = int(args[args.index('--games') + 1]) if '--games' in args else 100000
+    repeat = int(args[args.index('--repeat') + 1]) if '--repeat' in args else 5
+
+    rng = np.random.default_rng(0)
+    stats = np.column_stack([
+        rng.integers(0, 45, num_games),   # points
+        rng.integers(0, 15, num_games),   # rebounds
+        rng.integers(0, 12, num_games),   # assists
+        rng.integers(0, 4, num_games),    # blocks
+        rng.integers(0, 4, num_games),    # steals
+    ])
+    rows = stats.tolist()
+    frame = pd.DataFrame(stats, columns=['PTS', 'REB', 'AST', 'BLK', 'STL'])
+
+    print("🏀 Fantasy scoring benchmark: scalar vs score_batch")
+    print(f"  {num_games} games, best of {repeat}")
+
+    scalar, scalar_time = best_of(repeat, lambda: [
+        FantasyCalculator.calculate_fantasy_points(pts, reb, ast, blk, stl)
+        for pts, reb, ast, blk, stl in rows
+    ])
+    (array_totals, breakdown), array_time = best_of(repeat, lambda: FantasyCalculator.score_batch(stats))
+    (frame_totals, _), frame_time = best_of(repeat, lambda: FantasyCalculator.score_batch(frame))
+
+    print(f"\n  {'Path':<12} {'Time (ms)':>10} {'Games/s':>14} {'Speedup':>8}")
+    for label, elapsed in (("scalar", scalar_time), ("ndarray", array_time), ("DataFrame", frame_time)):
+        print(f"  {label:<12} {elapsed * 1000:>10.2f} {num_games / elapsed:>14,.0f} {scalar_time / elapsed:>7.0f}x")
+
+    expected = np.array(scalar, dtype=np.float64)
+    if not (np.array_equal(array_totals, expected) and np.array_equal(frame_totals, expected)
+            and np.array_equal(breakdown.sum(axis=1), expected)):
+        print("❌ Vectorized scores differ from the scalar path")
+        sys.exit(1)
+    print("✅ Vectorized scores match the scalar path")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request player averages: SQL window query vs the in-memory stats store.
+
+Builds the synthetic season from benchmark_joins.py (~25k stat rows) and times
+the per-player figures the analytics endpoints need (games played, season
+total and average, last-5/10/30 averages) for a 10-player roster and for every
+player:
+
+  * window:  ROW_NUMBER() window query over player_game_stats
+  * summary: lookup in the player_fantasy_summary table
+  * store:   StatsColumns.summary over the NumPy snapshot
+
+Usage:
+    python3 scripts/benchmark_stats_store.py [--rows-per-game 20] [--repeat 20]
+"""
+
+import math
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app import database
+from app.scoring import DEFAULT_PROFILE, register_scoring_functions
+from app.stats_store import StatsColumns, StatsStore
+from benchmark_joins import build_season
+
+WINDOW_QUERY = """
+    SELECT player_id, COUNT(*), SUM(fp), AVG(fp),
+           AVG(CASE WHEN rn <= 5 THEN fp END),
+           AVG(CASE WHEN rn <= 10 THEN fp END),
+           AVG(CASE WHEN rn <= 30 THEN fp END)
+    FROM (
+        SELECT player_id,
+               fp(points, rebounds, assists, blocks, steals, turnovers, ?) AS fp,
+               ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC) AS rn
+        FROM player_game_stats
+        WHERE player_id IN ({placeholders})
+    )
+    GROUP BY player_id
+"""
+
+SUMMARY_QUERY = """
+    SELECT player_id, games_played, season_total_fp, season_avg_fp,
+           last5_avg_fp, last10_avg_fp, last30_avg_fp
+    FROM player_fantasy_summary
+    WHERE player_id IN ({placeholders}) AND profile = ?
+"""
+
+STORE_COLUMNS = ('games_played', 'season_total_fp', 'season_avg_fp',
+                 'last5_avg_fp', 'last10_avg_fp', 'last30_avg_fp')
+
+
+def best_of(repeat, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    args = sys.argv[1:]
+    rows_per_game = int(args[args.index('--rows-per-game') + 1]) if '--rows-per-game' in args else 20
+    repeat = int(args[args.index('--repeat') + 1]) if '--repeat' in args else 20
+
+    print("🏀 Player averages benchmark: SQL window query vs in-memory stats store")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "season.db"
+        num_rows = build_season(path, rows_per_game)
+        conn = sqlite3.connect(path)
+        database.migrate(conn)
+        register_scoring_functions(conn)
+        database.refresh_player_fantasy_summary(conn.cursor())
+        conn.commit()
+        all_players = [row[0] for row in conn.execute("SELECT player_id FROM players ORDER BY player_id")]
+        print(f"  {num_rows} stat rows, {len(all_players)} players, best of {repeat}")
+
+        store = StatsStore(path)
+        _, load_time = best_of(3, lambda: StatsColumns.load(conn))
+        columns = store.current()
+
+        def window(ids):
+            sql = WINDOW_QUERY.format(placeholders=','.join('?' * len(ids)))
+            return {row[0]: row[1:] for row in conn.execute(sql, [DEFAULT_PROFILE, *ids])}
+
+        def summary(ids):
+            sql = SUMMARY_QUERY.format(placeholders=','.join('?' * len(ids)))
+            return {row[0]: row[1:] for row in conn.execute(sql, [*ids, DEFAULT_PROFILE])}
+
+        def from_store(ids):
+            current = store.current()
+            return {pid: tuple(row[c] for c in STORE_COLUMNS) for pid, row in current.summary(ids).items()}
+
+        print(f"\n  {'Players':<10} {'window (ms)':>12} {'summary (ms)':>13} {'store (ms)':>11} {'vs window':>10}")
+        mismatches = 0
+        for ids in (all_players[::45][:10], all_players):
+            expected, window_time = best_of(repeat, lambda: window(ids))
+            _, summary_time = best_of(repeat, lambda: summary(ids))
+            got, store_time = best_of(repeat, lambda: from_store(ids))
+            print(f"  {len(ids):<10} {window_time * 1000:>12.3f} {summary_time * 1000:>13.3f} "
+                  f"{store_time * 1000:>11.3f} {window_time / store_time:>9.0f}x")
+            for pid, row in expected.items():
+                if not all(math.isclose(a, b, rel_tol=1e-9) for a, b in zip(row, got.get(pid, ()))):
+                    mismatches += 1
+
+        print(f"\n  Snapshot load ({len(columns)} rows): {load_time * 1000:.1f} ms, "
+              f"data_version check: {best_of(repeat, store.current)[1] * 1e6:.0f} µs")
+        conn.close()
+
+        if mismatches:
+            print(f"❌ {mismatches} players differ between the window query and the store")
+            sys.exit(1)
+        print("✅ Store figures match the window query")
+
+
+if __name__ == '__main__':
+    main()
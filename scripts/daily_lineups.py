@@ -4,6 +4,8 @@ Generate optimal starting 5 for each day of the current gameweek
 """
 
 from app.database import get_connection
+from app.lineups import best_lineups
+from app.roster_optimizer import position_group
 from datetime import datetime, timedelta
 
 # Optimal roster from team optimizer
@@ -51,22 +53,17 @@ def get_daily_lineups():
     # Get all roster player names
     all_roster_players = [p[0] for p in OPTIMAL_ROSTER['backcourt']] + [p[0] for p in OPTIMAL_ROSTER['frontcourt']]
     
+    # Our roster players who have games on each day, with their recent average
+    players_by_day = []
     for day in days:
-        # Parse date
-        day_obj = datetime.strptime(day, '%Y-%m-%d')
-        day_name = day_obj.strftime('%A, %B %d')
-        
-        print(f"\n📅 {day_name}")
-        print("─" * 120)
-        
-        # Get our roster players who have games on this day
         cur.execute("""
             SELECT DISTINCT
+                p.player_id,
                 p.player_name,
                 p.position,
                 t.team_name,
                 p.salary,
-                ROUND(AVG(pgs.points + pgs.rebounds + 2*pgs.assists + 3*pgs.blocks + 3*pgs.steals), 1) as fantasy_avg,
+                ROUND(AVG(fp(pgs.points, pgs.rebounds, pgs.assists, pgs.blocks, pgs.steals, pgs.turnovers)), 1) as fantasy_avg,
                 g.game_date,
                 CASE 
                     WHEN g.home_team_id = p.team_id THEN 'vs ' || away.team_name
@@ -75,73 +72,64 @@ def get_daily_lineups():
             FROM players p
             JOIN teams t ON p.team_id = t.team_id
             JOIN player_game_stats pgs ON p.player_id = pgs.player_id
-            JOIN games g ON pgs.game_id LIKE g.game_id || '_%'
+            JOIN games g ON g.game_id = pgs.nba_game_id
             JOIN teams home ON g.home_team_id = home.team_id
             JOIN teams away ON g.away_team_id = away.team_id
-            WHERE date(g.game_date) = ?
+            WHERE g.game_date = ?
             AND p.player_name IN ({})
             AND g.game_date >= '2025-12-09' AND g.game_date <= '2025-12-15'
             GROUP BY p.player_id, p.player_name, p.position, t.team_name, p.salary, g.game_date, matchup
             ORDER BY fantasy_avg DESC
         """.format(','.join(['?'] * len(all_roster_players))), [day] + all_roster_players)
+        players_by_day.append({row[0]: dict(zip(
+            ('player_id', 'name', 'position', 'team', 'salary', 'fantasy_avg', 'date', 'matchup'), row))
+            for row in cur.fetchall()})
+    
+    # Optimal starting 5 (2-3 BC, 2-3 FC) of every day in one pass
+    roster = {}
+    for day_players in players_by_day:
+        roster.update(day_players)
+    roster = list(roster.values())
+    lineups = best_lineups(roster, players_by_day,
+                           projection=lambda player, d: players_by_day[d][player['player_id']]['fantasy_avg'])
+    
+    for day, day_players, lineup in zip(days, players_by_day, lineups):
+        # Parse date
+        day_obj = datetime.strptime(day, '%Y-%m-%d')
+        day_name = day_obj.strftime('%A, %B %d')
         
-        players_today = cur.fetchall()
+        print(f"\n📅 {day_name}")
+        print("─" * 120)
         
-        if not players_today:
+        if not day_players:
             print("   ⚠️  None of our roster players have games today")
             continue
         
-        # Classify by position
-        def is_backcourt(pos):
-            if not pos:
-                return False
-            pos_upper = pos.upper()
-            return any(x in pos_upper for x in ['PG', 'SG', 'G']) or pos_upper == 'G-F'
+        starters = [day_players[p['player_id']] for p in lineup['starters']]
+        bench = [day_players[p['player_id']] for p in lineup['bench']]
+        num_bc, num_fc = lineup['formation']
         
-        def is_frontcourt(pos):
-            if not pos:
-                return False
-            pos_upper = pos.upper()
-            return any(x in pos_upper for x in ['SF', 'PF', 'F-C', 'C-F', 'C', 'F']) or pos_upper == 'F-G'
-        
-        backcourt_available = [p for p in players_today if is_backcourt(p[1])]
-        frontcourt_available = [p for p in players_today if is_frontcourt(p[1])]
-        
-        # Select starting 5: top 3 backcourt + top 2 frontcourt
-        starting_bc = backcourt_available[:3]
-        starting_fc = frontcourt_available[:2]
-        
-        if len(starting_bc) < 3 or len(starting_fc) < 2:
-            print(f"   ⚠️  Insufficient players available (BC: {len(backcourt_available)}, FC: {len(frontcourt_available)})")
-            print(f"   Available players:")
-            for p in players_today:
-                pos_type = "BC" if is_backcourt(p[1]) else "FC"
-                print(f"      [{pos_type}] {p[0]} - {p[4]} FP/G ({p[6]})")
-            continue
+        if len(starters) < 5:
+            print(f"   ⚠️  Insufficient players available for a full starting 5 ({num_bc} BC, {num_fc} FC can start)")
         
         # Display starting 5
         print("\n   🔵 BACK COURT:")
-        total_bc_fp = 0
-        for name, pos, team, salary, fp, date, matchup in starting_bc:
-            print(f"      • {name:<25} {pos:<8} {fp:>5.1f} FP/G  {matchup}")
-            total_bc_fp += fp
+        for p in starters:
+            if position_group(p['position']) == 'BC':
+                print(f"      • {p['name']:<25} {p['position']:<8} {p['fantasy_avg']:>5.1f} FP/G  {p['matchup']}")
         
         print("\n   🔴 FRONT COURT:")
-        total_fc_fp = 0
-        for name, pos, team, salary, fp, date, matchup in starting_fc:
-            print(f"      • {name:<25} {pos:<8} {fp:>5.1f} FP/G  {matchup}")
-            total_fc_fp += fp
+        for p in starters:
+            if position_group(p['position']) == 'FC':
+                print(f"      • {p['name']:<25} {p['position']:<8} {p['fantasy_avg']:>5.1f} FP/G  {p['matchup']}")
         
-        total_fp = total_bc_fp + total_fc_fp
-        print(f"\n   📊 PROJECTED TOTAL: {total_fp:.1f} FP")
+        print(f"\n   📊 PROJECTED TOTAL: {lineup['points']:.1f} FP")
         
         # Show bench
-        bench = backcourt_available[3:] + frontcourt_available[2:]
         if bench:
             print(f"\n   💺 BENCH ({len(bench)} players):")
-            for name, pos, team, salary, fp, date, matchup in bench:
-                pos_type = "BC" if is_backcourt(pos) else "FC"
-                print(f"      [{pos_type}] {name:<25} {fp:>5.1f} FP/G  {matchup}")
+            for p in bench:
+                print(f"      [{position_group(p['position'])}] {p['name']:<25} {p['fantasy_avg']:>5.1f} FP/G  {p['matchup']}")
     
     print("\n" + "🏀" + "="*118 + "🏀\n")
     conn.close()
@@ -79,18 +79,13 @@ def update_database():
             except Exception as e:
                 log(f"Warning: Could not fetch roster for team {team_id}: {e}")
         
-        # Get all player IDs from database
-        cur.execute("SELECT player_id FROM players ORDER BY player_id")
-        player_ids = [row[0] for row in cur.fetchall()]
         conn.close()
         
-        log(f"Updating stats for {len(player_ids)} players...")
-        
-        # Update player stats for yesterday and today
-        DatabasePopulator.populate_player_stats(
+        # One league-wide box-score request per date covers every player
+        log(f"Loading box scores for {yesterday} to {today}...")
+        DatabasePopulator.populate_player_stats_bulk(
             from_date=yesterday,
-            to_date=today,
-            players_list=player_ids
+            to_date=today
         )
         
         # Get final counts
@@ -109,6 +104,8 @@ def update_database():
         log("Update completed successfully!")
         log(f"Database totals: {teams_count} teams, {players_count} players, "
             f"{games_count} games, {stats_count} player stats")
+        for line in NBADataFetcher.cache_report():
+            log(line)
         log("="*60)
         
         return 0
@@ -118,6 +115,10 @@ def update_database():
         import traceback
         traceback.print_exc()
         return 1
+    
+    finally:
+        # Runs after partial failures too, since some data may have been written
+        DatabasePopulator.invalidate_api_cache()
 
 if __name__ == '__main__':
     sys.exit(update_database())
@@ -2,7 +2,8 @@
 """Fetch only the game schedule for a date range"""
 
 from nba_data_fetcher import NBADataFetcher
-from app.database import get_connection
+from app.database import get_connection, bump_data_generation
+from app.gamedays import refresh_derived_deadlines, refresh_game_gamedays
 from datetime import datetime, timedelta
 import sys
 
@@ -45,6 +46,9 @@ def fetch_schedule(start_date, end_date):
         
         current_date += timedelta(days=1)
     
+    refresh_derived_deadlines(cur)
+    refresh_game_gamedays(cur)
+    bump_data_generation(cur)
     conn.commit()
     conn.close()
     print(f"\n✓ Added {total_games} games to database")
@@ -0,0 +1,273 @@
+"""
+HTTP Response Cache
+On-disk cache for stats.nba.com responses, so re-running a backfill only goes
+to the network for data that can still change.
+
+Responses are stored in a small SQLite file keyed by URL and sorted query
+parameters. Each endpoint has an expiry policy: box scores and scoreboards for
+dates that are over are kept forever, data for recent or in-progress dates for
+LIVE_TTL seconds. Expired entries are revalidated with If-None-Match /
+If-Modified-Since when the server sent an ETag or Last-Modified header.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from zoneinfo import ZoneInfo
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from http_client import PooledSession
+
+# NBA game dates are US Eastern dates
+NBA_TZ = ZoneInfo('America/New_York')
+# Seconds before data for live or recent dates is fetched again
+LIVE_TTL = int(os.getenv('NBA_CACHE_LIVE_TTL', '600'))
+ROSTER_TTL = 6 * 3600
+# Dates at least this many days old are final (late games and stat corrections settle by then)
+FINAL_AFTER_DAYS = 2
+
+
+def _parse_param_date(value) -> Optional[date]:
+    """Parse a GameDate/DateFrom/DateTo query value (MM/DD/YYYY, MMDDYYYY or YYYY-MM-DD)."""
+    for fmt in ('%m/%d/%Y', '%m%d%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(str(value), fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+def _nba_today() -> date:
+    return datetime.now(NBA_TZ).date()
+
+
+def _is_final_date(day: Optional[date]) -> bool:
+    return day is not None and day <= _nba_today() - timedelta(days=FINAL_AFTER_DAYS)
+
+
+def _season_over(params: Dict) -> bool:
+    """True if the request's Season (2025 or '2025-26') ended before the current one."""
+    try:
+        start_year = int(str(params.get('Season', ''))[:4])
+    except ValueError:
+        return False
+    today = _nba_today()
+    current = today.year if today.month >= 10 else today.year - 1
+    return start_year < current
+
+
+def _scoreboard_ttl(params: Dict, payload: Dict) -> Optional[float]:
+    day = _parse_param_date(params.get('GameDate'))
+    if _is_final_date(day):
+        return None
+    # A past date whose games have all gone final (GAME_STATUS_ID 3) won't change either
+    header = next((rs for rs in payload.get('resultSets', []) if rs.get('name') == 'GameHeader'), None)
+    if day is not None and day < _nba_today() and header and header.get('rowSet'):
+        status = header['headers'].index('GAME_STATUS_ID')
+        if all(row[status] == 3 for row in header['rowSet']):
+            return None
+    return LIVE_TTL
+
+
+def _league_log_ttl(params: Dict, payload: Dict) -> Optional[float]:
+    return None if _is_final_date(_parse_param_date(params.get('DateTo'))) else LIVE_TTL
+
+
+def _season_log_ttl(params: Dict, payload: Dict) -> Optional[float]:
+    return None if _season_over(params) else LIVE_TTL
+
+
+# Endpoint -> (query params, JSON payload) -> seconds to keep, None to keep forever,
+# 0 to not cache. Endpoints not listed use LIVE_TTL.
+TTL_POLICIES: Dict[str, Callable[[Dict, Dict], Optional[float]]] = {
+    'scoreboardv2': _scoreboard_ttl,
+    'leaguegamelog': _league_log_ttl,
+    'playergamelog': _season_log_ttl,
+    'teamgamelog': _season_log_ttl,
+    'commonteamroster': lambda params, payload: ROSTER_TTL,
+}
+
+
+def expiry_for(endpoint: str, params: Dict, payload: Dict) -> Optional[float]:
+    """Seconds to keep a response under TTL_POLICIES (None = forever)."""
+    policy = TTL_POLICIES.get(endpoint)
+    return policy(params, payload) if policy else LIVE_TTL
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of response bodies with expiry times and validators.
+
+    Safe to share between threads; the file is opened on first use.
+
+    Args:
+        path: Cache database file
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.counts: Dict[str, Counter] = {}
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL
+                )
+            """)
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored entry for a key (fresh or expired), or None."""
+        with self._lock:
+            row = self._connection().execute("""
+                SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?
+            """, (key,)).fetchone()
+        if row is None:
+            return None
+        return {'body': zlib.decompress(row[0]), 'etag': row[1], 'last_modified': row[2],
+                'expires_at': row[3]}
+
+    def put(self, key: str, endpoint: str, body: bytes, etag: Optional[str],
+            last_modified: Optional[str], ttl: Optional[float]):
+        """Store a response body; ttl None keeps it forever."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("""
+                INSERT OR REPLACE INTO responses
+                (key, endpoint, body, etag, last_modified, fetched_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (key, endpoint, zlib.compress(body), etag, last_modified, now,
+                  None if ttl is None else now + ttl))
+            conn.commit()
+
+    def extend(self, key: str, ttl: Optional[float]):
+        """Push back the expiry of an entry the server confirmed is unchanged."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("UPDATE responses SET fetched_at = ?, expires_at = ? WHERE key = ?",
+                         (now, None if ttl is None else now + ttl, key))
+            conn.commit()
+
+    def count(self, endpoint: str, outcome: str):
+        with self._lock:
+            self.counts.setdefault(endpoint, Counter())[outcome] += 1
+
+    def report(self) -> List[str]:
+        """
+        Summarise cache use since the counters were last reset.
+
+        Returns:
+            Report lines: a total, then one line per endpoint
+        """
+        totals = sum(self.counts.values(), Counter())
+        requests_made = sum(totals.values())
+        if not requests_made:
+            return ["HTTP cache: no requests"]
+        local = totals['hit'] + totals['revalidated']
+        lines = [f"HTTP cache: {totals['hit']} hits, {totals['revalidated']} revalidated, "
+                 f"{totals['miss']} misses ({100 * local / requests_made:.0f}% without a download)"]
+        for endpoint, counts in sorted(self.counts.items()):
+            lines.append(f"  {endpoint:<18} {counts['hit']:>6} hits {counts['revalidated']:>5} revalidated "
+                         f"{counts['miss']:>6} misses")
+        return lines
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts = {}
+
+
+class CachedSession(PooledSession):
+    """
+    PooledSession that answers GETs from a ResponseCache when it can.
+
+    Only requests that actually go to the network reach the throttle, so cache
+    hits don't use up the API rate limit.
+
+    Args:
+        cache: ResponseCache, or None to always use the network
+        **kwargs: PooledSession options (throttle, pool_size, max_retries, retry_delay)
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    @staticmethod
+    def cache_key(url: str, params=None):
+        """Canonical key: scheme, host and path plus the sorted query parameters."""
+        prepared = requests.Request('GET', url, params=params).prepare().url
+        parts = urlsplit(prepared)
+        query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+        endpoint = parts.path.rstrip('/').rsplit('/', 1)[-1].lower()
+        return f"{parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}", endpoint, dict(query), prepared
+
+    @staticmethod
+    def _cached_response(body: bytes, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = body
+        response.encoding = 'utf-8'
+        response.url = url
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json', 'X-Cache': 'HIT'})
+        return response
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if self.cache is None or method.upper() != 'GET':
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        key, endpoint, query, full_url = self.cache_key(url, params)
+        entry = self.cache.get(key)
+        if entry and (entry['expires_at'] is None or entry['expires_at'] > time.time()):
+            self.cache.count(endpoint, 'hit')
+            return self._cached_response(entry['body'], full_url)
+
+        headers = dict(headers or {})
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.count(endpoint, 'revalidated')
+            payload = json.loads(entry['body'])
+            self.cache.extend(key, expiry_for(endpoint, query, payload))
+            return self._cached_response(entry['body'], full_url)
+
+        self.cache.count(endpoint, 'miss')
+        if response.status_code == 200:
+            try:
+                payload = json.loads(response.content)
+            except ValueError:
+                # Error pages and truncated bodies are never cached
+                return response
+            ttl = expiry_for(endpoint, query, payload)
+            if ttl is None or ttl > 0:
+                self.cache.put(key, endpoint, response.content, response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'), ttl)
+        return response
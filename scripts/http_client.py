@@ -0,0 +1,97 @@
+"""
+HTTP Client
+Pooled requests.Session shared by every stats.nba.com fetcher.
+
+One session keeps connections alive across calls, so thousands of game-log and
+scoreboard requests reuse a handful of TLS connections instead of opening one
+each. Retries with jittered exponential backoff live here too, so the
+fetchers don't each carry their own retry loop.
+"""
+
+import os
+import random
+import time
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Browser-like headers stats.nba.com expects; nba_api adds its own per request
+STATS_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://www.nba.com/',
+    'Origin': 'https://www.nba.com',
+}
+
+# Kept-alive connections per host; should be at least the number of fetch workers
+POOL_SIZE = int(os.getenv('NBA_HTTP_POOL_SIZE', '16'))
+MAX_RETRIES = 5
+RETRY_DELAY = 2  # base seconds for exponential backoff
+# Throttling and transient server errors worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def backoff_delay(attempt: int, base: float = RETRY_DELAY) -> float:
+    """Exponential backoff for a 1-based attempt number, plus up to 50% random jitter."""
+    backoff = base * (2 ** (attempt - 1))
+    return backoff + random.uniform(0, 0.5 * backoff)
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with a sized connection pool, default headers and retries.
+
+    Every attempt calls `throttle` first, so retries respect the shared rate
+    limit. Connection errors, timeouts and RETRY_STATUSES responses are retried
+    up to max_retries times; the last error is raised, or the last response
+    returned.
+
+    Args:
+        throttle: Called before every network attempt (e.g. a rate limiter's acquire)
+        pool_size: Connections kept alive per host
+        max_retries: Attempts per request
+        retry_delay: Base seconds for the exponential backoff
+    """
+
+    def __init__(self, throttle: Optional[Callable[[], object]] = None, pool_size: int = POOL_SIZE,
+                 max_retries: int = MAX_RETRIES, retry_delay: float = RETRY_DELAY):
+        super().__init__()
+        self.throttle = throttle
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.headers.update(STATS_HEADERS)
+        # Retries are handled in request() so each attempt goes through the throttle
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        for attempt in range(1, self.max_retries + 1):
+            if self.throttle:
+                self.throttle()
+            retry_after = ''
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except RETRY_EXCEPTIONS as e:
+                if attempt == self.max_retries:
+                    raise
+                reason = type(e).__name__
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                retry_after = response.headers.get('Retry-After', '')
+                response.close()
+            wait = backoff_delay(attempt, self.retry_delay)
+            if retry_after.isdigit():
+                wait = max(wait, float(retry_after))
+            endpoint = url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+            print(f"  {endpoint}: {reason} (attempt {attempt}/{self.max_retries}), retrying in {wait:.1f}s...")
+            time.sleep(wait)
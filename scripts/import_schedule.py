@@ -2,24 +2,30 @@
 """Import full season schedule from NBA API"""
 
 from nba_api.stats.endpoints import scheduleleaguev2
-from app.database import get_connection
+from app.database import get_connection, bump_data_generation
+from app.gamedays import refresh_derived_deadlines, refresh_game_gamedays
+from app.gameweeks import GameweekIndex
+# Importing the fetcher routes nba_api through the shared pooled, rate-limited session
+from nba_data_fetcher import NBADataFetcher
 import pandas as pd
 from zoneinfo import ZoneInfo
 
 def import_schedule():
     print("Fetching full 2025-26 season schedule...")
-    schedule = scheduleleaguev2.ScheduleLeagueV2(season='2025-26')
+    schedule = scheduleleaguev2.ScheduleLeagueV2(season='2025-26', timeout=NBADataFetcher.TIMEOUT)
     df = schedule.get_data_frames()[0]
     
     print(f"Found {len(df)} games in season")
     
     conn = get_connection()
     cur = conn.cursor()
+    gameweeks = GameweekIndex.load(conn)
     
     # Convert date format
     df['gameDateEst'] = pd.to_datetime(df['gameDateEst'])
     
     games_added = 0
+    games_skipped = 0
     madrid_tz = ZoneInfo('Europe/Madrid')
     
     for _, row in df.iterrows():
@@ -31,16 +37,19 @@ def import_schedule():
         game_date_madrid = game_datetime_madrid.strftime('%Y-%m-%d')
         game_time_madrid = game_datetime_madrid.strftime('%H:%M')
         
-        # Determine gameweek based on Madrid timezone date
-        season_start = pd.Timestamp('2025-10-21', tz=madrid_tz)
-        week_num = ((game_datetime_madrid - season_start).days // 7) + 1
+        # Determine gameweek based on Madrid timezone date; games outside the
+        # gameweek calendar (e.g. preseason) have no gameweek_id to reference
+        gameweek_id = gameweeks.lookup(game_date_madrid)
+        if gameweek_id is None:
+            games_skipped += 1
+            continue
         
         cur.execute("""
             INSERT OR REPLACE INTO games (game_id, gameweek_id, game_date, game_time, home_team_id, away_team_id, season_year)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (
             row['gameId'],
-            week_num,
+            gameweek_id,
             game_date_madrid,
             game_time_madrid,
             row['homeTeam_teamId'],
@@ -49,10 +58,17 @@ def import_schedule():
         ))
         games_added += 1
     
+    # New or moved tip-offs change the deadlines computed from game times
+    refresh_derived_deadlines(cur)
+    assigned = refresh_game_gamedays(cur)
+    bump_data_generation(cur)
     conn.commit()
     conn.close()
     
     print(f"✓ Imported {games_added} games into database")
+    if games_skipped:
+        print(f"⚠️  Skipped {games_skipped} games outside the {len(gameweeks)} stored gameweeks")
+    print(f"✓ Assigned {assigned} games to fantasy gamedays")
     
     # Show summary for next week
     dec_games = df[(df['gameDateEst'] >= '2025-12-16') & (df['gameDateEst'] <= '2025-12-22')]
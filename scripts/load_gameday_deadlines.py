@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Load the fantasy gameday deadline calendar into gameday_deadlines.
+
+By default deadlines are computed from stored game times: each US game night
+is a gameday locking 30 minutes before its first tip-off. Gameweeks whose
+deadlines came from NBA Fantasy or a CSV are kept unless --overwrite is given.
+Afterwards every game's gameday (game_gamedays) is recomputed.
+
+CSV files need a header row with gameweek, day_num and deadline columns;
+deadlines are ISO datetimes, in Madrid time unless they carry an offset:
+
+    gameweek,day_num,deadline
+    13,1,2026-01-13 00:30
+
+Usage:
+    python3 scripts/load_gameday_deadlines.py [--csv FILE] [--overwrite]
+"""
+
+import csv
+import sys
+
+from app.database import get_connection, init_database, bump_data_generation
+from app.gamedays import (deadlines_from_games, parse_deadline, refresh_derived_deadlines,
+                          refresh_game_gamedays, save_deadlines)
+
+
+def read_csv(path):
+    """Read (gameweek, day_num, deadline) rows from a CSV file."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(int(row['gameweek']), int(row['day_num']), parse_deadline(row['deadline']))
+                for row in csv.DictReader(f)]
+
+
+def main():
+    args = sys.argv[1:]
+    csv_path = args[args.index('--csv') + 1] if '--csv' in args else None
+    overwrite = '--overwrite' in args
+
+    init_database()
+    conn = get_connection()
+    cur = conn.cursor()
+
+    if csv_path:
+        gamedays = read_csv(csv_path)
+        written = save_deadlines(cur, gamedays, 'csv')
+        print(f"✓ Loaded {written} deadlines for {len({g[0] for g in gamedays})} gameweeks from {csv_path}")
+    elif overwrite:
+        written = save_deadlines(cur, deadlines_from_games(conn), 'games')
+        print(f"✓ Computed {written} deadlines from game times")
+    else:
+        keep = {row[0] for row in cur.execute(
+            "SELECT DISTINCT gameweek FROM gameday_deadlines WHERE source != 'games'")}
+        written = refresh_derived_deadlines(cur)
+        print(f"✓ Computed {written} deadlines from game times"
+              + (f" (kept gameweeks {', '.join(map(str, sorted(keep)))})" if keep else ""))
+
+    assigned = refresh_game_gamedays(cur)
+    bump_data_generation(cur)
+    conn.commit()
+
+    total, weeks = cur.execute("SELECT COUNT(*), COUNT(DISTINCT gameweek) FROM gameday_deadlines").fetchone()
+    print(f"✓ {total} gameday deadlines across {weeks} gameweeks; {assigned} games assigned to gamedays")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,59 @@ Fetches current season data from NBA API including teams, players, schedule, and
 from nba_api.stats.static import teams, players
 from nba_api.stats.endpoints import (
     playergamelog,
+    leaguegamelog,
     teamgamelog,
     commonteamroster,
     scoreboardv2,
 )
+from nba_api.stats.library.http import NBAStatsHTTP
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Optional
+import json
+import os
+import threading
 import time
-import requests
-import random
+
+from http_cache import CachedSession, ResponseCache
+from http_client import POOL_SIZE, RETRY_EXCEPTIONS
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+    
+    Allows `burst` requests at once, then refills at `rate` tokens per second.
+    acquire() reserves a token and sleeps until it becomes available, so
+    concurrent callers are spaced out instead of all retrying together.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Take one token, waiting if the bucket is empty.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
 
 
 class NBADataFetcher:
@@ -25,11 +69,66 @@ class NBADataFetcher:
     SEASON_START = "2025-10-21"  # 2025-26 season start
     SEASON_END = "2026-04-12"    # Approximate end date
     
-    # Retry configuration
+    # Retry configuration (applied by the shared session to every request)
     MAX_RETRIES = 5
     RETRY_DELAY = 2  # base seconds for exponential backoff
     TIMEOUT = 90  # seconds
     
+    # API rate limit shared by every request this process makes (requests/sec, burst)
+    API_RATE = float(os.getenv('NBA_API_RATE', '2'))
+    API_BURST = int(os.getenv('NBA_API_BURST', '4'))
+    # Concurrent game-log requests; the rate limiter still caps throughput
+    FETCH_WORKERS = int(os.getenv('NBA_FETCH_WORKERS', '4'))
+    
+    rate_limiter = TokenBucket(API_RATE, API_BURST)
+    
+    # On-disk cache location (defaults to a cache/ folder next to the database)
+    CACHE_DIR = Path(os.getenv('NBA_CACHE_DIR') or
+                     Path(os.getenv('DB_PATH', Path(__file__).parent.parent / 'app' / 'nba_fantasy.db')).parent / 'cache')
+    ACTIVE_PLAYERS_TTL = 12 * 3600  # seconds before rosters are resolved again
+    _active_players = None
+    _active_players_fetched = 0.0
+    
+    # Every stats.nba.com request (nba_api endpoints, populate_games, import_schedule)
+    # goes through this one pooled session: connections are kept alive, responses
+    # are cached on disk, and only real network attempts take a rate-limit token.
+    # NBA_HTTP_CACHE=0 turns the cache off.
+    HTTP_CACHE_ENABLED = os.getenv('NBA_HTTP_CACHE', '1') != '0'
+    session = CachedSession(
+        ResponseCache(CACHE_DIR / 'http_cache.db') if HTTP_CACHE_ENABLED else None,
+        throttle=lambda: NBADataFetcher.rate_limiter.acquire(),
+        pool_size=max(POOL_SIZE, 2 * FETCH_WORKERS),
+        max_retries=MAX_RETRIES,
+        retry_delay=RETRY_DELAY,
+    )
+    
+    @staticmethod
+    def configure_rate_limit(rate: float, burst: int = 1):
+        """
+        Replace the shared rate limiter.
+        
+        Args:
+            rate: Requests per second (0 disables limiting)
+            burst: Requests allowed back-to-back before throttling
+        """
+        NBADataFetcher.rate_limiter = TokenBucket(rate, burst)
+    
+    @staticmethod
+    def configure_cache(path=None):
+        """
+        Point the HTTP response cache at another file, or turn it off.
+        
+        Args:
+            path: Cache database file, or None to always use the network
+        """
+        NBADataFetcher.session.cache = ResponseCache(path) if path else None
+    
+    @staticmethod
+    def cache_report() -> List[str]:
+        """Hit/miss summary of the HTTP response cache for this run."""
+        cache = NBADataFetcher.session.cache
+        return cache.report() if cache else ["HTTP cache: disabled"]
+    
     @staticmethod
     def get_all_teams() -> List[Dict]:
         """
@@ -52,28 +151,22 @@ class NBADataFetcher:
         Returns:
             List of players on the team
         """
-        for attempt in range(NBADataFetcher.MAX_RETRIES):
-            try:
-                roster = commonteamroster.CommonTeamRoster(
-                    team_id=team_id,
-                    timeout=NBADataFetcher.TIMEOUT
-                )
-                roster_data = roster.get_data_frames()[0]
-                return roster_data.to_dict('records')
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                if attempt < NBADataFetcher.MAX_RETRIES - 1:
-                    wait_time = NBADataFetcher.RETRY_DELAY * (2 ** attempt)
-                    print(f"  Timeout for roster {team_id} (attempt {attempt+1}/{NBADataFetcher.MAX_RETRIES}), retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"  Failed to fetch roster for team {team_id} after {NBADataFetcher.MAX_RETRIES} attempts")
-                    return []
-            except Exception as e:
-                print(f"  Error fetching roster for team {team_id}: {e}")
-                return []
+        try:
+            roster = commonteamroster.CommonTeamRoster(
+                team_id=team_id,
+                timeout=NBADataFetcher.TIMEOUT
+            )
+            roster_data = roster.get_data_frames()[0]
+            return roster_data.to_dict('records')
+        except RETRY_EXCEPTIONS:
+            print(f"  Failed to fetch roster for team {team_id} after {NBADataFetcher.MAX_RETRIES} attempts")
+            return []
+        except Exception as e:
+            print(f"  Error fetching roster for team {team_id}: {e}")
+            return []
     
     @staticmethod
-    def get_player_game_log(player_id: int, season: int = CURRENT_SEASON) -> List[Dict]:
+    def get_player_game_log(player_id: int, season: int = CURRENT_SEASON) -> Optional[List[Dict]]:
         """
         Get game log for a specific player in a season.
         
@@ -82,32 +175,56 @@ class NBADataFetcher:
             season: NBA season year
             
         Returns:
-            List of game statistics for the player
+            List of game statistics for the player, or None if the request failed
         """
-        for attempt in range(1, NBADataFetcher.MAX_RETRIES + 1):
-            try:
-                game_log = playergamelog.PlayerGameLog(
-                    player_id=player_id,
-                    season=season,
-                    timeout=NBADataFetcher.TIMEOUT
-                )
-                games_data = game_log.get_data_frames()[0]
-                # brief pause to be polite to the API
-                time.sleep(0.25)
-                return games_data.to_dict('records')
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                if attempt < NBADataFetcher.MAX_RETRIES:
-                    backoff = NBADataFetcher.RETRY_DELAY * (2 ** (attempt - 1))
-                    jitter = random.uniform(0, 0.5 * backoff)
-                    wait_time = backoff + jitter
-                    print(f"  Timeout for player {player_id} (attempt {attempt}/{NBADataFetcher.MAX_RETRIES}), retrying in {wait_time:.1f}s...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"  Failed to fetch game log for player {player_id} after {NBADataFetcher.MAX_RETRIES} attempts")
-                    return []
-            except Exception as e:
-                print(f"  Error fetching game log for player {player_id}: {e}")
-                return []
+        try:
+            game_log = playergamelog.PlayerGameLog(
+                player_id=player_id,
+                season=season,
+                timeout=NBADataFetcher.TIMEOUT
+            )
+            games_data = game_log.get_data_frames()[0]
+            return games_data.to_dict('records')
+        except RETRY_EXCEPTIONS:
+            print(f"  Failed to fetch game log for player {player_id} after {NBADataFetcher.MAX_RETRIES} attempts")
+            return None
+        except Exception as e:
+            print(f"  Error fetching game log for player {player_id}: {e}")
+            return None
+    
+    @staticmethod
+    def get_league_game_log(game_date: str, season: int = CURRENT_SEASON) -> Optional[List[Dict]]:
+        """
+        Get every player's box-score line for one date in a single request.
+        
+        Args:
+            game_date: Date in format 'YYYY-MM-DD'
+            season: NBA season year (start year, e.g. 2025 for 2025-26)
+            
+        Returns:
+            List of player game lines (PLAYER_ID, GAME_ID, GAME_DATE, PTS, ...),
+            or None if the request failed
+        """
+        date_parts = game_date.split('-')
+        formatted_date = f"{date_parts[1]}/{date_parts[2]}/{date_parts[0]}"
+        season_str = f"{season}-{str(season + 1)[-2:]}"
+        
+        try:
+            game_log = leaguegamelog.LeagueGameLog(
+                player_or_team_abbreviation='P',
+                season=season_str,
+                date_from_nullable=formatted_date,
+                date_to_nullable=formatted_date,
+                timeout=NBADataFetcher.TIMEOUT
+            )
+            games_data = game_log.get_data_frames()[0]
+            return games_data.to_dict('records')
+        except RETRY_EXCEPTIONS:
+            print(f"  Failed to fetch league game log for {game_date} after {NBADataFetcher.MAX_RETRIES} attempts")
+            return None
+        except Exception as e:
+            print(f"  Error fetching league game log for {game_date}: {e}")
+            return None
     
     @staticmethod
     def get_team_game_log(team_id: int, season: int = CURRENT_SEASON) -> List[Dict]:
@@ -121,26 +238,20 @@ class NBADataFetcher:
         Returns:
             List of games for the team
         """
-        for attempt in range(NBADataFetcher.MAX_RETRIES):
-            try:
-                game_log = teamgamelog.TeamGameLog(
-                    team_id=team_id,
-                    season=season,
-                    timeout=NBADataFetcher.TIMEOUT
-                )
-                games_data = game_log.get_data_frames()[0]
-                return games_data.to_dict('records')
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                if attempt < NBADataFetcher.MAX_RETRIES - 1:
-                    wait_time = NBADataFetcher.RETRY_DELAY * (2 ** attempt)
-                    print(f"  Timeout for team {team_id} (attempt {attempt+1}/{NBADataFetcher.MAX_RETRIES}), retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"  Failed to fetch team game log for team {team_id} after {NBADataFetcher.MAX_RETRIES} attempts")
-                    return []
-            except Exception as e:
-                print(f"  Error fetching team game log for team {team_id}: {e}")
-                return []
+        try:
+            game_log = teamgamelog.TeamGameLog(
+                team_id=team_id,
+                season=season,
+                timeout=NBADataFetcher.TIMEOUT
+            )
+            games_data = game_log.get_data_frames()[0]
+            return games_data.to_dict('records')
+        except RETRY_EXCEPTIONS:
+            print(f"  Failed to fetch team game log for team {team_id} after {NBADataFetcher.MAX_RETRIES} attempts")
+            return []
+        except Exception as e:
+            print(f"  Error fetching team game log for team {team_id}: {e}")
+            return []
     
     @staticmethod
     def get_scoreboard(game_date: str) -> List[Dict]:
@@ -157,33 +268,21 @@ class NBADataFetcher:
         date_parts = game_date.split('-')
         formatted_date = date_parts[1] + date_parts[2] + date_parts[0]
 
-        for attempt in range(1, NBADataFetcher.MAX_RETRIES + 1):
+        try:
+            board = scoreboardv2.ScoreboardV2(game_date=formatted_date, timeout=NBADataFetcher.TIMEOUT)
+            games_data = board.get_data_frames()[0]
+            return games_data.to_dict('records')
+        except RETRY_EXCEPTIONS as e:
+            print(f"  Failed to fetch scoreboard for {game_date} after {NBADataFetcher.MAX_RETRIES} attempts: {e}")
+            return []
+        except Exception as e:
+            # Log error detail; sometimes nba_api returns invalid/non-JSON responses
             try:
-                board = scoreboardv2.ScoreboardV2(game_date=formatted_date, timeout=NBADataFetcher.TIMEOUT)
-                games_data = board.get_data_frames()[0]
-                # small polite pause
-                time.sleep(0.2)
-                return games_data.to_dict('records')
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                if attempt < NBADataFetcher.MAX_RETRIES:
-                    backoff = NBADataFetcher.RETRY_DELAY * (2 ** (attempt - 1))
-                    jitter = random.uniform(0, 0.5 * backoff)
-                    wait = backoff + jitter
-                    print(f"  Timeout fetching scoreboard for {game_date} (attempt {attempt}/{NBADataFetcher.MAX_RETRIES}), retrying in {wait:.1f}s...")
-                    time.sleep(wait)
-                    continue
-                else:
-                    print(f"  Failed to fetch scoreboard for {game_date} after {NBADataFetcher.MAX_RETRIES} attempts: {e}")
-                    return []
-            except Exception as e:
-                # Log error detail; sometimes nba_api returns invalid/non-JSON responses
-                try:
-                    err_text = str(e)
-                except Exception:
-                    err_text = repr(e)
-                print(f"Error fetching scoreboard for {game_date}: {err_text}")
-                # Don't spam rapid retries for non-network errors; break after logging
-                return []
+                err_text = str(e)
+            except Exception:
+                err_text = repr(e)
+            print(f"Error fetching scoreboard for {game_date}: {err_text}")
+            return []
     
     @staticmethod
     def get_player_info(player_name: str) -> Optional[Dict]:
@@ -206,6 +305,69 @@ class NBADataFetcher:
             print(f"Error fetching player info for {player_name}: {e}")
             return None
     
+    @staticmethod
+    def get_active_players(max_age: Optional[float] = None) -> List[Dict]:
+        """
+        Get players currently on an NBA roster (~500 instead of ~5000 all-time).
+        
+        Resolved from the 30 team rosters and cached in memory and on disk for
+        ACTIVE_PLAYERS_TTL seconds. Falls back to nba_api's static active list
+        if the rosters cannot be fetched.
+        
+        Args:
+            max_age: Maximum cache age in seconds (defaults to ACTIVE_PLAYERS_TTL)
+            
+        Returns:
+            Player dictionaries with id, full_name, team_id, position and jersey
+        """
+        if max_age is None:
+            max_age = NBADataFetcher.ACTIVE_PLAYERS_TTL
+        now = time.time()
+        if NBADataFetcher._active_players is not None and now - NBADataFetcher._active_players_fetched <= max_age:
+            return NBADataFetcher._active_players
+        
+        cache_file = NBADataFetcher.CACHE_DIR / 'active_players.json'
+        try:
+            cached = json.loads(cache_file.read_text())
+            if now - cached['fetched_at'] <= max_age:
+                NBADataFetcher._active_players = cached['players']
+                NBADataFetcher._active_players_fetched = cached['fetched_at']
+                return cached['players']
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        team_ids = [team['id'] for team in NBADataFetcher.get_all_teams()]
+        active = {}
+        teams_resolved = 0
+        with ThreadPoolExecutor(max_workers=NBADataFetcher.FETCH_WORKERS) as pool:
+            for team_id, roster in zip(team_ids, pool.map(NBADataFetcher.get_team_roster, team_ids)):
+                if roster:
+                    teams_resolved += 1
+                for row in roster:
+                    player_id = int(row.get('PLAYER_ID'))
+                    active[player_id] = {
+                        'id': player_id,
+                        'full_name': row.get('PLAYER'),
+                        'team_id': team_id,
+                        'position': row.get('POSITION'),
+                        'jersey': row.get('NUM'),
+                    }
+        
+        if teams_resolved < len(team_ids):
+            # Partial rosters would drop whole teams; use the static list and retry next run
+            print(f"  Only {teams_resolved}/{len(team_ids)} rosters fetched, using static active player list")
+            return players.get_active_players()
+        
+        result = list(active.values())
+        NBADataFetcher._active_players = result
+        NBADataFetcher._active_players_fetched = now
+        try:
+            NBADataFetcher.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps({'fetched_at': now, 'players': result}))
+        except OSError as e:
+            print(f"  Could not write active player cache: {e}")
+        return result
+    
     @staticmethod
     def get_all_players() -> List[Dict]:
         """
@@ -222,6 +384,10 @@ class NBADataFetcher:
             return []
 
 
+# Route nba_api's endpoints through the shared caching session
+NBAStatsHTTP.set_session(NBADataFetcher.session)
+
+
 def test_data_fetcher():
     """Test the data fetcher with a simple query."""
     print("Fetching all NBA teams...")
@@ -8,6 +8,10 @@ import re
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+from app.database import bump_data_generation
+from app.gamedays import refresh_derived_deadlines, refresh_game_gamedays
+from app.gameweeks import GameweekIndex
+
 ICS_FILE = '/home/velasvalen17/myproject/NBA_fef0d03794cfba3c7eea9c9503e4ab755cd015e32e9ca713d1911fde78b0d3cf@group.calendar.google.com.ics'
 DB_PATH = '/home/velasvalen17/myproject/nba_fantasy.db'
 
@@ -82,6 +86,7 @@ def update_database(games):
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
+    gameweeks = GameweekIndex.load(conn)
     
     updated_count = 0
     not_found_count = 0
@@ -101,14 +106,17 @@ def update_database(games):
         date_start = (search_date - timedelta(days=1)).strftime('%Y-%m-%d')
         date_end = (search_date + timedelta(days=1)).strftime('%Y-%m-%d')
         
+        # Keep gameweek_id in step with the corrected date; a game moved across
+        # midnight in Madrid time can land in the next gameweek
         cur.execute("""
             UPDATE games 
-            SET game_date = ?, game_time = ?
+            SET game_date = ?, game_time = ?, gameweek_id = COALESCE(?, gameweek_id)
             WHERE away_team_id = ? AND home_team_id = ?
               AND game_date BETWEEN ? AND ?
         """, (
             game['date'], 
             game['time'],
+            gameweeks.lookup(game['date']),
             away_id,
             home_id,
             date_start,
@@ -122,6 +130,10 @@ def update_database(games):
             not_found_count += 1
             print(f"⚠️  No match: {game['away_team']} @ {game['home_team']} - {game['date']} {game['time']}")
     
+    # Moved tip-offs can change the computed deadlines and which fantasy gameday a game belongs to
+    refresh_derived_deadlines(cur)
+    refresh_game_gamedays(cur)
+    bump_data_generation(cur)
     conn.commit()
     conn.close()
     
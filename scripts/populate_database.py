@@ -4,15 +4,18 @@ Populates the local database with current season NBA data.
 Supports incremental updates - only fetches new data on subsequent runs.
 """
 
+import asyncio
 import sqlite3
-from app.database import init_database, get_connection, DB_PATH
+from concurrent.futures import ThreadPoolExecutor
+from app.database import (init_database, get_connection, migrate, refresh_player_fantasy_summary,
+                          bump_data_generation, DB_PATH)
 from nba_data_fetcher import NBADataFetcher
 from app.fantasy_calculator import FantasyCalculator
+from app.gamedays import refresh_derived_deadlines, refresh_game_gamedays
+from app.gameweeks import GameweekIndex
 from datetime import datetime, timedelta
 import time
-from typing import Optional, List, Dict
-import requests
-import random
+from typing import Optional, List, Dict, Tuple
 
 
 class DatabasePopulator:
@@ -42,6 +45,18 @@ class DatabasePopulator:
         finally:
             conn.close()
     
+    @staticmethod
+    def invalidate_api_cache():
+        """Bump the data generation so the web app stops serving cached responses."""
+        try:
+            conn = get_connection()
+            generation = bump_data_generation(conn.cursor())
+            conn.commit()
+            conn.close()
+            print(f"✓ API cache generation is now {generation}")
+        except Exception as e:
+            print(f"Warning: Could not bump API cache generation: {e}")
+    
     @staticmethod
     def get_today() -> str:
         """Get today's date in YYYY-MM-DD format."""
@@ -77,23 +92,34 @@ class DatabasePopulator:
     
     @staticmethod
     def populate_players():
-        """Fetch and store all NBA players with their team assignments."""
+        """Fetch and store current roster players with their team assignments."""
         print("Populating players...")
         conn = get_connection()
         cursor = conn.cursor()
         
-        # Get all players
-        all_players = NBADataFetcher.get_all_players()
+        # Only players on a current roster; the all-time list is ~10x larger
+        all_players = NBADataFetcher.get_active_players()
         
+        skipped = 0
         for player in all_players:
             try:
                 # Get team for this player
                 team_id = player.get('team_id')
+                if team_id is None:
+                    # The static fallback list has no teams; players.team_id is NOT NULL,
+                    # so leave these (and any stored assignment) for the next roster fetch
+                    skipped += 1
+                    continue
                 
+                # Keep salaries and bio fields; refresh the roster assignment
                 cursor.execute("""
-                    INSERT OR IGNORE INTO players 
+                    INSERT INTO players 
                     (player_id, player_name, team_id, position, jersey_number, height, weight, college, country, draft_year)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(player_id) DO UPDATE SET
+                        team_id = COALESCE(excluded.team_id, players.team_id),
+                        position = COALESCE(excluded.position, players.position),
+                        jersey_number = COALESCE(excluded.jersey_number, players.jersey_number)
                 """, (
                     player.get('id'),
                     player.get('full_name'),
@@ -111,7 +137,9 @@ class DatabasePopulator:
         
         conn.commit()
         conn.close()
-        print(f"✓ Players populated: {len(all_players)} players")
+        print(f"✓ Players populated: {len(all_players) - skipped} players")
+        if skipped:
+            print(f"  Skipped {skipped} players without a team")
     
     @staticmethod
     def create_gameweeks():
@@ -159,41 +187,25 @@ class DatabasePopulator:
 
         conn = get_connection()
         cursor = conn.cursor()
+        gameweeks = GameweekIndex.load(conn)
 
         cur_date = from_date
         total = 0
         print(f"Populating games from {from_date.strftime('%Y-%m-%d')} to {to_date.strftime('%Y-%m-%d')}...")
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.nba.com/',
-            'Origin': 'https://www.nba.com',
-        }
-
         while cur_date <= to_date:
             game_date_str = cur_date.strftime('%Y-%m-%d')
             mmddyyyy = cur_date.strftime('%m/%d/%Y')
             url = f'https://stats.nba.com/stats/scoreboardv2?GameDate={mmddyyyy}&LeagueID=00'
 
+            # The shared session supplies the stats.nba.com headers and retries
             data = None
-            for attempt in range(1, NBADataFetcher.MAX_RETRIES + 1):
-                try:
-                    r = requests.get(url, headers=headers, timeout=NBADataFetcher.TIMEOUT)
-                    r.raise_for_status()
-                    data = r.json()
-                    break
-                except Exception as e:
-                    if attempt < NBADataFetcher.MAX_RETRIES:
-                        backoff = NBADataFetcher.RETRY_DELAY * (2 ** (attempt - 1))
-                        jitter = random.uniform(0, 0.5 * backoff)
-                        wait = backoff + jitter
-                        print(f"  Scoreboard fetch failed for {game_date_str} (attempt {attempt}), retrying in {wait:.1f}s...")
-                        time.sleep(wait)
-                        continue
-                    else:
-                        print(f"  Failed to fetch scoreboard for {game_date_str}: {e}")
+            try:
+                r = NBADataFetcher.session.get(url, timeout=NBADataFetcher.TIMEOUT)
+                r.raise_for_status()
+                data = r.json()
+            except Exception as e:
+                print(f"  Failed to fetch scoreboard for {game_date_str}: {e}")
 
             if not data:
                 cur_date = cur_date + timedelta(days=1)
@@ -240,9 +252,7 @@ class DatabasePopulator:
                     home_score = score_lookup.get(home_team)
                     away_score = score_lookup.get(away_team)
 
-                    cursor.execute("SELECT gameweek_id FROM gameweeks WHERE start_date <= ? AND end_date >= ? LIMIT 1", (game_date_iso, game_date_iso))
-                    gw = cursor.fetchone()
-                    gameweek_id = gw[0] if gw else 0
+                    gameweek_id = gameweeks.lookup(game_date_iso) or 0
 
                     cursor.execute("INSERT OR IGNORE INTO games (game_id, gameweek_id, game_date, season_year, home_team_id, away_team_id, home_team_score, away_team_score, game_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (
                         game_id,
@@ -269,8 +279,302 @@ class DatabasePopulator:
 
             cur_date = cur_date + timedelta(days=1)
 
+        refresh_derived_deadlines(cursor)
+        assigned = refresh_game_gamedays(cursor)
+        conn.commit()
         conn.close()
-        print(f"✓ Games populated: {total} new games")
+        print(f"✓ Games populated: {total} new games ({assigned} assigned to fantasy gamedays)")
+    
+    # Rows written per executemany/commit when ingesting game logs
+    STAT_BATCH_SIZE = 2000
+    
+    # Insert for one player_game_stats row; rows already stored are skipped
+    STAT_INSERT_SQL = """
+        INSERT OR IGNORE INTO player_game_stats 
+        (player_id, game_id, nba_game_id, game_date, points, rebounds, assists, blocks, steals, 
+         fantasy_points, minutes_played, field_goals_made, field_goals_attempted,
+         three_pointers_made, three_pointers_attempted, free_throws_made, 
+         free_throws_attempted, turnovers, personal_fouls, plus_minus)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    @staticmethod
+    def _parse_date(date_value):
+        """Parse a variety of date string formats into a datetime."""
+        if isinstance(date_value, datetime):
+            return date_value
+        s = str(date_value).strip()
+        # Try common formats
+        for fmt in ('%Y-%m-%d', '%b %d, %Y', '%B %d, %Y', '%m/%d/%Y'):
+            try:
+                return datetime.strptime(s, fmt)
+            except Exception:
+                pass
+        # Try title-cased month (handles all-caps like 'NOV 11, 2025')
+        try:
+            return datetime.strptime(s.title(), '%b %d, %Y')
+        except Exception:
+            pass
+        # Give a clear error for unexpected formats
+        raise ValueError(f"Unknown date format: {s}")
+    
+    @staticmethod
+    def _stat_row(player_id: int, nba_game_id: str, game_date_iso: str, game: Dict,
+                  fantasy_points: Optional[float] = None) -> tuple:
+        """
+        Build the STAT_INSERT_SQL parameters for one box-score line.
+        
+        Args:
+            player_id: NBA player ID
+            nba_game_id: NBA game ID
+            game_date_iso: Game date as 'YYYY-MM-DD'
+            game: Box-score line from playergamelog or leaguegamelog
+            fantasy_points: Score from FantasyCalculator.score_batch (computed here if omitted)
+            
+        Returns:
+            Tuple of column values
+        """
+        points = int(game.get('PTS', 0) or 0)
+        rebounds = int(game.get('REB', 0) or 0)
+        assists = int(game.get('AST', 0) or 0)
+        blocks = int(game.get('BLK', 0) or 0)
+        steals = int(game.get('STL', 0) or 0)
+        
+        # Calculate fantasy points
+        if fantasy_points is None:
+            fantasy_points = FantasyCalculator.calculate_fantasy_points(
+                points=points,
+                rebounds=rebounds,
+                assists=assists,
+                blocks=blocks,
+                steals=steals
+            )
+        
+        return (
+            player_id,
+            f"{nba_game_id}_{player_id}",
+            nba_game_id,
+            game_date_iso,
+            points,
+            rebounds,
+            assists,
+            blocks,
+            steals,
+            fantasy_points,
+            float(game.get('MIN', 0) or 0),
+            int(game.get('FGM', 0) or 0),
+            int(game.get('FGA', 0) or 0),
+            int(game.get('FG3M', 0) or 0),
+            int(game.get('FG3A', 0) or 0),
+            int(game.get('FTM', 0) or 0),
+            int(game.get('FTA', 0) or 0),
+            int(game.get('TOV', 0) or 0),
+            int(game.get('PF', 0) or 0),
+            int(game.get('PLUS_MINUS', 0) or 0)
+        )
+    
+    @staticmethod
+    def _write_stat_batch(cursor, rows: List[tuple]) -> int:
+        """
+        Insert STAT_INSERT_SQL rows with one executemany and update the aggregates.
+        
+        Refreshes player_fantasy_summary for the affected players and
+        player_gameweek_stats for the new rows. Does not commit.
+        
+        Args:
+            cursor: Cursor on the ingest connection
+            rows: Tuples built by _stat_row
+            
+        Returns:
+            Number of rows actually inserted
+        """
+        if not rows:
+            return 0
+        # stat_id is AUTOINCREMENT, so new rows are exactly those above the old maximum
+        cursor.execute("SELECT COALESCE(MAX(stat_id), 0) FROM player_game_stats")
+        last_stat_id = cursor.fetchone()[0]
+        cursor.executemany(DatabasePopulator.STAT_INSERT_SQL, rows)
+        cursor.execute("SELECT stat_id, player_id FROM player_game_stats WHERE stat_id > ?",
+                       (last_stat_id,))
+        new_rows = cursor.fetchall()
+        if new_rows:
+            refresh_player_fantasy_summary(cursor, sorted({row[1] for row in new_rows}))
+            DatabasePopulator.update_gameweek_stats(cursor, [row[0] for row in new_rows])
+        return len(new_rows)
+    
+    @staticmethod
+    def _commit_stat_batch(conn, rows: List[tuple], job: Optional[tuple] = None,
+                           completed: Optional[List[tuple]] = None) -> int:
+        """
+        Write a batch with _write_stat_batch in its own transaction.
+        
+        Checkpoints for the work items the batch finishes are written in the same
+        transaction, so an item is never marked done without its stats.
+        
+        Args:
+            conn: Ingest connection
+            rows: Tuples built by _stat_row
+            job: (job, from_date, to_date) key from _start_job
+            completed: (item, stat_rows) pairs for the items finished by this batch
+            
+        Returns:
+            Number of rows actually inserted
+        """
+        try:
+            cursor = conn.cursor()
+            written = DatabasePopulator._write_stat_batch(cursor, rows)
+            if job and completed:
+                cursor.executemany("""
+                    UPDATE ingest_progress SET stat_rows = ?, completed_at = datetime('now')
+                    WHERE job = ? AND from_date = ? AND to_date = ? AND item = ?
+                """, [(stat_rows, *job, item) for item, stat_rows in completed])
+            conn.commit()
+            return written
+        except Exception as e:
+            conn.rollback()
+            print(f"  Error storing batch of {len(rows)} stat rows: {e}")
+            return 0
+    
+    @staticmethod
+    def _start_job(conn, job: str, from_date: str, to_date: str, items: List[str]) -> tuple:
+        """
+        Record the work items of an ingest job and find the ones still to do.
+        
+        Items already recorded for the same job and window keep their state, so
+        re-running an interrupted job only repeats the unfinished items.
+        
+        Args:
+            conn: Ingest connection
+            job: Job name ('player_stats' or 'player_stats_bulk')
+            from_date: Window start as 'YYYY-MM-DD'
+            to_date: Window end as 'YYYY-MM-DD'
+            items: Player IDs or dates making up the job
+            
+        Returns:
+            ((job, from_date, to_date) key, set of pending items)
+        """
+        key = (job, from_date, to_date)
+        conn.executemany("""
+            INSERT OR IGNORE INTO ingest_progress (job, from_date, to_date, item)
+            VALUES (?, ?, ?, ?)
+        """, [(*key, item) for item in items])
+        conn.commit()
+        pending = {row[0] for row in conn.execute("""
+            SELECT item FROM ingest_progress
+            WHERE job = ? AND from_date = ? AND to_date = ? AND completed_at IS NULL
+        """, key)}
+        return key, pending
+    
+    @staticmethod
+    def _finish_job(conn, key: tuple) -> int:
+        """
+        Drop a job's checkpoints once every item is done.
+        
+        Returns:
+            Number of items still pending (their checkpoints are kept for --resume)
+        """
+        pending = conn.execute("""
+            SELECT COUNT(*) FROM ingest_progress
+            WHERE job = ? AND from_date = ? AND to_date = ? AND completed_at IS NULL
+        """, key).fetchone()[0]
+        if not pending:
+            conn.execute("DELETE FROM ingest_progress WHERE job = ? AND from_date = ? AND to_date = ?", key)
+            conn.commit()
+        return pending
+    
+    # Parsed items allowed to wait for the writer before the parse stage blocks
+    PIPELINE_QUEUE_SIZE = 64
+    
+    @staticmethod
+    async def _run_stat_pipeline(items: List, fetch, parse, job: tuple, label: str) -> Tuple[int, int]:
+        """
+        Stream work items through fetch -> parse -> write stages.
+        
+        Up to FETCH_WORKERS fetches run at once in worker threads, a single parse
+        stage turns responses into _stat_row tuples on the event loop, and a
+        single writer thread owns the SQLite connection and commits
+        STAT_BATCH_SIZE rows at a time with the matching checkpoints. Bounded
+        queues between the stages apply backpressure, so fetching, parsing and
+        disk writes overlap without buffering the whole backfill in memory.
+        
+        Args:
+            items: Player IDs or dates to load (the job's pending items)
+            fetch: item -> box-score lines, or None if the request failed (blocking)
+            parse: (item, lines) -> list of _stat_row tuples
+            job: (job, from_date, to_date) checkpoint key from _start_job
+            label: Item name for progress messages ('player' or 'date')
+            
+        Returns:
+            (new rows written, items whose fetch failed)
+        """
+        loop = asyncio.get_running_loop()
+        workers = NBADataFetcher.FETCH_WORKERS
+        todo = iter(items)
+        fetched = asyncio.Queue(maxsize=2 * workers)
+        parsed = asyncio.Queue(maxsize=DatabasePopulator.PIPELINE_QUEUE_SIZE)
+        counts = {'written': 0, 'failed': 0}
+        start_time = time.perf_counter()
+        
+        async def fetch_stage():
+            for item in todo:
+                lines = await asyncio.to_thread(fetch, item)
+                await fetched.put((item, lines))
+        
+        async def fetchers():
+            async with asyncio.TaskGroup() as group:
+                for _ in range(workers):
+                    group.create_task(fetch_stage())
+            await fetched.put(None)
+        
+        async def parse_stage():
+            done = 0
+            while (entry := await fetched.get()) is not None:
+                item, lines = entry
+                if done % 50 == 0:
+                    print(f"  Processing {label} {done + 1}/{len(items)}...")
+                done += 1
+                # Failed fetches stay pending so --resume retries them
+                if lines is None:
+                    counts['failed'] += 1
+                    continue
+                await parsed.put((item, parse(item, lines)))
+            await parsed.put(None)
+        
+        async def write_batches(writer, conn):
+            batch = []
+            completed = []
+            while True:
+                entry = await parsed.get()
+                if entry is not None:
+                    item, rows = entry
+                    batch.extend(rows)
+                    completed.append((str(item), len(rows)))
+                    if len(batch) < DatabasePopulator.STAT_BATCH_SIZE:
+                        continue
+                counts['written'] += await loop.run_in_executor(
+                    writer, DatabasePopulator._commit_stat_batch, conn, batch, job, completed)
+                batch = []
+                completed = []
+                if entry is None:
+                    break
+                elapsed = time.perf_counter() - start_time
+                print(f"  Committed batch (total new records: {counts['written']}, "
+                      f"{counts['written'] / elapsed:.0f} rows/sec)")
+        
+        async def write_stage():
+            # SQLite connections belong to the thread that opened them
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                conn = await loop.run_in_executor(writer, get_connection)
+                try:
+                    await write_batches(writer, conn)
+                finally:
+                    writer.submit(conn.close)
+        
+        async with asyncio.TaskGroup() as group:
+            group.create_task(fetchers())
+            group.create_task(parse_stage())
+            group.create_task(write_stage())
+        return counts['written'], counts['failed']
     
     @staticmethod
     def populate_player_stats(from_date: datetime = None, to_date: datetime = None, players_list: Optional[List[Dict]] = None):
@@ -286,6 +590,10 @@ class DatabasePopulator:
         
         if to_date is None:
             to_date = datetime.now().date()
+        if isinstance(from_date, datetime):
+            from_date = from_date.date()
+        if isinstance(to_date, datetime):
+            to_date = to_date.date()
         
         # Only fetch up to today, not future dates
         today = datetime.now().date()
@@ -298,133 +606,287 @@ class DatabasePopulator:
         conn = get_connection()
         cursor = conn.cursor()
         
-        # Get all players (or use provided subset)
+        # Get active players (or use provided subset)
         if players_list is None:
-            all_players = NBADataFetcher.get_all_players()
+            all_players = NBADataFetcher.get_active_players()
         else:
             all_players = players_list
-        total_stats = 0
-        
-        def _parse_date(date_value):
-            """Parse a variety of date string formats into a datetime."""
-            if isinstance(date_value, datetime):
-                return date_value
-            s = str(date_value).strip()
-            # Try common formats
-            for fmt in ('%Y-%m-%d', '%b %d, %Y', '%B %d, %Y', '%m/%d/%Y'):
-                try:
-                    return datetime.strptime(s, fmt)
-                except Exception:
-                    pass
-            # Try title-cased month (handles all-caps like 'NOV 11, 2025')
-            try:
-                return datetime.strptime(s.title(), '%b %d, %Y')
-            except Exception:
-                pass
-            # Give a clear error for unexpected formats
-            raise ValueError(f"Unknown date format: {s}")
-
-        for idx, player in enumerate(all_players):
-            if idx % 50 == 0:
-                print(f"  Processing player {idx+1}/{len(all_players)}...")
-            
-            # Handle both dict and int formats
-            player_id = player.get('id') if isinstance(player, dict) else player
-            
-            # Fetch game log for this player
-            game_log = NBADataFetcher.get_player_game_log(player_id, DatabasePopulator.SEASON_YEAR)
-            
-            for game in game_log:
+        
+        # Games already stored in the window, loaded once instead of a lookup per row
+        cursor.execute("""
+            SELECT player_id, game_date FROM player_game_stats
+            WHERE game_date >= ? AND game_date <= ?
+        """, (from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d')))
+        existing = set(cursor.fetchall())
+        
+        # Handle both dict and int formats
+        player_ids = [player.get('id') if isinstance(player, dict) else player for player in all_players]
+        
+        # Checkpoint every player; players finished by an earlier, interrupted run
+        # over the same window are skipped
+        job, pending = DatabasePopulator._start_job(
+            conn, 'player_stats', from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d'),
+            [str(player_id) for player_id in player_ids])
+        conn.close()
+        if len(pending) < len(player_ids):
+            print(f"  Resuming: {len(player_ids) - len(pending)} of {len(player_ids)} players already done")
+            player_ids = [player_id for player_id in player_ids if str(player_id) in pending]
+        
+        def fetch(player_id):
+            return NBADataFetcher.get_player_game_log(player_id, DatabasePopulator.SEASON_YEAR)
+        
+        def parse(player_id, game_log):
+            # Whole game log is scored in one vectorized call
+            fantasy_points, _ = FantasyCalculator.score_batch(game_log)
+            rows = []
+            for game, game_fp in zip(game_log, fantasy_points.tolist()):
                 try:
                     game_date_str = game.get('GAME_DATE', datetime.now().strftime('%Y-%m-%d'))
                     # Parse into datetime, then normalise to ISO string for DB
-                    game_date_dt = _parse_date(game_date_str)
+                    game_date_dt = DatabasePopulator._parse_date(game_date_str)
                     game_date = game_date_dt.date() if isinstance(game_date_dt, datetime) else game_date_dt
                     game_date_iso = game_date.strftime('%Y-%m-%d') if hasattr(game_date, 'strftime') else str(game_date)
                     
                     # Only insert if game date is within our range and not in future
                     if from_date <= game_date <= to_date:
-                        # Check if we already have this game data
-                        game_id = f"{game.get('Game_ID', '')}_{player_id}"
-                        cursor.execute("SELECT stat_id FROM player_game_stats WHERE player_id = ? AND game_date = ?", 
-                                     (player_id, game_date_iso))
-                        if cursor.fetchone():
-                            continue  # Skip if already in database
-                        
-                        # Calculate fantasy points
-                        points = game.get('PTS', 0) or 0
-                        rebounds = game.get('REB', 0) or 0
-                        assists = game.get('AST', 0) or 0
-                        blocks = game.get('BLK', 0) or 0
-                        steals = game.get('STL', 0) or 0
-                        
-                        fantasy_points = FantasyCalculator.calculate_fantasy_points(
-                            points=int(points),
-                            rebounds=int(rebounds),
-                            assists=int(assists),
-                            blocks=int(blocks),
-                            steals=int(steals)
-                        )
-                        
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO player_game_stats 
-                            (player_id, game_id, game_date, points, rebounds, assists, blocks, steals, 
-                             fantasy_points, minutes_played, field_goals_made, field_goals_attempted,
-                             three_pointers_made, three_pointers_attempted, free_throws_made, 
-                             free_throws_attempted, turnovers, personal_fouls, plus_minus)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            player_id,
-                            game_id,
-                            game_date_iso,
-                            int(points),
-                            int(rebounds),
-                            int(assists),
-                            int(blocks),
-                            int(steals),
-                            fantasy_points,
-                            float(game.get('MIN', 0) or 0),
-                            int(game.get('FGM', 0) or 0),
-                            int(game.get('FGA', 0) or 0),
-                            int(game.get('FG3M', 0) or 0),
-                            int(game.get('FG3A', 0) or 0),
-                            int(game.get('FTM', 0) or 0),
-                            int(game.get('FTA', 0) or 0),
-                            int(game.get('TOV', 0) or 0),
-                            int(game.get('PF', 0) or 0),
-                            int(game.get('PLUS_MINUS', 0) or 0)
-                        ))
-                        total_stats += 1
+                        # Skip games we already have
+                        key = (player_id, game_date_iso)
+                        if key in existing:
+                            continue
+                        existing.add(key)
+                        rows.append(DatabasePopulator._stat_row(
+                            player_id, game.get('Game_ID', ''), game_date_iso, game, game_fp))
                     
                 except Exception as e:
-                    print(f"  Error inserting stats for player {player_id}: {e}")
+                    print(f"  Error parsing stats for player {player_id}: {e}")
+            return rows
+        
+        start_time = time.perf_counter()
+        total_stats, failed = asyncio.run(
+            DatabasePopulator._run_stat_pipeline(player_ids, fetch, parse, job, 'player'))
+        conn = get_connection()
+        remaining = DatabasePopulator._finish_job(conn, job)
+        conn.close()
+        elapsed = time.perf_counter() - start_time
+        rate = total_stats / elapsed if elapsed > 0 else 0
+        print(f"✓ Player stats populated: {total_stats} new game records in {elapsed:.1f}s ({rate:.0f} rows/sec)")
+        if remaining:
+            print(f"⚠️  {remaining} players not fetched ({failed} failed this run); run with --resume to retry them")
+    
+    @staticmethod
+    def populate_player_stats_bulk(from_date: datetime = None, to_date: datetime = None):
+        """
+        Fetch and store player game statistics with one league-wide request per date.
+        
+        Pulls every player's box-score line for a date from leaguegamelog and writes
+        them with executemany batches, instead of one game-log request per player.
+        
+        Args:
+            from_date: Start date for fetching stats (defaults to last update or season start)
+            to_date: End date for fetching stats (defaults to today)
+        """
+        if from_date is None:
+            from_date = DatabasePopulator.get_last_update_date()
+        if to_date is None:
+            to_date = datetime.now().date()
+        if isinstance(from_date, datetime):
+            from_date = from_date.date()
+        if isinstance(to_date, datetime):
+            to_date = to_date.date()
+        
+        # Only fetch up to today, not future dates
+        today = datetime.now().date()
+        if to_date > today:
+            to_date = today
+        
+        print(f"Bulk-loading player game statistics from {from_date.strftime('%Y-%m-%d')} to {to_date.strftime('%Y-%m-%d')}...")
+        
+        conn = get_connection()
+        dates = [(from_date + timedelta(days=n)).strftime('%Y-%m-%d')
+                 for n in range((to_date - from_date).days + 1)]
+        # Checkpoint every date; dates finished by an earlier, interrupted run
+        # over the same window are skipped
+        job, pending = DatabasePopulator._start_job(
+            conn, 'player_stats_bulk', from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d'), dates)
+        conn.close()
+        if len(pending) < len(dates):
+            print(f"  Resuming: {len(dates) - len(pending)} of {len(dates)} dates already done")
+        dates = [game_date_iso for game_date_iso in dates if game_date_iso in pending]
+        
+        def fetch(game_date_iso):
+            return NBADataFetcher.get_league_game_log(game_date_iso, DatabasePopulator.SEASON_YEAR)
+        
+        def parse(game_date_iso, lines):
+            # Every line for the date is scored in one vectorized call
+            fantasy_points, _ = FantasyCalculator.score_batch(lines)
+            rows = []
+            for game, game_fp in zip(lines, fantasy_points.tolist()):
+                try:
+                    line_date = DatabasePopulator._parse_date(game.get('GAME_DATE', game_date_iso))
+                    rows.append(DatabasePopulator._stat_row(
+                        int(game['PLAYER_ID']), str(game.get('GAME_ID', '')),
+                        line_date.strftime('%Y-%m-%d'), game, game_fp))
+                except Exception as e:
+                    print(f"  Error parsing line for player {game.get('PLAYER_ID')}: {e}")
+            if rows:
+                print(f"  {game_date_iso}: {len(rows)} lines")
+            return rows
+        
+        total_stats, failed = asyncio.run(
+            DatabasePopulator._run_stat_pipeline(dates, fetch, parse, job, 'date'))
+        conn = get_connection()
+        remaining = DatabasePopulator._finish_job(conn, job)
+        conn.close()
+        print(f"✓ Player stats populated: {total_stats} new game records from {len(dates)} requests")
+        if remaining:
+            print(f"⚠️  {remaining} dates not fetched; run with --resume to retry them")
+    
+    @staticmethod
+    def resume_ingest() -> bool:
+        """
+        Continue the most recent stat ingest job that did not finish.
+        
+        Only the players or dates still pending in ingest_progress are fetched,
+        over the job's original date window.
+        
+        Returns:
+            True if a job was resumed, False if there was nothing to resume
+        """
+        conn = get_connection()
+        job = conn.execute("""
+            SELECT job, from_date, to_date, COUNT(*) FROM ingest_progress
+            WHERE completed_at IS NULL
+            GROUP BY job, from_date, to_date
+            ORDER BY MAX(created_at) DESC
+            LIMIT 1
+        """).fetchone()
+        if job is None:
+            conn.close()
+            print("✓ No interrupted ingest job to resume")
+            return False
+        
+        name, from_iso, to_iso, pending = job
+        from_date = datetime.strptime(from_iso, '%Y-%m-%d').date()
+        to_date = datetime.strptime(to_iso, '%Y-%m-%d').date()
+        print(f"Resuming {name} job for {from_iso} to {to_iso}: {pending} items left\n")
+        try:
+            if name == 'player_stats_bulk':
+                conn.close()
+                DatabasePopulator.populate_player_stats_bulk(from_date=from_date, to_date=to_date)
+            else:
+                player_ids = [int(row[0]) for row in conn.execute("""
+                    SELECT item FROM ingest_progress
+                    WHERE job = ? AND from_date = ? AND to_date = ? AND completed_at IS NULL
+                """, (name, from_iso, to_iso))]
+                conn.close()
+                DatabasePopulator.populate_player_stats(from_date=from_date, to_date=to_date,
+                                                        players_list=player_ids)
+        finally:
+            # Runs after partial failures too, since some data may have been written
+            DatabasePopulator.invalidate_api_cache()
+        print()
+        for line in NBADataFetcher.cache_report():
+            print(line)
+        return True
+    
+    # Rebuilds every (player, gameweek) bucket touched by the given stat rows.
+    # Buckets are matched to gameweeks by date so games missing from the
+    # games table still count.
+    GAMEWEEK_STATS_UPSERT = """
+        WITH touched AS (
+            SELECT DISTINCT s.player_id, gw.gameweek_id
+            FROM player_game_stats s
+            JOIN gameweeks gw ON s.game_date BETWEEN gw.start_date AND gw.end_date
+            {where}
+        )
+        INSERT INTO player_gameweek_stats
+        (player_id, gameweek_id, games_played, total_points, total_rebounds, total_assists,
+         total_blocks, total_steals, total_fantasy_points, avg_fantasy_points)
+        SELECT
+            t.player_id,
+            t.gameweek_id,
+            COUNT(*),
+            SUM(s.points),
+            SUM(s.rebounds),
+            SUM(s.assists),
+            SUM(s.blocks),
+            SUM(s.steals),
+            SUM(s.fantasy_points),
+            ROUND(AVG(s.fantasy_points), 2)
+        FROM touched t
+        JOIN gameweeks gw ON gw.gameweek_id = t.gameweek_id
+        JOIN player_game_stats s ON s.player_id = t.player_id
+            AND s.game_date BETWEEN gw.start_date AND gw.end_date
+        GROUP BY t.player_id, t.gameweek_id
+        ON CONFLICT(player_id, gameweek_id) DO UPDATE SET
+            games_played = excluded.games_played,
+            total_points = excluded.total_points,
+            total_rebounds = excluded.total_rebounds,
+            total_assists = excluded.total_assists,
+            total_blocks = excluded.total_blocks,
+            total_steals = excluded.total_steals,
+            total_fantasy_points = excluded.total_fantasy_points,
+            avg_fantasy_points = excluded.avg_fantasy_points
+    """
+    
+    @staticmethod
+    def update_gameweek_stats(cursor, stat_ids: Optional[List[int]] = None) -> int:
+        """
+        Upsert player_gameweek_stats for the buckets touched by new game rows.
+        
+        Runs one set-based statement per batch and does not commit.
+        
+        Args:
+            cursor: Cursor on the ingest connection
+            stat_ids: stat_id values of newly inserted player_game_stats rows
+                      (all rows, i.e. a full rebuild, if omitted)
             
-            # Commit after processing this player's games so other tools/clients can see progress
-            try:
-                conn.commit()
-                print(f"  Committed after player {player_id} (total new records: {total_stats})")
-            except Exception as e:
-                print(f"  Error committing after player {player_id}: {e}")
-
-            # Add delay to avoid rate limiting
-            time.sleep(0.5)
+        Returns:
+            Number of gameweek rows written
+        """
+        # rowcount is not reported for statements that start with WITH
+        changes_before = cursor.connection.total_changes
+        if stat_ids is None:
+            cursor.execute(DatabasePopulator.GAMEWEEK_STATS_UPSERT.format(where=""))
+            return cursor.connection.total_changes - changes_before
         
+        stat_ids = list(stat_ids)
+        for start in range(0, len(stat_ids), 500):
+            chunk = stat_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                DatabasePopulator.GAMEWEEK_STATS_UPSERT.format(where=f"WHERE s.stat_id IN ({placeholders})"),
+                chunk
+            )
+        return cursor.connection.total_changes - changes_before
+    
+    @staticmethod
+    def rebuild_gameweek_stats():
+        """Recompute player_gameweek_stats from all stored game rows."""
+        print("Rebuilding player gameweek stats...")
+        conn = get_connection()
+        cursor = conn.cursor()
+        written = DatabasePopulator.update_gameweek_stats(cursor)
+        bump_data_generation(cursor)
         conn.commit()
         conn.close()
-        print(f"✓ Player stats populated: {total_stats} new game records")
+        print(f"✓ Gameweek stats rebuilt: {written} player-gameweek rows")
     
     @staticmethod
-    def populate_all(force_full: bool = False):
+    def populate_all(force_full: bool = False, bulk: bool = False):
         """
         Run the complete database population.
         
         Args:
             force_full: If True, does a full refresh of all data. If False, only fetches new data since last update.
+            bulk: If True, loads stats with one league-wide request per date instead of per player.
         """
         # Initialize database first
         if not DB_PATH.exists():
             print(f"Creating database at {DB_PATH}\n")
             init_database()
+        else:
+            migrate()
         
         print("="*60)
         print("NBA Fantasy Database Population")
@@ -433,27 +895,33 @@ class DatabasePopulator:
         
         start_time = datetime.now()
         
-        # Always populate teams and players (they don't change often)
-        DatabasePopulator.populate_teams()
-        print()
-        
-        DatabasePopulator.populate_players()
-        print()
-        
-        DatabasePopulator.create_gameweeks()
-        print()
-        
-        # For stats, we can do incremental updates
-        # For stats, we can do incremental updates; optional limit or specific players can be passed
-        if force_full:
-            print("Full data refresh requested. Fetching all data since season start...\n")
-            DatabasePopulator.populate_player_stats(
-                from_date=DatabasePopulator.SEASON_START_DATE,
-                to_date=datetime.now().date()
-            )
-        else:
-            print("Running incremental update. Only fetching new data...\n")
-            DatabasePopulator.populate_player_stats()
+        try:
+            # Always populate teams and players (they don't change often)
+            DatabasePopulator.populate_teams()
+            print()
+            
+            DatabasePopulator.populate_players()
+            print()
+            
+            DatabasePopulator.create_gameweeks()
+            print()
+            
+            # For stats, we can do incremental updates
+            # For stats, we can do incremental updates; optional limit or specific players can be passed
+            populate_stats = (DatabasePopulator.populate_player_stats_bulk if bulk
+                              else DatabasePopulator.populate_player_stats)
+            if force_full:
+                print("Full data refresh requested. Fetching all data since season start...\n")
+                populate_stats(
+                    from_date=DatabasePopulator.SEASON_START_DATE,
+                    to_date=datetime.now().date()
+                )
+            else:
+                print("Running incremental update. Only fetching new data...\n")
+                populate_stats()
+        finally:
+            # Runs after partial failures too, since some data may have been written
+            DatabasePopulator.invalidate_api_cache()
         
         print()
         
@@ -463,14 +931,30 @@ class DatabasePopulator:
         print("="*60)
         print(f"✓ Database population completed in {duration:.2f} seconds")
         print(f"✓ Last update: {DatabasePopulator.get_today()}")
+        for line in NBADataFetcher.cache_report():
+            print(line)
         print("="*60)
 
 
 if __name__ == "__main__":
     import sys
     
+    # --rebuild-gameweek-stats recomputes player_gameweek_stats from stored games and exits
+    if '--rebuild-gameweek-stats' in sys.argv:
+        migrate()
+        DatabasePopulator.rebuild_gameweek_stats()
+        sys.exit(0)
+
+    # --resume continues the last interrupted stats run from its checkpoints and exits
+    if '--resume' in sys.argv:
+        migrate()
+        DatabasePopulator.resume_ingest()
+        sys.exit(0)
+
     # Check if --full flag is passed for complete refresh
     force_full = '--full' in sys.argv
+    # --bulk loads stats with one league-wide request per date
+    bulk = '--bulk' in sys.argv
 
     # Optional: --limit N to process only N players, or --players id1,id2
     limit = None
@@ -493,10 +977,10 @@ if __name__ == "__main__":
     # If a subset was requested, build a players_list and pass it through
     players_list = None
     if limit is not None or player_ids is not None:
-        all_players = NBADataFetcher.get_all_players()
         if player_ids:
-            players_list = [p for p in all_players if int(p.get('id')) in player_ids]
+            players_list = player_ids
         elif limit is not None:
+            all_players = NBADataFetcher.get_active_players()
             players_list = all_players[:limit]
 
     # If players_list is provided, call populate_player_stats with it
@@ -505,15 +989,23 @@ if __name__ == "__main__":
         if not DB_PATH.exists():
             print(f"Creating database at {DB_PATH}\n")
             init_database()
+        else:
+            migrate()
 
-        DatabasePopulator.populate_teams()
-        print()
-        DatabasePopulator.populate_players()
-        print()
-        DatabasePopulator.create_gameweeks()
-        print()
+        try:
+            DatabasePopulator.populate_teams()
+            print()
+            DatabasePopulator.populate_players()
+            print()
+            DatabasePopulator.create_gameweeks()
+            print()
 
-        print("Running population on requested subset...\n")
-        DatabasePopulator.populate_player_stats(from_date=None, to_date=None, players_list=players_list)
+            print("Running population on requested subset...\n")
+            DatabasePopulator.populate_player_stats(from_date=None, to_date=None, players_list=players_list)
+        finally:
+            DatabasePopulator.invalidate_api_cache()
+        print()
+        for line in NBADataFetcher.cache_report():
+            print(line)
     else:
-        DatabasePopulator.populate_all(force_full=force_full)
+        DatabasePopulator.populate_all(force_full=force_full, bulk=bulk)
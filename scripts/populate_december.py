@@ -14,8 +14,8 @@ def populate_december_stats():
     conn = get_connection()
     cur = conn.cursor()
     
-    # Get all player IDs from our rosters
-    cur.execute("SELECT player_id FROM players ORDER BY player_id")
+    # Get player IDs from our rosters (players with a current team)
+    cur.execute("SELECT player_id FROM players WHERE team_id IS NOT NULL ORDER BY player_id")
     player_ids = [row[0] for row in cur.fetchall()]
     print(f'Found {len(player_ids)} players in roster')
     
@@ -23,11 +23,15 @@ def populate_december_stats():
     conn.close()
     
     print('\nStep 2: Fetching stats for roster players only (Dec 1-16)...')
-    DatabasePopulator.populate_player_stats(
-        from_date=datetime(2025, 12, 1),
-        to_date=datetime(2025, 12, 16),
-        players_list=player_ids  # Only fetch for our roster players
-    )
+    try:
+        DatabasePopulator.populate_player_stats(
+            from_date=datetime(2025, 12, 1),
+            to_date=datetime(2025, 12, 16),
+            players_list=player_ids  # Only fetch for our roster players
+        )
+    finally:
+        # Runs after partial failures too, since some data may have been written
+        DatabasePopulator.invalidate_api_cache()
     
     print('\n✓ December stats populated!')
     
@@ -13,7 +13,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from app.database import get_connection
+from app.database import get_connection, bump_data_generation
 
 class NBAFantasySalaryScraper:
     """Scraper for NBA Fantasy salary data."""
@@ -364,6 +364,7 @@ class NBAFantasySalaryScraper:
             else:
                 not_found.append(player_name)
         
+        bump_data_generation(cur)
         conn.commit()
         conn.close()
         
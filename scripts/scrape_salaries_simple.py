@@ -10,7 +10,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from app.database import get_connection
+from app.database import get_connection, bump_data_generation
 from datetime import datetime
 from fuzzywuzzy import fuzz
 
@@ -212,6 +212,7 @@ def scrape_nba_fantasy_salaries(headless=True):
             else:
                 not_found.append((scraped_name, salary, best_score if best_match else 0))
         
+        bump_data_generation(cur)
         conn.commit()
         conn.close()
         
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """
-Show lineup comparison with depth-focused recommendations (Carter + Beringer).
+Show lineup comparison between the current roster and the best transfer plan.
+
+The proposed roster applies the top plan of app.transfer_planner for
+gameweek 9 (Dec 16-22), given the bank and free transfers.
+
+Usage:
+    python3 scripts/show_depth_focused_lineup.py [--bank 1.7] [--free-transfers 2]
 """
 
 import sqlite3
+import sys
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+from app.lineups import solve_lineups
+from app.scoring import register_scoring_functions
+from app.transfer_planner import plan_transfers
+
 DB_PATH = '/home/velasvalen17/myproject/nba_fantasy.db'
+GAMEWEEK = 9
 
 # Current roster
 CURRENT_ROSTER = {
@@ -27,45 +39,31 @@ CURRENT_ROSTER = {
     ]
 }
 
-# Proposed roster with depth-focused changes
-PROPOSED_ROSTER = {
-    'backcourt': [
-        'Nickeil Alexander-Walker',
-        'Cedric Coward',
-        'Jevon Carter',  # Replaces Rollins
-        'Ajay Mitchell',
-        'Joan Beringer'  # Note: Listed as F but adding to BC for now, will fix position
-    ],
-    'frontcourt': [
-        'Jalen Johnson',
-        'Nikola Jokić',
-        'Julius Randle',
-        'Derik Queen',
-        'Kyshawn George'
-    ]
-}
 
-# Actually Joan Beringer is a forward, let me fix this
-PROPOSED_ROSTER = {
-    'backcourt': [
-        'Nickeil Alexander-Walker',
-        'Cedric Coward',
-        'Jevon Carter',  # Replaces Rollins
-        'Ajay Mitchell'
-    ],
-    'frontcourt': [
-        'Jalen Johnson',
-        'Nikola Jokić',
-        'Julius Randle',
-        'Derik Queen',
-        'Kyshawn George',
-        'Joan Beringer'  # Replaces Quickley
-    ]
-}
+def propose_roster(gameweek, bank, free_transfers):
+    """Apply the best plan from the transfer planner to CURRENT_ROSTER."""
+    names = CURRENT_ROSTER['backcourt'] + CURRENT_ROSTER['frontcourt']
+    conn = sqlite3.connect(DB_PATH)
+    placeholders = ','.join('?' * len(names))
+    ids = dict(conn.execute(f"SELECT player_name, player_id FROM players WHERE player_name IN ({placeholders})",
+                            names).fetchall())
+    result = plan_transfers(conn, [ids[name] for name in names], gameweek, bank, free_transfers, k=1)
+    conn.close()
+    if not result['plans']:
+        return CURRENT_ROSTER, None
+
+    plan = result['plans'][0]
+    out_names = {player['player_name'] for player in plan['out']}
+    proposed = {side: [name for name in players if name not in out_names]
+                for side, players in CURRENT_ROSTER.items()}
+    for player in plan['in']:
+        proposed['backcourt' if player['group'] == 'BC' else 'frontcourt'].append(player['player_name'])
+    return proposed, plan
 
 def get_player_stats_and_games(roster_bc, roster_fc):
     """Get player stats and games for the week."""
     conn = sqlite3.connect(DB_PATH)
+    register_scoring_functions(conn)
     cur = conn.cursor()
     
     all_players = roster_bc + roster_fc
@@ -77,11 +75,11 @@ def get_player_stats_and_games(roster_bc, roster_fc):
             SELECT 
                 p.player_id,
                 p.player_name,
-                AVG(pgs.points + pgs.rebounds + 2 * pgs.assists + 
-                    3 * pgs.blocks + 3 * pgs.steals) as fantasy_avg
+                AVG(fp(pgs.points, pgs.rebounds, pgs.assists,
+                       pgs.blocks, pgs.steals, pgs.turnovers)) as fantasy_avg
             FROM players p
             JOIN player_game_stats pgs ON p.player_id = pgs.player_id
-            JOIN games g ON pgs.game_id = g.game_id
+            JOIN games g ON g.game_id = pgs.nba_game_id
             WHERE p.player_name IN ({placeholders})
                 AND g.game_date >= '2025-12-09' 
                 AND g.game_date <= '2025-12-15'
@@ -146,10 +144,25 @@ def get_player_stats_and_games(roster_bc, roster_fc):
     conn.close()
     return stats, games
 
+def solve_week(roster, stats, games, days):
+    """Optimal lineup points and number of starters per day, solved for all days at once."""
+    names = roster['backcourt'] + roster['frontcourt']
+    groups = ['BC'] * len(roster['backcourt']) + ['FC'] * len(roster['frontcourt'])
+    projections = [[stats[name] if day in games.get(name, {}) else float('nan') for day in days]
+                   for name in names]
+    solved = solve_lineups(groups, projections)
+    return solved['points'], solved['starters'].sum(axis=0)
+
 def main():
+    args = sys.argv[1:]
+    bank = float(args[args.index('--bank') + 1]) if '--bank' in args else 1.7
+    free_transfers = int(args[args.index('--free-transfers') + 1]) if '--free-transfers' in args else 2
+    proposed_roster, plan = propose_roster(GAMEWEEK, bank, free_transfers)
+    incoming = ' + '.join(player['player_name'] for player in plan['in']) if plan else 'no transfers'
+
     print("\n" + "🏀" + "="*118 + "🏀")
-    print(" " * 35 + "DEPTH-FOCUSED LINEUP COMPARISON")
-    print(" " * 30 + "Current vs Proposed (Carter + Beringer)")
+    print(f"{'DEPTH-FOCUSED LINEUP COMPARISON':^120}")
+    print(f"{'Current vs Proposed (' + incoming + ')':^120}")
     print("🏀" + "="*118 + "🏀\n")
     
     # Get stats and games for both rosters
@@ -157,7 +170,7 @@ def main():
         CURRENT_ROSTER['backcourt'], CURRENT_ROSTER['frontcourt']
     )
     proposed_stats, proposed_games = get_player_stats_and_games(
-        PROPOSED_ROSTER['backcourt'], PROPOSED_ROSTER['frontcourt']
+        proposed_roster['backcourt'], proposed_roster['frontcourt']
     )
     
     # Get all unique fantasy days
@@ -179,10 +192,14 @@ def main():
         gameweek = (days_since_start // 7) + 1
         day_labels[day] = f"{gameweek}.{day_in_week}"
     
+    # Optimal starting 5 (2-3 BC, 2-3 FC) of every day; partial lineups still score
+    current_points, current_starters = solve_week(CURRENT_ROSTER, current_stats, current_games, sorted_days)
+    proposed_points, proposed_starters = solve_week(proposed_roster, proposed_stats, proposed_games, sorted_days)
+    
     weekly_current = 0
     weekly_proposed = 0
     
-    for day in sorted_days:
+    for day_index, day in enumerate(sorted_days):
         day_obj = datetime.strptime(day, '%Y-%m-%d').replace(tzinfo=madrid_tz)
         day_name = day_obj.strftime('%A, %B %d')
         label = day_labels[day]
@@ -195,8 +212,8 @@ def main():
         current_bc = [p for p in CURRENT_ROSTER['backcourt'] if p in current_games and day in current_games[p]]
         current_fc = [p for p in CURRENT_ROSTER['frontcourt'] if p in current_games and day in current_games[p]]
         
-        proposed_bc = [p for p in PROPOSED_ROSTER['backcourt'] if p in proposed_games and day in proposed_games[p]]
-        proposed_fc = [p for p in PROPOSED_ROSTER['frontcourt'] if p in proposed_games and day in proposed_games[p]]
+        proposed_bc = [p for p in proposed_roster['backcourt'] if p in proposed_games and day in proposed_games[p]]
+        proposed_fc = [p for p in proposed_roster['frontcourt'] if p in proposed_games and day in proposed_games[p]]
         
         print(f"\n{'CURRENT ROSTER':^60}│{'PROPOSED ROSTER':^59}")
         print("─"*60 + "┼" + "─"*59)
@@ -266,24 +283,17 @@ def main():
         current_total = len(current_bc) + len(current_fc)
         proposed_total = len(proposed_bc) + len(proposed_fc)
         
-        current_fp = 0
-        proposed_fp = 0
+        current_fp = current_points[day_index]
+        proposed_fp = proposed_points[day_index]
+        weekly_current += current_fp
+        weekly_proposed += proposed_fp
         
-        if current_total >= 5 and len(current_bc) >= 3 and len(current_fc) >= 2:
-            # Select top 3 BC and top 2 FC by fantasy points
-            bc_sorted = sorted(current_bc, key=lambda p: current_stats[p], reverse=True)[:3]
-            fc_sorted = sorted(current_fc, key=lambda p: current_stats[p], reverse=True)[:2]
-            current_fp = sum(current_stats[p] for p in bc_sorted + fc_sorted)
-            weekly_current += current_fp
+        if current_starters[day_index] >= 5:
             current_status = f"📊 Starting 5 Total: {current_fp:6.1f} FP"
         else:
             current_status = f"⚠️  Can't field starting 5 ({current_total} players: {len(current_bc)} BC, {len(current_fc)} FC)"
         
-        if proposed_total >= 5 and len(proposed_bc) >= 3 and len(proposed_fc) >= 2:
-            bc_sorted = sorted(proposed_bc, key=lambda p: proposed_stats[p], reverse=True)[:3]
-            fc_sorted = sorted(proposed_fc, key=lambda p: proposed_stats[p], reverse=True)[:2]
-            proposed_fp = sum(proposed_stats[p] for p in bc_sorted + fc_sorted)
-            weekly_proposed += proposed_fp
+        if proposed_starters[day_index] >= 5:
             diff = proposed_fp - current_fp
             diff_str = f"({diff:+.1f} FP)" if current_fp > 0 else ""
             proposed_status = f"📊 Starting 5 Total: {proposed_fp:6.1f} FP {diff_str}"
@@ -303,9 +313,13 @@ def main():
     print(f"  DIFFERENCE:        {diff:+6.1f} FP ({pct:+.1f}%)")
     
     print("\n💡 KEY IMPROVEMENTS:")
-    print("  • Can now field starting 5 on Day 9.4 (was 4 players, now 6)")
-    print("  • Added coverage on Day 9.2 (was 2 players, now 4)")
-    print("  • Both new players (Carter & Beringer) play on problem days")
+    if plan:
+        for out, player in zip(plan['out'], plan['in']):
+            print(f"  • {out['player_name']} → {player['player_name']} "
+                  f"(${out['salary']:.1f}M → ${player['salary']:.1f}M)")
+        print(f"  • Planner projection: {plan['gain']:+.1f} FP this gameweek, ${plan['bank']:.1f}M left in the bank")
+    else:
+        print("  • No affordable transfer improves the roster")
     
     print("\n🏀" + "="*118 + "🏀\n")
 
@@ -1,151 +1,98 @@
 #!/usr/bin/env python3
 """
-Find best transactions prioritizing roster depth on problem days (9.2 and 9.4).
+Recommend this gameweek's transfers for the current roster.
+
+Searches every 1- and 2-transfer combination (app.transfer_planner) and ranks
+them by projected weekly starting-five points over the gameweek's gamedays,
+within the bank and the per-team limit.
+
+Usage:
+    python3 scripts/simple_depth_recs.py [--gameweek 9] [--bank 1.7] [--free-transfers 2]
+        [--transfer-cost 100] [--projection last5_avg_fp] [--top 5]
+
+Without --transfer-cost, plans use at most the free transfers.
 """
 
 import sqlite3
+import sys
+import time
+
+from app.transfer_planner import plan_transfers
 
 DB_PATH = '/home/velasvalen17/myproject/nba_fantasy.db'
-AVAILABLE_BUDGET = 1.7
 
 # Current roster
 CURRENT_ROSTER_NAMES = [
-    'Nickeil Alexander-Walker', 'Cedric Coward', 'Ryan Rollins', 
+    'Nickeil Alexander-Walker', 'Cedric Coward', 'Ryan Rollins',
     'Ajay Mitchell', 'Immanuel Quickley',  # Backcourt
-    'Jalen Johnson', 'Nikola Jokić', 'Julius Randle', 
+    'Jalen Johnson', 'Nikola Jokić', 'Julius Randle',
     'Derik Queen', 'Kyshawn George'  # Frontcourt
 ]
 
-print("\n" + "="*90)
-print("RECOMMENDATIONS PRIORITIZING ROSTER DEPTH")
-print("="*90)
-print("\nProblem: Days 9.2 (Dec 17) and 9.4 (Dec 19) have insufficient players (< 5)")
-print("Strategy: Find players who play on BOTH problem days\n")
-
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
-
-# Get current roster with salaries
-print("Current Roster:")
-print("-" * 90)
-cur.execute("""
-    SELECT player_name, position, salary
-    FROM players
-    WHERE player_name IN ({})
-    ORDER BY salary DESC
-""".format(','.join(['?'] * len(CURRENT_ROSTER_NAMES))), CURRENT_ROSTER_NAMES)
-
-current_roster_details = []
-for name, pos, salary in cur.fetchall():
-    current_roster_details.append({'name': name, 'position': pos, 'salary': salary or 0})
-    print(f"  {name:30} {pos:5} ${salary:.1f}M" if salary else f"  {name:30} {pos:5} No salary data")
-
-# Find players who play on BOTH problem days and are affordable
-print("\n" + "-" * 90)
-print("Top Affordable Players Playing on BOTH Dec 17 and Dec 19:")
-print("-" * 90)
-
-cur.execute("""
-    SELECT 
-        p.player_name,
-        p.position,
-        p.salary,
-        t.team_abbreviation,
-        COUNT(DISTINCT CASE WHEN g.game_date IN ('2025-12-17', '2025-12-19') THEN g.game_date END) as problem_days,
-        COUNT(DISTINCT g.game_date) as total_games_week
-    FROM players p
-    JOIN teams t ON p.team_id = t.team_id
-    JOIN games g ON (p.team_id = g.home_team_id OR p.team_id = g.away_team_id)
-    WHERE p.salary IS NOT NULL
-      AND p.salary <= 15.0
-      AND p.player_name NOT IN ({})
-      AND g.game_date >= '2025-12-16' AND g.game_date <= '2025-12-22'
-    GROUP BY p.player_id
-    HAVING problem_days = 2
-    ORDER BY p.salary ASC
-    LIMIT 30
-""".format(','.join(['?'] * len(CURRENT_ROSTER_NAMES))), CURRENT_ROSTER_NAMES)
-
-candidates = []
-for name, pos, salary, team, problem_days, total_games in cur.fetchall():
-    candidates.append({
-        'name': name,
-        'position': pos,
-        'salary': salary,
-        'team': team,
-        'problem_days': problem_days,
-        'total_games': total_games
-    })
-    if len(candidates) <= 15:  # Print top 15
-        print(f"  {name:30} {pos:8} {team:4} ${salary:5.1f}M  (plays {total_games} games this week)")
-
-# Now suggest specific transactions
-print("\n" + "="*90)
-print("RECOMMENDED TRANSACTIONS:")
-print("="*90)
-
-# Strategy: Drop lowest performers who don't play on problem days, add players who do
-# Rollins and Quickley don't play on 9.2 or 9.4, so they're good drop candidates
-
-drop_candidates = ['Ryan Rollins', 'Immanuel Quickley']
-print("\nDrop candidates (don't play on problem days):")
-for name in drop_candidates:
-    player = next((p for p in current_roster_details if p['name'] == name), None)
-    if player:
-        print(f"  ❌ {name:30} ${player['salary']:.1f}M")
-
-budget_after_drops = AVAILABLE_BUDGET
-for name in drop_candidates:
-    player = next((p for p in current_roster_details if p['name'] == name), None)
-    if player:
-        budget_after_drops += player['salary']
-
-print(f"\nBudget after drops: ${budget_after_drops:.1f}M")
-
-# Find best 2 adds within budget
-print("\nBest additions within budget:")
-best_pair = None
-best_score = 0
-
-for i, cand1 in enumerate(candidates):
-    for cand2 in candidates[i+1:]:
-        total_cost = cand1['salary'] + cand2['salary']
-        if total_cost <= budget_after_drops:
-            # Check position balance
-            bc1 = 'G' in cand1['position']
-            bc2 = 'G' in cand2['position']
-            
-            # We're dropping 2 BC (Rollins, Quickley), so we need at least 1 BC back
-            if not (bc1 or bc2):
-                continue
-            
-            # Score: prefer pairs with different positions and more total games
-            score = cand1['total_games'] + cand2['total_games']
-            if bc1 != bc2:  # Different positions
-                score += 10
-            
-            if score > best_score:
-                best_score = score
-                best_pair = (cand1, cand2, total_cost)
-
-if best_pair:
-    cand1, cand2, total_cost = best_pair
-    print(f"\n  ✅ ADD: {cand1['name']:30} {cand1['position']:8} {cand1['team']:4} ${cand1['salary']:5.1f}M")
-    print(f"          Plays {cand1['total_games']} games including BOTH problem days")
-    print(f"\n  ✅ ADD: {cand2['name']:30} {cand2['position']:8} {cand2['team']:4} ${cand2['salary']:5.1f}M")
-    print(f"          Plays {cand2['total_games']} games including BOTH problem days")
-    print(f"\n  💰 Total cost: ${total_cost:.1f}M (${budget_after_drops - total_cost:.1f}M remaining)")
-    
-    print("\n" + "-" * 90)
-    print("IMPACT:")
-    print("-" * 90)
-    print(f"  • Day 9.2 (Dec 17): +2 players → {2 + 2} total (still need 1 more for starting 5)")
-    print(f"  • Day 9.4 (Dec 19): +2 players → {4 + 2} total (can now field starting 5!) ✓")
-else:
-    print("\n  ❌ Could not find affordable pair within budget")
-    print(f"     Cheapest pair costs ${candidates[0]['salary'] + candidates[1]['salary']:.1f}M")
-    print(f"     Available: ${budget_after_drops:.1f}M")
-
-conn.close()
 
-print("\n" + "="*90 + "\n")
+def roster_ids(conn, names):
+    """Player IDs of the roster, in the order given."""
+    placeholders = ','.join('?' * len(names))
+    ids = dict(conn.execute(f"SELECT player_name, player_id FROM players WHERE player_name IN ({placeholders})",
+                            names).fetchall())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        raise SystemExit(f"❌ Unknown players: {', '.join(missing)}")
+    return [ids[name] for name in names]
+
+
+def player_line(player, gamedays):
+    days = sum(day in player['gamedays'] for day in gamedays)
+    return (f"{player['player_name']:30} {player['position']:5} {player['team']:4} "
+            f"${player['salary']:5.1f}M  {player['projection']:5.1f} FP x {days} days")
+
+
+def main():
+    args = sys.argv[1:]
+    gameweek = int(args[args.index('--gameweek') + 1]) if '--gameweek' in args else 9
+    bank = float(args[args.index('--bank') + 1]) if '--bank' in args else 1.7
+    free_transfers = int(args[args.index('--free-transfers') + 1]) if '--free-transfers' in args else 2
+    transfer_cost = float(args[args.index('--transfer-cost') + 1]) if '--transfer-cost' in args else None
+    projection = args[args.index('--projection') + 1] if '--projection' in args else 'last5_avg_fp'
+    top = int(args[args.index('--top') + 1]) if '--top' in args else 5
+
+    conn = sqlite3.connect(DB_PATH)
+    start = time.perf_counter()
+    result = plan_transfers(conn, roster_ids(conn, CURRENT_ROSTER_NAMES), gameweek, bank, free_transfers,
+                            transfer_cost=transfer_cost, k=top, projection=projection)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    gamedays = result['gamedays']
+
+    print("\n" + "="*90)
+    print(f"TRANSFER RECOMMENDATIONS - GAMEWEEK {gameweek}")
+    print("="*90)
+    print(f"\n💰 Bank: ${bank:.1f}M   🔄 Free transfers: {free_transfers}   📈 Projection: {projection}")
+    print(f"📅 Gamedays: {', '.join(gamedays)}")
+
+    print("\nCurrent Roster:")
+    print("-" * 90)
+    for player in sorted(result['roster'], key=lambda p: (p['group'], -p['salary'])):
+        print(f"  {player_line(player, gamedays)}")
+    print(f"\n  📊 Projected starting-five points: {result['current_points']:.1f} FP")
+
+    print("\n" + "="*90)
+    print("RECOMMENDED TRANSACTIONS:")
+    print("="*90)
+    if not result['plans']:
+        print("\n  ❌ No affordable transfers found")
+    for rank, plan in enumerate(result['plans'], 1):
+        print(f"\n  #{rank}  {plan['points']:.1f} FP ({plan['gain']:+.1f} FP)"
+              + (f", after -{plan['cost']:.0f} FP transfer cost" if plan['cost'] else ""))
+        for player in plan['out']:
+            print(f"    ❌ OUT: {player_line(player, gamedays)}")
+        for player in plan['in']:
+            print(f"    ✅ IN:  {player_line(player, gamedays)}")
+        print(f"    💰 Bank after: ${plan['bank']:.1f}M")
+
+    print(f"\n⏱️  Scored {result['evaluated']} rosters in {elapsed:.2f}s")
+    print("\n" + "="*90 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""
+Stub NBA Stats Server
+Local HTTP server that answers stats.nba.com endpoints with canned JSON, so the
+fetchers can be benchmarked without touching the real API.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode, urlparse, parse_qsl
+
+from nba_api.stats.library.http import NBAStatsHTTP
+
+GAME_LOG_HEADERS = [
+    'SEASON_ID', 'Player_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'MIN', 'FGM', 'FGA',
+    'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST',
+    'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS', 'VIDEO_AVAILABLE',
+]
+
+
+def player_game_log_payload(player_id: int, num_games: int = 30,
+                            season_start: date = date(2025, 10, 21)) -> Dict:
+    """Build a deterministic playergamelog response for one player."""
+    rng = random.Random(player_id)
+    rows = []
+    for n in range(num_games):
+        game_day = season_start + timedelta(days=2 * n)
+        reb, ast, stl, blk = rng.randint(0, 12), rng.randint(0, 10), rng.randint(0, 3), rng.randint(0, 3)
+        pts = rng.randint(0, 35)
+        rows.append([
+            '22025', player_id, f"0022500{n + 1:03d}", game_day.strftime('%b %d, %Y').upper(),
+            'AAA vs. BBB', rng.choice('WL'), rng.randint(10, 40), 0, 0, 0.0, 0, 0, 0.0, 0, 0, 0.0,
+            0, reb, reb, ast, stl, blk, rng.randint(0, 4), rng.randint(0, 5), pts, 0, 1,
+        ])
+    return {
+        'resource': 'playergamelog',
+        'parameters': {'PlayerID': player_id},
+        'resultSets': [{'name': 'PlayerGameLog', 'headers': GAME_LOG_HEADERS, 'rowSet': rows}],
+    }
+
+
+ROSTER_HEADERS = [
+    'TeamID', 'SEASON', 'LeagueID', 'PLAYER', 'PLAYER_SLUG', 'NUM', 'POSITION', 'HEIGHT',
+    'WEIGHT', 'BIRTH_DATE', 'AGE', 'EXP', 'SCHOOL', 'PLAYER_ID',
+]
+COACH_HEADERS = [
+    'TEAM_ID', 'SEASON', 'COACH_ID', 'FIRST_NAME', 'LAST_NAME', 'COACH_NAME', 'IS_ASSISTANT',
+    'COACH_TYPE', 'SORT_SEQUENCE',
+]
+
+
+def team_roster_payload(team_id: int, roster_size: int = 17) -> Dict:
+    """Build a commonteamroster response; player IDs are derived from the team ID."""
+    rows = []
+    for n in range(roster_size):
+        player_id = (team_id % 1000) * 100 + n
+        rows.append([
+            team_id, '2025', '00', f"Player {player_id}", f"player-{player_id}", str(n),
+            ['G', 'G-F', 'F', 'F-C', 'C'][n % 5], '6-6', '215', 'JAN 01, 2000', 25.0, '3',
+            'School', player_id,
+        ])
+    return {
+        'resource': 'commonteamroster',
+        'parameters': {'TeamID': team_id},
+        'resultSets': [
+            {'name': 'CommonTeamRoster', 'headers': ROSTER_HEADERS, 'rowSet': rows},
+            {'name': 'Coaches', 'headers': COACH_HEADERS, 'rowSet': []},
+        ],
+    }
+
+
+def default_responder(endpoint: str, params: Dict) -> Optional[Dict]:
+    """Answer playergamelog and commonteamroster requests; everything else is a 404."""
+    if endpoint == 'playergamelog':
+        return player_game_log_payload(int(params.get('PlayerID', 0)))
+    if endpoint == 'commonteamroster':
+        return team_roster_payload(int(params.get('TeamID', 0)))
+    return None
+
+
+LEAGUE_LOG_HEADERS = [
+    'SEASON_ID', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME',
+    'GAME_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A',
+    'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF',
+    'PTS', 'PLUS_MINUS', 'FANTASY_PTS', 'VIDEO_AVAILABLE',
+]
+
+
+class SyntheticSeason:
+    """
+    Deterministic league with rosters, a schedule and one box-score line per
+    rostered player per game, served consistently by playergamelog (per player),
+    leaguegamelog (per date) and commonteamroster (per team).
+    """
+
+    FIRST_TEAM_ID = 1610612737
+
+    def __init__(self, num_days: int = 30, games_per_day: int = 7, roster_size: int = 13,
+                 seed: int = 0, season_start: date = date(2025, 10, 21)):
+        rng = random.Random(seed)
+        self.team_ids = [self.FIRST_TEAM_ID + i for i in range(30)]
+        self.rosters = {
+            team_id: [(team_id % 1000) * 100 + n for n in range(roster_size)]
+            for team_id in self.team_ids
+        }
+        self.by_player: Dict[int, List[Dict]] = {}
+        self.by_date: Dict[str, List[Dict]] = {}
+        game_number = 0
+        for day in range(num_days):
+            game_day = (season_start + timedelta(days=day)).isoformat()
+            teams = self.team_ids[:]
+            rng.shuffle(teams)
+            for g in range(games_per_day):
+                game_number += 1
+                game_id = f"0022500{game_number:03d}"
+                home, away = teams[2 * g], teams[2 * g + 1]
+                for team_id, opponent in ((home, away), (away, home)):
+                    for player_id in self.rosters[team_id]:
+                        line = {
+                            'PLAYER_ID': player_id, 'TEAM_ID': team_id, 'GAME_ID': game_id,
+                            'GAME_DATE': game_day, 'MIN': rng.randint(5, 40),
+                            'PTS': rng.randint(0, 35), 'REB': rng.randint(0, 12),
+                            'AST': rng.randint(0, 10), 'STL': rng.randint(0, 3),
+                            'BLK': rng.randint(0, 3), 'TOV': rng.randint(0, 4),
+                            'PF': rng.randint(0, 5), 'PLUS_MINUS': rng.randint(-20, 20),
+                            'MATCHUP': f"{team_id} vs. {opponent}",
+                        }
+                        self.by_player.setdefault(player_id, []).append(line)
+                        self.by_date.setdefault(game_day, []).append(line)
+
+    @property
+    def player_ids(self) -> List[int]:
+        return sorted(self.by_player)
+
+    @staticmethod
+    def _row(line: Dict, headers: List[str], game_date: str) -> List:
+        values = dict(line, SEASON_ID='22025', Player_ID=line['PLAYER_ID'], Game_ID=line['GAME_ID'],
+                      PLAYER_NAME=f"Player {line['PLAYER_ID']}", TEAM_ABBREVIATION='TM',
+                      TEAM_NAME='Team', WL='W', GAME_DATE=game_date, VIDEO_AVAILABLE=1)
+        return [values.get(h, 0) for h in headers]
+
+    def respond(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        if endpoint == 'playergamelog':
+            lines = self.by_player.get(int(params.get('PlayerID', 0)), [])
+            rows = [self._row(line, GAME_LOG_HEADERS,
+                              datetime.strptime(line['GAME_DATE'], '%Y-%m-%d').strftime('%b %d, %Y').upper())
+                    for line in reversed(lines)]
+            return {'resource': endpoint, 'parameters': params,
+                    'resultSets': [{'name': 'PlayerGameLog', 'headers': GAME_LOG_HEADERS, 'rowSet': rows}]}
+        if endpoint == 'leaguegamelog':
+            game_day = datetime.strptime(params.get('DateFrom', ''), '%m/%d/%Y').strftime('%Y-%m-%d')
+            rows = [self._row(line, LEAGUE_LOG_HEADERS, game_day) for line in self.by_date.get(game_day, [])]
+            return {'resource': endpoint, 'parameters': params,
+                    'resultSets': [{'name': 'LeagueGameLog', 'headers': LEAGUE_LOG_HEADERS, 'rowSet': rows}]}
+        if endpoint == 'commonteamroster':
+            return team_roster_payload(int(params.get('TeamID', 0)), len(self.rosters[self.FIRST_TEAM_ID]))
+        return None
+
+
+def capture_key(endpoint: str, params: Dict) -> str:
+    """File name for a recorded response: endpoint plus a hash of the sorted query."""
+    query = urlencode(sorted(params.items()))
+    return f"{endpoint}-{hashlib.md5(query.encode('utf-8')).hexdigest()[:12]}.json"
+
+
+def replay_responder(directory) -> Callable[[str, Dict], Optional[Dict]]:
+    """Serve responses recorded as <directory>/<capture_key>.json; unknown requests 404."""
+    directory = Path(directory)
+
+    def respond(endpoint: str, params: Dict) -> Optional[Dict]:
+        path = directory / capture_key(endpoint, params)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    return respond
+
+
+class StubNBAServer:
+    """
+    Threaded local server standing in for stats.nba.com.
+
+    Used as a context manager: on entry it starts serving on a free localhost
+    port and points nba_api at it; on exit it restores the real base URL.
+    Responses carry an ETag and If-None-Match is answered with 304.
+
+    Args:
+        responder: Callable (endpoint, params) -> JSON dict, or None for 404
+        latency: Seconds to sleep before answering each request
+        record_dir: If set, every payload served is also saved there for replay_responder
+    """
+
+    def __init__(self, responder: Callable[[str, Dict], Optional[Dict]] = default_responder,
+                 latency: float = 0.0, record_dir=None):
+        self.responder = responder
+        self.latency = latency
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._saved_base_url = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/stats/{{endpoint}}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 so clients can keep connections alive between requests
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                endpoint = url.path.rstrip('/').rsplit('/', 1)[-1].lower()
+                params = dict(parse_qsl(url.query, keep_blank_values=True))
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                payload = stub.responder(endpoint, params)
+                if payload is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = json.dumps(payload).encode('utf-8')
+                if stub.record_dir:
+                    stub.record_dir.mkdir(parents=True, exist_ok=True)
+                    (stub.record_dir / capture_key(endpoint, params)).write_bytes(body)
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self._saved_base_url = NBAStatsHTTP.base_url
+        NBAStatsHTTP.base_url = self.base_url
+        return self
+
+    def __exit__(self, *exc):
+        NBAStatsHTTP.base_url = self._saved_base_url
+        self._server.shutdown()
+        self._server.server_close()
+        return False
@@ -5,9 +5,10 @@ Builds optimal 10-player roster considering $100M salary cap
 """
 
 from app.database import get_connection
+from app.roster_optimizer import load_candidates, solve_roster, greedy_roster, position_group
 from collections import defaultdict
 
-def optimize_team_with_salary(max_salary=100.0, performance_weight=0.7):
+def optimize_team_with_salary(max_salary=100.0, performance_weight=0.7, method='exact'):
     """
     Build optimal team with salary constraints.
     
@@ -15,9 +16,10 @@ def optimize_team_with_salary(max_salary=100.0, performance_weight=0.7):
         max_salary: Maximum total salary in millions (default 100.0)
         performance_weight: Weight for performance vs value (0-1, default 0.7)
                           Higher = prioritize performance, Lower = prioritize value
+        method: 'exact' for the branch-and-bound solver (provably best roster),
+                'greedy' for the original single greedy pass
     """
     conn = get_connection()
-    cur = conn.cursor()
     
     print("🏀" + "="*118 + "🏀")
     print(" " * 25 + "NBA FANTASY - OPTIMAL TEAM WITH SALARY CAP")
@@ -28,102 +30,32 @@ def optimize_team_with_salary(max_salary=100.0, performance_weight=0.7):
     print(f"⚖️  Optimization: {int(performance_weight*100)}% performance, {int((1-performance_weight)*100)}% value\n")
     
     # Get all top performers with salaries
-    cur.execute("""
-        SELECT 
-            p.player_name,
-            p.position,
-            t.team_name,
-            p.team_id,
-            p.salary,
-            COUNT(DISTINCT SUBSTR(pgs.game_id, 1, 10)) as games_played,
-            ROUND(AVG(pgs.points), 1) as avg_points,
-            ROUND(AVG(pgs.rebounds), 1) as avg_rebounds,
-            ROUND(AVG(pgs.assists), 1) as avg_assists,
-            ROUND(AVG(pgs.steals), 1) as avg_steals,
-            ROUND(AVG(pgs.blocks), 1) as avg_blocks,
-            ROUND(AVG(pgs.turnovers), 1) as avg_turnovers,
-            ROUND(AVG(pgs.points + pgs.rebounds + 2*pgs.assists + 3*pgs.blocks + 3*pgs.steals), 1) as fantasy_avg
-        FROM player_game_stats pgs
-        JOIN players p ON pgs.player_id = p.player_id
-        JOIN teams t ON p.team_id = t.team_id
-        JOIN games g ON pgs.game_id LIKE g.game_id || '_%'
-        WHERE g.game_date >= '2025-12-09' AND g.game_date <= '2025-12-15'
-        AND pgs.minutes_played > 0
-        AND p.salary IS NOT NULL
-        GROUP BY p.player_id, p.player_name, p.position, t.team_name, p.team_id, p.salary
-        HAVING games_played >= 2
-        ORDER BY fantasy_avg DESC
-    """)
-    
-    all_players = cur.fetchall()
+    all_players = load_candidates(conn, '2025-12-09', '2025-12-15', performance_weight)
     
     if not all_players:
         print("❌ No salary data available. Run salary_scraper.py first!")
         conn.close()
         return
     
-    # Calculate value score for each player
-    players_with_value = []
-    for p in all_players:
-        fantasy_avg = p[12]
-        salary = p[4]
-        value = fantasy_avg / salary if salary > 0 else 0
-        
-        # Combined score: weighted average of performance and value
-        score = (performance_weight * fantasy_avg) + ((1 - performance_weight) * value * 10)
-        
-        players_with_value.append(p + (value, score))
-    
-    # Sort by combined score
-    players_with_value.sort(key=lambda x: x[14], reverse=True)
-    
-    # Position classification
+    # Build team with constraints
+    if method == 'greedy':
+        roster = greedy_roster(all_players, max_salary)
+    else:
+        roster = solve_roster(all_players, max_salary)
+    
+    if not roster or not roster['complete']:
+        print("❌ Could not build a legal 10-player roster under the salary cap")
+        conn.close()
+        return
+    
+    selected_team = roster['players']
+    total_salary = roster['salary']
+    
     def is_backcourt(position):
-        if not position:
-            return False
-        pos_upper = position.upper()
-        return any(x in pos_upper for x in ['PG', 'SG', 'G']) or pos_upper == 'G-F'
+        return position_group(position) == 'BC'
     
     def is_frontcourt(position):
-        if not position:
-            return False
-        pos_upper = position.upper()
-        return any(x in pos_upper for x in ['SF', 'PF', 'F-C', 'C-F', 'C', 'F']) or pos_upper == 'F-G'
-    
-    # Build team with constraints
-    selected_team = []
-    team_counts = defaultdict(int)
-    total_salary = 0.0
-    
-    backcourt_count = 0
-    frontcourt_count = 0
-    
-    for player in players_with_value:
-        if len(selected_team) >= 10:
-            break
-        
-        pos = player[1]
-        salary = player[4]
-        team_id = player[3]
-        
-        # Check constraints
-        if total_salary + salary > max_salary:
-            continue
-        
-        if team_counts[team_id] >= 2:
-            continue
-        
-        # Check position requirements
-        if is_backcourt(pos) and backcourt_count < 5:
-            selected_team.append(player)
-            backcourt_count += 1
-            team_counts[team_id] += 1
-            total_salary += salary
-        elif is_frontcourt(pos) and frontcourt_count < 5:
-            selected_team.append(player)
-            frontcourt_count += 1
-            team_counts[team_id] += 1
-            total_salary += salary
+        return position_group(position) == 'FC'
     
     # Display results
     print("─" * 120)
@@ -135,15 +67,15 @@ def optimize_team_with_salary(max_salary=100.0, performance_weight=0.7):
     
     print("\n🔵 BACK COURT:")
     for player in selected_team:
-        if is_backcourt(player[1]):
-            print(f"{player[1]:<12} {player[0]:<26} {player[2]:<22} {player[12]:<8.1f} ${player[4]:<9.1f} {player[13]:<8.2f}")
-            backcourt_fp += player[12]
+        if is_backcourt(player['position']):
+            print(f"{player['position']:<12} {player['player_name']:<26} {player['team_name']:<22} {player['fantasy_avg']:<8.1f} ${player['salary']:<9.1f} {player['value']:<8.2f}")
+            backcourt_fp += player['fantasy_avg']
     
     print("\n🔴 FRONT COURT:")
     for player in selected_team:
-        if is_frontcourt(player[1]):
-            print(f"{player[1]:<12} {player[0]:<26} {player[2]:<22} {player[12]:<8.1f} ${player[4]:<9.1f} {player[13]:<8.2f}")
-            frontcourt_fp += player[12]
+        if is_frontcourt(player['position']):
+            print(f"{player['position']:<12} {player['player_name']:<26} {player['team_name']:<22} {player['fantasy_avg']:<8.1f} ${player['salary']:<9.1f} {player['value']:<8.2f}")
+            frontcourt_fp += player['fantasy_avg']
     
     total_fp = backcourt_fp + frontcourt_fp
     remaining_salary = max_salary - total_salary
@@ -159,24 +91,24 @@ def optimize_team_with_salary(max_salary=100.0, performance_weight=0.7):
     print("\n📋 TEAM DISTRIBUTION:")
     team_dist = defaultdict(list)
     for player in selected_team:
-        team_dist[player[2]].append(player[0])
+        team_dist[player['team_name']].append(player['player_name'])
     
     for team, players in sorted(team_dist.items()):
         print(f"   • {team}: {', '.join(players)}")
     
     # Recommended starting 5
     print("\n💡 RECOMMENDED STARTING 5 (3 BC + 2 FC):")
-    starting_bc = [p for p in selected_team if is_backcourt(p[1])][:3]
-    starting_fc = [p for p in selected_team if is_frontcourt(p[1])][:2]
+    starting_bc = [p for p in selected_team if is_backcourt(p['position'])][:3]
+    starting_fc = [p for p in selected_team if is_frontcourt(p['position'])][:2]
     
     print("   Back Court:")
     for p in starting_bc:
-        print(f"   • {p[0]} ({p[12]:.1f} FP/G, ${p[4]}M)")
+        print(f"   • {p['player_name']} ({p['fantasy_avg']:.1f} FP/G, ${p['salary']}M)")
     print("   Front Court:")
     for p in starting_fc:
-        print(f"   • {p[0]} ({p[12]:.1f} FP/G, ${p[4]}M)")
+        print(f"   • {p['player_name']} ({p['fantasy_avg']:.1f} FP/G, ${p['salary']}M)")
     
-    starting_total = sum(p[12] for p in starting_bc + starting_fc)
+    starting_total = sum(p['fantasy_avg'] for p in starting_bc + starting_fc)
     print(f"\n   Starting 5 Projected: {starting_total:.1f} FP/G")
     
     print("\n🏀" + "="*118 + "🏀\n")
@@ -187,25 +119,27 @@ def optimize_team_with_salary(max_salary=100.0, performance_weight=0.7):
 if __name__ == '__main__':
     import sys
     
-    # Parse command line arguments
+    # Parse command line arguments (--greedy selects the old single-pass heuristic)
     max_salary = 100.0
     performance_weight = 0.7
+    method = 'greedy' if '--greedy' in sys.argv else 'exact'
+    args = [a for a in sys.argv[1:] if a != '--greedy']
     
-    if len(sys.argv) > 1:
+    if len(args) > 0:
         try:
-            max_salary = float(sys.argv[1])
+            max_salary = float(args[0])
         except:
-            print("Usage: python3 team_optimizer.py [max_salary] [performance_weight]")
+            print("Usage: python3 team_optimizer.py [max_salary] [performance_weight] [--greedy]")
             print("Example: python3 team_optimizer.py 100 0.7")
             sys.exit(1)
     
-    if len(sys.argv) > 2:
+    if len(args) > 1:
         try:
-            performance_weight = float(sys.argv[2])
+            performance_weight = float(args[1])
             if not 0 <= performance_weight <= 1:
                 raise ValueError()
         except:
             print("Performance weight must be between 0 and 1")
             sys.exit(1)
     
-    optimize_team_with_salary(max_salary, performance_weight)
+    optimize_team_with_salary(max_salary, performance_weight, method)
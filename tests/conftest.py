@@ -0,0 +1,65 @@
+"""
+Shared fixtures: a small migrated database and a Flask client serving it.
+"""
+
+import sqlite3
+
+import pytest
+
+from app import database
+
+
+def build_database(path):
+    """Create a migrated database with 4 teams, 12 players and a week of games and stats (gameweek 9)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(database, 'DB_PATH', path)
+        database.init_database()
+
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    for i in range(4):
+        cur.execute("INSERT INTO teams VALUES (?, ?, ?, ?, ?)",
+                    (100 + i, f"Team {i}", f"T{i}", 'City', 'ST'))
+    for i in range(12):
+        cur.execute("""
+            INSERT INTO players (player_id, player_name, team_id, position, salary)
+            VALUES (?, ?, ?, ?, ?)
+        """, (1000 + i, f"Player {i}", 100 + i % 4, 'G' if i % 2 else 'F-C', 5.0 + i))
+    cur.execute("""
+        INSERT INTO gameweeks (season_year, week_number, start_date, end_date)
+        VALUES (2025, 9, '2025-12-16', '2025-12-22')
+    """)
+    for day in range(16, 23):
+        game_id = f"00225000{day}"
+        cur.execute("""
+            INSERT INTO games (game_id, gameweek_id, game_date, game_time, season_year,
+                               home_team_id, away_team_id)
+            VALUES (?, 1, ?, '02:00', 2025, ?, ?)
+        """, (game_id, f"2025-12-{day}", 100 + day % 4, 100 + (day + 1) % 4))
+        for i in range(12):
+            cur.execute("""
+                INSERT INTO player_game_stats
+                (player_id, game_id, nba_game_id, game_date, points, rebounds, assists,
+                 blocks, steals, fantasy_points, minutes_played, turnovers)
+                VALUES (?, ?, ?, ?, 10, 5, 3, 1, 1, 27, 30.0, 2)
+            """, (1000 + i, f"{game_id}_{1000 + i}", game_id, f"2025-12-{day}"))
+    database.refresh_player_fantasy_summary(cur)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def seeded_db(tmp_path, monkeypatch):
+    """Path of a fresh database built by build_database; database.DB_PATH points at it for the test."""
+    db_path = tmp_path / "nba_fantasy.db"
+    build_database(db_path)
+    monkeypatch.setattr(database, 'DB_PATH', db_path)
+    return db_path
+
+
+@pytest.fixture
+def api_client(seeded_db, monkeypatch):
+    """Flask test client for the web app, reading seeded_db."""
+    web_app = pytest.importorskip('app.web_app')
+    monkeypatch.setattr(web_app, 'DB_PATH', str(seeded_db))
+    return web_app.app.test_client(), seeded_db
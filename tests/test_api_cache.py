@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+API response cache test: ETags revalidate until the data generation changes.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_api_cache.py
+"""
+
+import sqlite3
+
+from app import database
+
+
+def test_cached_endpoints_revalidate_until_generation_changes(api_client):
+    client, db_path = api_client
+    first = client.get('/api/team_schedule/9')
+    etag = first.headers['ETag']
+    assert client.get('/api/team_schedule/9', headers={'If-None-Match': etag}).status_code == 304
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM games WHERE game_date = '2025-12-16'")
+    database.bump_data_generation(conn.cursor())
+    conn.commit()
+    conn.close()
+    changed = client.get('/api/team_schedule/9', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Gameday calendar test: schedule imports recompute deadlines derived from game times.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_gamedays.py
+"""
+
+import sqlite3
+
+from app import database
+from app.gamedays import refresh_derived_deadlines, refresh_game_gamedays
+
+
+def test_import_refresh_rebuilds_derived_weeks_and_keeps_official(tmp_path, monkeypatch):
+    db_path = tmp_path / "nba_fantasy.db"
+    monkeypatch.setattr(database, 'DB_PATH', db_path)
+    # Migration 9 runs on an empty games table: only the official weeks exist
+    database.init_database()
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    official = cur.execute("SELECT * FROM gameday_deadlines ORDER BY gameweek, day_num").fetchall()
+    assert {row[0] for row in official} == {9, 10, 11, 12}
+
+    for team_id in (100, 101):
+        cur.execute("INSERT INTO teams VALUES (?, ?, ?, 'City', 'ST')", (team_id, f"Team {team_id}", f"T{team_id}"))
+    cur.execute("""
+        INSERT INTO gameweeks (season_year, week_number, start_date, end_date)
+        VALUES (2025, 3, '2025-11-04', '2025-11-10')
+    """)
+    games = [('G1', '2025-11-05', '02:00'), ('G2', '2025-11-07', '01:00'), ('G9', '2025-12-17', '02:00')]
+    cur.executemany("""
+        INSERT INTO games (game_id, gameweek_id, game_date, game_time, season_year, home_team_id, away_team_id)
+        VALUES (?, 1, ?, ?, 2025, 100, 101)
+    """, games)
+
+    refresh_derived_deadlines(cur)
+    refresh_game_gamedays(cur)
+    assert cur.execute("""
+        SELECT gameweek, day_num, deadline, source FROM gameday_deadlines WHERE gameweek = 3 ORDER BY day_num
+    """).fetchall() == [(3, 1, '2025-11-05T01:30:00+01:00', 'games'), (3, 2, '2025-11-07T00:30:00+01:00', 'games')]
+    assert cur.execute("SELECT game_id, day_num FROM game_gamedays WHERE gameweek = 3 ORDER BY game_id").fetchall() == [
+        ('G1', 1), ('G2', 2)]
+
+    # A rescheduled game moves its computed deadline; official weeks stay as published
+    cur.execute("UPDATE games SET game_date = '2025-11-08', game_time = '03:00' WHERE game_id = 'G2'")
+    refresh_derived_deadlines(cur)
+    refresh_game_gamedays(cur)
+    assert cur.execute("SELECT deadline FROM gameday_deadlines WHERE gameweek = 3 AND day_num = 2").fetchone() == (
+        '2025-11-08T02:30:00+01:00',)
+    assert cur.execute("SELECT * FROM gameday_deadlines WHERE gameweek != 3 ORDER BY gameweek, day_num").fetchall() == official
+    assert cur.execute("SELECT day_num FROM game_gamedays WHERE game_id = 'G9'").fetchone() == (1,)
+    conn.close()
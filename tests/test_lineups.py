@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Lineup solver test: the best legal starting five for each gameday.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_lineups.py
+"""
+
+from app.lineups import lineup_points, solve_lineups
+
+
+def test_lineup_solver_picks_best_legal_five_per_day():
+    nan = float('nan')
+    groups = ['BC', 'BC', 'BC', 'FC', 'FC', 'FC', 'FC']
+    projections = [
+        [30, 30, nan],
+        [20, 20, 40],
+        [10, 10, nan],
+        [25, 25, 10],
+        [18, 18, nan],
+        [12, 12, nan],
+        [nan, 11, nan],
+    ]
+    solved = solve_lineups(groups, projections, captain_multiplier=2)
+    # 2 BC + 3 FC (105) beats 3 BC + 2 FC (103); with two players playing, both start
+    assert solved['formation'].tolist() == [[2, 3], [2, 3], [1, 1]]
+    assert solved['points'].tolist() == [105 + 30, 105 + 30, 50 + 40]
+    assert solved['captain'].tolist() == [0, 0, 1]
+    assert solved['starters'][:, 0].tolist() == [True, True, False, True, True, True, False]
+
+
+def test_lineup_solver_fields_largest_lineup_despite_negative_projections():
+    nan = float('nan')
+    groups = ['BC', 'BC', 'BC', 'FC', 'FC', 'FC']
+    projections = [
+        [30, 30],
+        [20, 20],
+        [nan, 10],
+        [25, -2],
+        [18, -3],
+        [-4, nan],
+    ]
+    solved = solve_lineups(groups, projections)
+    # Benching the negative players would score more, but five can play
+    assert solved['formation'].tolist() == [[2, 3], [3, 2]]
+    assert solved['points'].tolist() == [89, 55]
+    assert solved['starters'].sum(axis=0).tolist() == [5, 5]
+    assert lineup_points([30, 20], [25, 18, -4]) == 89
+    assert lineup_points([30, 20, 10], [-2, -3]) == 55
+    assert lineup_points([], [-1, -2]) == -3
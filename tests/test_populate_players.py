@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Player ingest test: roster players are stored, teamless fallback players are skipped.
+
+Run with:  PYTHONPATH=.:scripts python -m pytest tests/test_populate_players.py
+"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip('nba_api')
+
+from app import database
+from nba_data_fetcher import NBADataFetcher
+from populate_database import DatabasePopulator
+
+
+def test_populate_players_skips_players_without_team(tmp_path, monkeypatch, capsys):
+    db_path = tmp_path / "nba_fantasy.db"
+    monkeypatch.setattr(database, 'DB_PATH', db_path)
+    database.init_database()
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO teams VALUES (100, 'Team 0', 'T0', 'City', 'ST')")
+    conn.execute("INSERT INTO players (player_id, player_name, team_id, position) VALUES (2, 'Traded', 100, 'F')")
+    conn.commit()
+
+    # nba_api's static active list (the roster fallback) has no team_id
+    active = [
+        {'id': 1, 'full_name': 'Rostered', 'team_id': 100, 'position': 'G', 'jersey': '1'},
+        {'id': 2, 'full_name': 'Traded', 'is_active': True},
+        {'id': 3, 'full_name': 'Unknown', 'is_active': True},
+    ]
+    monkeypatch.setattr(NBADataFetcher, 'get_active_players', staticmethod(lambda *args: active))
+    DatabasePopulator.populate_players()
+
+    rows = conn.execute("SELECT player_id, team_id, position FROM players ORDER BY player_id").fetchall()
+    conn.close()
+    assert rows == [(1, 100, 'G'), (2, 100, 'F')]
+    output = capsys.readouterr().out
+    assert 'Error inserting' not in output
+    assert 'Skipped 2 players without a team' in output
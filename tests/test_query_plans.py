@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression test for the web endpoints.
+
+Runs every hot endpoint against a small migrated database, captures the SQL
+each one executes, and checks EXPLAIN QUERY PLAN for full table scans.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_query_plans.py
+"""
+
+import re
+import sqlite3
+
+import pytest
+
+pytest.importorskip('flask')
+
+from app import database
+from app import web_app
+from app.scoring import register_scoring_functions
+
+# Small dimension tables where a scan is expected and cheap (30 rows)
+SCAN_ALLOWED = {'teams'}
+
+
+@pytest.fixture
+def traced_client(seeded_db, monkeypatch):
+    """Flask test client whose database connections record every statement."""
+    db_path = seeded_db
+    statements = []
+    original = web_app.get_db_connection
+
+    def traced_connection():
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(web_app, 'DB_PATH', str(db_path))
+    monkeypatch.setattr(web_app, 'get_db_connection', traced_connection)
+    return web_app.app.test_client(), statements, db_path
+
+
+def _table_aliases(sql):
+    """Map aliases (and bare names) used in FROM/JOIN clauses to table names."""
+    aliases = {}
+    for table, alias in re.findall(r'(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', sql, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.upper() not in ('ON', 'WHERE', 'JOIN', 'LEFT', 'GROUP', 'ORDER', 'USING'):
+            aliases[alias] = table
+    return aliases
+
+
+def _full_scans(conn, sql):
+    """Return plan lines that scan a base table without using an index."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    aliases = _table_aliases(sql)
+    scans = []
+    for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+        detail = row[-1]
+        match = re.match(r'SCAN (\w+)$', detail)
+        if not match:
+            continue
+        table = aliases.get(match.group(1), match.group(1))
+        if table in tables and table not in SCAN_ALLOWED:
+            scans.append(detail)
+    return scans
+
+
+ENDPOINTS = [
+    ('GET', '/api/players', None),
+    ('GET', '/api/gameweeks', None),
+    ('GET', '/api/team_schedule/9', None),
+    ('GET', '/api/team_players/101', None),
+    ('POST', '/api/game_schedule', {'player_ids': [1000, 1001, 1002, 1003, 1004, 1005], 'gameweek': 9}),
+    ('POST', '/api/game_schedule/batch', {'rosters': [[1000, 1001, 1002], [1003, 1004, 1005]], 'gameweek': 9}),
+    ('GET', '/api/optimize?k=2&start_date=2025-12-16&end_date=2025-12-22', None),
+]
+
+
+@pytest.mark.parametrize('method,path,body', ENDPOINTS)
+def test_endpoint_queries_avoid_full_scans(traced_client, method, path, body):
+    client, statements, db_path = traced_client
+    if method == 'POST':
+        response = client.post(path, json=body)
+    else:
+        response = client.get(path)
+    assert response.status_code == 200
+
+    queries = [sql for sql in statements if sql.lstrip().upper().startswith(('SELECT', 'WITH'))]
+    assert queries, f"{path} executed no queries"
+
+    conn = sqlite3.connect(db_path)
+    register_scoring_functions(conn)
+    try:
+        for sql in queries:
+            assert _full_scans(conn, sql) == [], f"{path} full table scan in:\n{sql}"
+    finally:
+        conn.close()
+
+
+def test_migrations_set_user_version(seeded_db):
+    conn = sqlite3.connect(seeded_db)
+    try:
+        assert database.get_schema_version(conn) == database.MIGRATIONS[-1][0]
+        # Re-running is a no-op
+        assert database.migrate(conn) == database.MIGRATIONS[-1][0]
+    finally:
+        conn.close()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Query utilities test: QueryUtils imports from the repo root and reads the configured database through the shared pool.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_query_utils.py
+"""
+
+from app import database
+from app.query_utils import QueryUtils
+
+
+def test_query_utils_reads_seeded_db(seeded_db):
+    player = QueryUtils.get_player_info(1001)
+    assert (player['player_name'], player['team_id'], player['team_abbreviation']) == ('Player 1', 101, 'T1')
+    assert QueryUtils.get_player_info(9999) is None
+
+
+def test_query_utils_shares_the_route_pool(seeded_db):
+    # The routes check out connections with get_pool(DB_PATH)
+    pool = database.get_pool(str(seeded_db))
+    assert database.get_pool() is pool
+    QueryUtils.get_player_info(1000)
+    QueryUtils.get_team_roster(100)
+    stats = pool.stats()
+    assert (stats['misses'], stats['hits'], stats['connections_opened']) == (1, 1, 1)
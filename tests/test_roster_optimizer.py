@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Roster optimizer test: the best roster and the top-K rosters match brute force on small pools.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_roster_optimizer.py
+"""
+
+import itertools
+import random
+
+import pytest
+
+from app.roster_optimizer import (MAX_PER_TEAM, ROSTER_SLOTS, RosterSolver, SALARY_CAP,
+                                  position_group, solve_roster, top_k_rosters)
+
+
+def make_pool(seed):
+    """15 players (8 BC, 7 FC) on 8 teams, so the team limit and the cap both bind."""
+    rng = random.Random(seed)
+    pool = []
+    for i, position in enumerate(['G'] * 5 + ['G-F'] * 3 + ['F'] * 3 + ['F-C'] * 2 + ['C'] * 2):
+        salary = round(rng.uniform(4.0, 22.0) * 2) / 2
+        pool.append({'player_id': i, 'position': position, 'team_id': rng.randrange(8),
+                     'salary': salary, 'score': salary * 2.2 + rng.uniform(-7, 7)})
+    return pool
+
+
+def ranked_rosters(pool, max_salary):
+    """Every legal roster as (score, player ids), best first."""
+    bc = [p for p in pool if position_group(p['position']) == 'BC']
+    fc = [p for p in pool if position_group(p['position']) == 'FC']
+    rosters = []
+    for bc_pick in itertools.combinations(bc, ROSTER_SLOTS['BC']):
+        for fc_pick in itertools.combinations(fc, ROSTER_SLOTS['FC']):
+            roster = bc_pick + fc_pick
+            if sum(p['salary'] for p in roster) > max_salary + 1e-9:
+                continue
+            teams = [p['team_id'] for p in roster]
+            if max(teams.count(team) for team in teams) > MAX_PER_TEAM:
+                continue
+            rosters.append((sum(p['score'] for p in roster), frozenset(p['player_id'] for p in roster)))
+    rosters.sort(key=lambda roster: roster[0], reverse=True)
+    return rosters
+
+
+def binding_cap(pool):
+    """A cap 10% below the cost of the best roster without one (the default cap if there is none)."""
+    unconstrained = RosterSolver(pool, float('inf')).solve()
+    return round(unconstrained['salary'] * 0.9, 1) if unconstrained else SALARY_CAP
+
+
+def roster_ids(roster):
+    return frozenset(p['player_id'] for p in roster['players'])
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_solver_finds_the_brute_force_optimum(seed):
+    pool = make_pool(seed)
+    cap = binding_cap(pool)
+    ranked = ranked_rosters(pool, cap)
+    for roster in (solve_roster(pool, cap), RosterSolver(pool, cap).solve()):
+        if not ranked:
+            assert roster is None
+            continue
+        assert roster['complete'] and roster['salary'] <= cap + 1e-9
+        assert roster['score'] == pytest.approx(ranked[0][0])
+        assert roster_ids(roster) == ranked[0][1]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_top_k_rosters_match_brute_force(seed):
+    pool = make_pool(seed)
+    cap = binding_cap(pool)
+    ranked = ranked_rosters(pool, cap)
+    top = top_k_rosters(pool, k=10, max_salary=cap)
+    assert [roster['rank'] for roster in top] == list(range(1, len(top) + 1))
+    assert [roster['score'] for roster in top] == pytest.approx([score for score, _ in ranked[:10]])
+    assert [roster_ids(roster) for roster in top] == [ids for _, ids in ranked[:10]]
+
+    for min_distance in (2, 4, 6):
+        # Greedy over the ranking: each roster is the best one far enough from all earlier picks
+        expected = []
+        for score, ids in ranked:
+            if all(len(ids ^ other) >= min_distance for _, other in expected):
+                expected.append((score, ids))
+                if len(expected) == 5:
+                    break
+        spread = top_k_rosters(pool, k=5, min_distance=min_distance, max_salary=cap)
+        assert [roster_ids(roster) for roster in spread] == [ids for _, ids in expected]
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Batch schedule test: POST /api/game_schedule/batch matches one request per roster.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_schedule_batch.py
+"""
+
+
+def test_batch_schedule_matches_single_requests(api_client):
+    client, db_path = api_client
+    rosters = [[1000, 1001, 1002, 1003, 1004, 1005], [1000, 1001, 1002, 1003, 1004, 1006], [1011]]
+    singles = [client.post('/api/game_schedule', json={'player_ids': roster, 'gameweek': 9}).get_json()
+               for roster in rosters]
+
+    batch = client.post('/api/game_schedule/batch', json={'rosters': rosters, 'gameweek': 9}).get_json()
+    assert batch['rosters'] == singles
+    named = client.post('/api/game_schedule/batch',
+                        json={'rosters': {'current': rosters[0], 'empty': []}, 'gameweek': 9}).get_json()
+    assert named['rosters'] == {'current': singles[0], 'empty': {'games_by_day': {}}}
+    assert client.post('/api/game_schedule/batch', json={'rosters': [['x']]}).status_code == 400
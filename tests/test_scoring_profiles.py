@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Scoring profile test: /api/players serves averages for every stored profile.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_scoring_profiles.py
+"""
+
+
+def test_summary_caches_every_scoring_profile(api_client):
+    client, db_path = api_client
+    # Test rows score 27 under nba_fantasy_v1; 2 turnovers cost 2 more under nba_fantasy_to_v1
+    players = client.get('/api/players').get_json()
+    assert {p['fantasy_avg'] for p in players} == {27}
+    players = client.get('/api/players?profile=nba_fantasy_to_v1').get_json()
+    assert {p['fantasy_avg'] for p in players} == {25}
+    assert client.get('/api/players?profile=unknown').status_code == 400
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Transfer planner test: best 1- and 2-transfer plans within bank and team limits.
+
+Run with:  PYTHONPATH=. python -m pytest tests/test_transfer_planner.py
+"""
+
+import itertools
+
+from app.lineups import lineup_points
+from app.transfer_planner import TransferPlanner
+
+
+def _player(player_id, group, team_id, salary, projection, gamedays):
+    return {'player_id': player_id, 'player_name': player_id, 'group': group, 'team_id': team_id,
+            'salary': salary, 'projection': projection, 'gamedays': frozenset(gamedays)}
+
+
+def test_transfer_planner_finds_best_affordable_swaps():
+    player = _player
+
+    # Ten 10 FP players who all play Day 1 only; b1 and f1 share team 1
+    roster = [player(f"b{i}", 'BC', i, 10.0, 10.0, {'D1'}) for i in range(1, 6)]
+    roster += [player(f"f{i}", 'FC', i if i == 1 else i + 5, 10.0, 10.0, {'D1'}) for i in range(1, 6)]
+    pool = roster + [
+        player('c1', 'BC', 11, 12.0, 20.0, {'D1', 'D2'}),
+        player('c2', 'FC', 12, 10.0, 15.0, {'D2'}),
+        player('c3', 'BC', 13, 30.0, 40.0, {'D1', 'D2'}),  # never affordable
+        player('c4', 'FC', 1, 10.0, 30.0, {'D1', 'D2'}),   # team 1 is full unless b1 or f1 leaves
+    ]
+    planner = TransferPlanner(roster, pool, ['D1', 'D2'])
+    assert planner.points == 50
+
+    single = planner.plan(bank=2.0, free_transfers=1)['plans']
+    assert [p['player_id'] for p in single[0]['out']] == ['f1']
+    assert [p['player_id'] for p in single[0]['in']] == ['c4']
+    assert single[0]['points'] == 100 and single[0]['bank'] == 2.0
+    # Only b1 or f1 can make room for c4
+    assert all(p['out'][0]['player_id'] in ('b1', 'f1')
+               for p in single if p['in'][0]['player_id'] == 'c4')
+
+    double = planner.plan(bank=2.0, free_transfers=2, k=3)['plans']
+    assert [p['points'] for p in double] == [130, 130, 130]
+    assert all({p['player_id'] for p in plan['in']} == {'c1', 'c4'} for plan in double)
+    assert all(plan['bank'] == 0.0 for plan in double)
+
+    # A 40 FP hit makes the second transfer not worth it
+    costed = planner.plan(bank=2.0, free_transfers=1, transfer_cost=40, k=1)['plans']
+    assert costed[0]['points'] == 100 and len(costed[0]['in']) == 1
+
+
+def test_transfer_planner_bounds_hold_with_negative_projections():
+    # Day 2: b1, f2, f3 and f1 (-20) play; four can start, so f1 is forced in
+    roster = [_player('b1', 'BC', 1, 10.0, 10.0, {'D1', 'D2'})]
+    roster += [_player(f"b{i}", 'BC', i, 10.0, 10.0, {'D1'}) for i in range(2, 6)]
+    roster += [_player('f1', 'FC', 6, 10.0, -20.0, {'D2'})]
+    roster += [_player(f"f{i}", 'FC', i + 5, 10.0, 10.0, {'D1', 'D2'}) for i in (2, 3)]
+    roster += [_player(f"f{i}", 'FC', i + 5, 10.0, 10.0, {'D1'}) for i in (4, 5)]
+    pool = roster + [
+        _player('c1', 'FC', 20, 5.0, 1.0, {'D2'}),
+        _player('c2', 'BC', 21, 5.0, -3.0, {'D1', 'D2'}),
+        _player('c3', 'FC', 22, 11.0, 12.0, {'D1'}),  # only affordable alongside c1 or c2
+    ]
+    planner = TransferPlanner(roster, pool, ['D1', 'D2'])
+    assert planner.points == 50 + 10
+
+    # c1 only adds 1 FP at face value, but a fourth Day 2 frontcourt player
+    # lets f1 sit; dropping f1, f4 or f5 for c1 is worth 81
+    single = planner.plan(bank=0.0, free_transfers=1, k=3)['plans']
+    assert [p['points'] for p in single] == [81, 81, 81]
+    assert {p['out'][0]['player_id'] for p in single} == {'f1', 'f4', 'f5'}
+
+    # Every plan matches an exhaustive search scored straight from lineup_points
+    def week_points(players):
+        return sum(lineup_points([p['projection'] for p in players if day in p['gamedays'] and p['group'] == 'BC'],
+                                 [p['projection'] for p in players if day in p['gamedays'] and p['group'] == 'FC'])
+                   for day in ('D1', 'D2'))
+
+    candidates = pool[len(roster):]
+    expected = []
+    for n in (1, 2):
+        for outs in itertools.combinations(roster, n):
+            for ins in itertools.permutations(candidates, n):
+                if (any(o['group'] != i['group'] for o, i in zip(outs, ins)) or
+                        sum(p['salary'] for p in ins) > sum(p['salary'] for p in outs)):
+                    continue
+                rest = [p for p in roster if p not in outs]
+                expected.append(week_points(rest + list(ins)))
+    expected = sorted(set(expected), reverse=True)
+    plans = planner.plan(bank=0.0, free_transfers=2, k=1000)['plans']
+    assert sorted({round(p['points'], 9) for p in plans}, reverse=True) == expected